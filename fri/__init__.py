@@ -5,6 +5,9 @@ from fri._version import __version__
 
 logging.basicConfig(level=logging.INFO)
 from enum import Enum
+
+import numpy as np
+
 import fri.model
 
 
@@ -39,6 +42,8 @@ from fri.toydata import (
     quick_generate,
     genLupiData,
 )
+from fri.cache import DEFAULT_CACHE_SIZE
+from fri.coreset import DEFAULT_CORESET_SIZE, DEFAULT_N_CORESETS
 from fri.main import FRIBase
 from fri.plot import plot_intervals
 
@@ -55,6 +60,24 @@ class FRI(FRIBase):
         slack_regularization: object = 0.001,
         slack_loss: object = 0.001,
         normalize: object = True,
+        warm_start: object = False,
+        solver: object = None,
+        shared_data: object = False,
+        probe_tolerance: object = None,
+        cache_dir: object = None,
+        cache_size: object = DEFAULT_CACHE_SIZE,
+        time_budget: object = None,
+        max_solves: object = None,
+        dtype: object = np.float64,
+        sample_screening: object = False,
+        constraint_generation: object = False,
+        column_generation: object = False,
+        feature_screening: object = False,
+        collapse_duplicates: object = False,
+        approximate: object = None,
+        coreset_size: object = DEFAULT_CORESET_SIZE,
+        n_coresets: object = DEFAULT_N_CORESETS,
+        search: object = "random",
         **kwargs,
     ):
         """
@@ -80,8 +103,83 @@ class FRI(FRIBase):
             Allow deviation of loss.
         normalize: boolean
             Normalize relevace bounds to range of [0,1] depending on L1 norm.
+        warm_start: boolean
+            Warm start bound problems from the baseline model and the previously solved feature.
+            Uses a solver which supports warm starts (OSQP or SCS) and falls back to ECOS.
+        solver: str or None
+            Solver backend, one of "ECOS", "SCS", "OSQP", "CLARABEL", "HIGHS" or "LINPROG" (see `fri.solver`).
+            By default ECOS is used. "LINPROG" solves the bound problems of linear models directly
+            with `scipy.optimize.linprog` without cvxpy.
+            With "auto" linear programs are solved with LINPROG or HIGHS (when available).
+        shared_data: boolean
+            Write the data once to a memory mapped file which all workers attach to.
+            Only feature indices and parameters are sent per bound, which keeps memory usage flat with growing `n_jobs`.
+        probe_tolerance: float or None
+            Solve probes in batches and stop early when the relative change of the probe threshold
+            is below `probe_tolerance` or no feature is close enough to the threshold to change its class.
+            By default all `n_probe_features` probes are solved.
+        cache_dir: str or None
+            Directory of a persistent cache for baseline models, relevance bounds and probes.
+            Repeated fits on the same data and parameters load their results from the cache.
+        cache_size: int
+            Maximal size of the cache in bytes, least recently used entries are removed first.
+        time_budget: float or None
+            Time in seconds after which `fit` stops solving bound problems and returns.
+            Probes are solved first, then features in order of their baseline weight.
+            Features whose bounds were not solved get a valid but wider interval
+            (lower bound 0, upper bound the L1 norm of the relaxed model) and are marked in `unsolved_features_`.
+        max_solves: int or None
+            Maximal number of bound problems solved in `fit`, handled like `time_budget`.
+        dtype: numpy dtype
+            Precision in which the data is kept, e.g. `np.float32` halves the memory of X,
+            the probe buffers and predictions. Solver inputs are converted to double precision.
+        sample_screening: boolean
+            Remove samples from the lower bound problems whose constraints provably hold without slack
+            for every model within the relaxed L1 and loss constraints. The bounds do not change, the
+            problems only keep the potentially active samples. Two additional LPs determine the range of the bias.
+            Supported for classification and regression.
+        constraint_generation: boolean
+            Solve every bound problem on an active subset of the samples, starting with the (nearly) active
+            samples of the baseline model, and add samples with violated constraints in rounds until none remain.
+            The result equals the full problem, but only a sequence of small problems is solved when few samples
+            are support vectors (large `n`). Supported for classification and regression.
+        column_generation: boolean
+            Solve every linear bound problem with the weights of a working set of features, starting with the
+            support of the baseline model, and add features whose weights improve the objective (priced by their
+            reduced costs) until none remain. Meant for very wide data (`d >> n`) with sparse models.
+            Requires the native LP engine (`solver="linprog"`), other solvers ignore it.
+        feature_screening: boolean
+            Solve the probes first and skip the bound problems of features whose upper bound from the dual
+            of the baseline problem is below the probe threshold. These features are irrelevant, their intervals
+            (lower bound 0, upper bound the dual bound) are valid but wider and they are marked in `unsolved_features_`.
+            All probes are solved, also with `probe_tolerance`. Supported for classification.
+        collapse_duplicates: boolean
+            Collapse duplicated samples (equal rows with equal target) into one sample whose loss is weighted by the
+            number of its duplicates. The bound problems shrink by the duplication factor and stay equivalent,
+            the hyperparameter search splits the unique samples into folds.
+        approximate: str or None
+            With "coreset" relevance intervals of data with more than `coreset_size` samples are approximated
+            on weighted coresets. Samples are drawn by their sensitivity, estimated from the margins of a baseline model
+            fitted on a uniform sample, and weighted by their inverse probability.
+            `interval_` is the mean over `n_coresets` independent coresets (solved in parallel with `n_jobs`)
+            and `interval_error_` its standard deviation. Not supported for LUPI features.
+        coreset_size: int
+            Number of samples drawn into every coreset (and into the sample for the hyperparameter search).
+        n_coresets: int
+            Number of independent coresets, at least 2 are needed for an error estimate.
+        search: str
+            Hyperparameter search of the baseline model. "random" cross validates `n_param_search` random candidates
+            on all samples. "halving" uses successive halving: three times as many candidates are cross validated
+            on a small subset of the samples, only the best third is promoted to a three times larger subset,
+            until the finalists are cross validated on all samples. Much faster for large `n`.
 
         """
+        # Stored unchanged, `get_params` and `clone` use the arguments of this class
+        self.problemName = problemName
+        self.slack_regularization = slack_regularization
+        self.slack_loss = slack_loss
+
+        problemtype = None
         if isinstance(problemName, ProblemName):
             problemtype = problemName.value
         else:
@@ -110,6 +208,24 @@ class FRI(FRIBase):
                 w_l1_slack=slack_regularization,
                 loss_slack=slack_loss,
                 normalize=normalize,
+                warm_start=warm_start,
+                solver=solver,
+                shared_data=shared_data,
+                probe_tolerance=probe_tolerance,
+                cache_dir=cache_dir,
+                cache_size=cache_size,
+                time_budget=time_budget,
+                max_solves=max_solves,
+                dtype=dtype,
+                sample_screening=sample_screening,
+                constraint_generation=constraint_generation,
+                column_generation=column_generation,
+                feature_screening=feature_screening,
+                collapse_duplicates=collapse_duplicates,
+                approximate=approximate,
+                coreset_size=coreset_size,
+                n_coresets=n_coresets,
+                search=search,
                 **kwargs,
             )
 
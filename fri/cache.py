@@ -0,0 +1,82 @@
+"""
+    Persistent cache for results of `FRI` which are expensive to compute.
+    Baseline models, relevance bounds and probe values are stored in a directory
+    under a hash of everything they depend on (data, problem type, hyperparameters, constraints and solver).
+    When the directory grows beyond its size limit the least recently used entries are removed.
+"""
+import os
+import pickle
+
+import joblib
+
+DEFAULT_CACHE_SIZE = 2 ** 30  # Bytes
+
+
+class ResultCache(object):
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        """
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the cache, it is created if it does not exist.
+        max_size : int
+            Maximal size of all entries in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        """
+        Fingerprint of all objects a result depends on.
+        """
+        return joblib.hash(parts)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            value = joblib.load(path)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            # Missing or incomplete entries are recomputed
+            return default
+        try:
+            # Mark entry as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        # Write to a temporary file first, so concurrent readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_size -= size
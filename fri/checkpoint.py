@@ -0,0 +1,145 @@
+"""
+    Append-only checkpoint of solved relevance bounds.
+    The header line stores the fingerprint of data and parameters and the baseline model,
+    a resumed fit reuses the baseline instead of searching hyperparameters again.
+    Every finished bound (feature, LB/UB, objective arguments like the sign, value and solver status)
+    is written as one JSON line as soon as it is solved, so an interrupted fit can be resumed
+    without solving these bounds again.
+"""
+import json
+import os
+
+import numpy as np
+
+
+def _encode(value):
+    # Arrays of the baseline model are stored with their dtype
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} can not be stored in a checkpoint.")
+
+
+def _decode(obj):
+    if "__ndarray__" in obj:
+        return np.array(obj["__ndarray__"], dtype=obj["dtype"])
+    return obj
+
+
+def _bound_key(feature, bound_type, objective):
+    return int(feature), bound_type, json.dumps(objective, sort_keys=True)
+
+
+def checkpoint_key(bound):
+    """
+    Identifier of a bound problem in the checkpoint.
+    """
+    bound_type = "LB" if bound.isLowerBound else "UB"
+    objective = {k: int(v) for k, v in bound.objective_kwargs.items()}
+    return _bound_key(bound.current_feature, bound_type, objective)
+
+
+def is_checkpointed(bound):
+    # Probes and queries with presets are not part of the checkpoint
+    return not bound.isProbe and bound.preset_model is None
+
+
+def read_baseline(path, fingerprint):
+    """
+    Baseline model stored in the header of a checkpoint file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file.
+    fingerprint : str
+        Hash of data and parameters the checkpoint belongs to.
+
+    Returns
+    -------
+    dict or None
+        Hyperparameters, constraints, model_state and score of the baseline model,
+        `None` if the checkpoint does not exist yet.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        header = json.loads(f.readline() or "{}", object_hook=_decode)
+    if header.get("fingerprint") != fingerprint:
+        raise ValueError(
+            f"Checkpoint '{path}' was written for different data or parameters."
+        )
+    return header["baseline"]
+
+
+def create_checkpoint(path, fingerprint, baseline):
+    """
+    Create a checkpoint file whose header stores the fingerprint and the baseline model (see `read_baseline`).
+    """
+    header = {"fingerprint": fingerprint, "baseline": baseline}
+    with open(path, "w") as f:
+        f.write(json.dumps(header, default=_encode) + "\n")
+
+
+def open_checkpoint(path):
+    """
+    Read the solved bounds of a checkpoint file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file.
+
+    Returns
+    -------
+    dict
+        Mapping of `checkpoint_key` to (value, status)
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        # The header is read by `read_baseline`
+        f.readline()
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Last line of an interrupted run can be incomplete
+                continue
+            key = _bound_key(record["feature"], record["bound"], record["objective"])
+            records[key] = record["value"], record["status"]
+    return records
+
+
+def append_bound(path, bound):
+    """
+    Append a solved bound to the checkpoint.
+    """
+    value = float(bound.solved_relevance) if bound.is_solved else None
+    append_record(path, checkpoint_key(bound), value, bound.status)
+
+
+def append_record(path, key, value, status):
+    """
+    Append the result of the bound with the given `checkpoint_key`.
+    Lines are written with a single call in append mode, so workers can share the file.
+    """
+    feature, bound_type, objective = key
+    record = {
+        "feature": feature,
+        "bound": bound_type,
+        "objective": json.loads(objective),
+        "value": value,
+        "status": status,
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def lower_bound_key(feature):
+    """
+    `checkpoint_key` of the lower bound of `feature` (without objective arguments).
+    """
+    return _bound_key(feature, "LB", {})
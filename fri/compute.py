@@ -1,23 +1,124 @@
+import itertools
 import logging
-from collections import defaultdict
+import math
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import closing, contextmanager
 
 import joblib
+from joblib.executor import get_memmapping_executor
+from joblib.externals.loky import as_completed
 import numpy as np
-from scipy import stats
-
-from fri.model.base_cvxproblem import Relevance_CVXProblem
+from scipy import sparse, stats
+
+from fri.cache import ResultCache
+from fri.checkpoint import (
+    append_bound,
+    append_record,
+    checkpoint_key,
+    is_checkpointed,
+    lower_bound_key,
+    open_checkpoint,
+)
+from fri.model.base_cvxproblem import (
+    ZERO_WEIGHT_TOLERANCE,
+    Relevance_CVXProblem,
+    clear_template_cache,
+)
 from fri.model.base_initmodel import InitModel
 from fri.model.base_type import ProblemType
-from fri.utils import permutate_feature_in_data
+from fri.solver import choose_solver
+from fri.utils import backing_memmap, clear_permutation_buffer
 
 MIN_N_PROBE_FEATURES = 20  # Lower bound of probe features
+ADAPTIVE_PROBE_BATCHES = 4  # Number of batches in which probes are solved with `probe_tolerance`
+PROBE_FPR = 1e-4  # False positive rate of the probe statistic
+
+
+def _start_solver_worker(
+    bounds: [Relevance_CVXProblem], checkpoint=None, deadline=None
+):
+    """
+    Worker thread method for parallel computation, solves a chunk of bounds.
+    After the `deadline` (wall-clock time) no further feature or probe is started,
+    only the solved bounds are returned.
+    """
+    solved = []
+    for bound in bounds:
+        if (
+            deadline is not None
+            and (not solved or _task_group(bound) != _task_group(solved[-1]))
+            and time.time() >= deadline
+        ):
+            break
+        bound.solve()
+        if checkpoint is not None and is_checkpointed(bound):
+            append_bound(checkpoint, bound)
+        # Only the result is sent back, not the data
+        bound.release_data()
+        solved.append(bound)
+    # The buffer of permuted data (and its source) is not kept in idle workers
+    clear_permutation_buffer()
+    return solved
+
+
+def _task_group(bound):
+    # All problems of a probe (or of a feature) are needed for its value
+    return bound.probeID if bound.isProbe else bound.current_feature
+
+
+def _chunk_tasks(tasks, key, size):
+    """
+    Group consecutive tasks with the same key (e.g. all bounds of one feature)
+    and yield chunks of `size` groups.
+    """
+    groups = (list(group) for _, group in itertools.groupby(tasks, key=key))
+    while True:
+        chunk = list(itertools.chain.from_iterable(itertools.islice(groups, size)))
+        if not chunk:
+            return
+        yield chunk
 
 
-def _start_solver_worker(bound: Relevance_CVXProblem):
+class SolveBudget(object):
     """
-    Worker thread method for parallel computation
+    Wall-clock and solve count budget of an anytime fit.
+    Chunks of problems are only dispatched while the budget lasts,
+    workers stop solving their chunk at the `deadline`.
     """
-    return bound.solve()
+
+    def __init__(self, time_budget=None, max_solves=None):
+        # Wall-clock time, it is compared in the worker processes as well
+        self.deadline = None if time_budget is None else time.time() + time_budget
+        self.max_solves = max_solves
+        self.n_solves = 0
+        self.exhausted = False
+
+    def limit(self, chunks):
+        for chunk in chunks:
+            if self.expired:
+                self.exhausted = True
+                return
+            if self.max_solves is not None:
+                remaining = self.max_solves - self.n_solves
+                if remaining < len(chunk):
+                    # The rest of the budget is used for the first problems of the chunk
+                    self.exhausted = True
+                    chunk = chunk[:remaining]
+                    if not chunk:
+                        return
+            self.n_solves += len(chunk)
+            yield chunk
+            if self.exhausted:
+                return
+
+    @property
+    def expired(self):
+        return self.deadline is not None and time.time() >= self.deadline
 
 
 class RelevanceBoundsIntervals(object):
@@ -31,8 +132,23 @@ class RelevanceBoundsIntervals(object):
         n_jobs,
         verbose,
         normalize=True,
+        warm_start=False,
+        solver=None,
+        shared_data=False,
+        probe_tolerance=None,
+        cache=None,
+        checkpoint=None,
+        time_budget=None,
+        max_solves=None,
+        sample_screening=False,
+        constraint_generation=False,
+        column_generation=False,
+        feature_screening=False,
+        sample_weight=None,
     ):
         self.data = data
+        # Weights of the samples in the loss, e.g. counts of collapsed duplicate rows
+        self.sample_weight = sample_weight
         self.problem_type = problem_type
         self.verbose = verbose
         self.n_jobs = n_jobs
@@ -41,6 +157,31 @@ class RelevanceBoundsIntervals(object):
         self.best_init_model = best_init_model
         self.best_hyperparameters = best_init_model.hyperparam
         self.normalize = normalize
+        self.warm_start = warm_start
+        self.solver = solver
+        self.shared_data = shared_data
+        self.probe_tolerance = probe_tolerance
+        # Optional persistent cache of bounds and probes (see `fri.cache`)
+        self.cache = cache
+        self._data_key = None
+        # Path of a checkpoint file for resumable fits (see `fri.checkpoint`)
+        self.checkpoint = checkpoint
+        self._checkpoint_records = None
+        # Anytime fit: work is dispatched in priority order while the budget lasts
+        self.budget = None
+        if time_budget is not None or max_solves is not None:
+            self.budget = SolveBudget(time_budget, max_solves)
+        # Features and bound types (is lower bound) whose problems were not solved within the budget
+        self._undispatched = set()
+        self.unsolved_features = set()
+        # Remove samples whose constraints can not become active from lower bound problems
+        self.sample_screening = sample_screening
+        # Solve bound problems on growing active subsets of the samples
+        self.constraint_generation = constraint_generation
+        # Solve linear bound problems on growing working sets of features
+        self.column_generation = column_generation
+        # Skip features whose dual upper bound is below the probe threshold
+        self.feature_screening = feature_screening
 
         # Relax constraints to improve stability
         relaxed_constraints = problem_type.get_relaxed_constraints(
@@ -48,6 +189,52 @@ class RelevanceBoundsIntervals(object):
         )
         self.init_constraints = relaxed_constraints
 
+        # Key to reuse compiled bound problems of this model in the workers
+        self._template_key = uuid.uuid4().hex
+        # Probe values of the unconstrained model, reused for preset queries
+        self._probe_cache = {}
+        # Dual upper bounds of the relevance of all features (see `_screen_irrelevant_features`)
+        self._dual_bounds = None
+
+    @contextmanager
+    def _task_data(self):
+        """
+        Data which is attached to the bound problems.
+        With `shared_data` the data is written once to a memory mapped file.
+        joblib pickles memmap backed arrays as reference to that file,
+        so workers attach to the same data instead of receiving a copy per bound.
+        Data which is already memory mapped (e.g. loaded from a .npy file) is used as it is.
+        Compiled problems of this process reference the data, they are released afterwards.
+        """
+        X, _ = self.data
+        if not self.shared_data or backing_memmap(X) is not None:
+            try:
+                yield self.data
+            finally:
+                clear_template_cache()
+            return
+
+        folder = tempfile.mkdtemp(prefix="fri_")
+        try:
+            filename = os.path.join(folder, "data.pkl")
+            joblib.dump(self.data, filename)
+            yield joblib.load(filename, mmap_mode="r")
+        finally:
+            clear_template_cache()
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def _chunk_size(self, n_groups):
+        """
+        Number of features (or probes) solved in one worker task.
+        Small problems are cheap compared to the dispatch overhead of joblib and are grouped into one chunk per worker.
+        Larger problems are split into more chunks to balance the load between workers.
+        """
+        X, _ = self.data
+        n, d = X.shape
+        n_workers = joblib.effective_n_jobs(self.n_jobs)
+        chunks_per_worker = int(np.clip(n * d / 1e4, 1, 8))
+        return max(1, math.ceil(n_groups / (n_workers * chunks_per_worker)))
+
     def get_normalized_lupi_intervals(self, lupi_features, presetModel=None):
 
         # We define a list of all the features we want to compute relevance bounds for
@@ -56,16 +243,34 @@ class RelevanceBoundsIntervals(object):
         normal_d = all_d - lupi_features
 
         # Compute relevance bounds and probes for normal features and LUPI
-        with joblib.Parallel(n_jobs=self.n_jobs, verbose=self.verbose) as parallel:
-            d_n = _get_necessary_dimensions(normal_d, presetModel)
-            rb = self.compute_relevance_bounds(d_n, parallel=parallel)
-            probe_upper = self.compute_probe_values(d_n, True, parallel=parallel)
-            probe_lower = self.compute_probe_values(d_n, False, parallel=parallel)
+        with self._task_data() as data, joblib.Parallel(
+            n_jobs=self.n_jobs, verbose=self.verbose
+        ) as parallel:
+
+            def probes(dims, relevance_bounds):
+                return [
+                    self._compute_probes(
+                        dims,
+                        isUpper,
+                        relevance_bounds,
+                        parallel=parallel,
+                        presetModel=presetModel,
+                        data=data,
+                    )
+                    for isUpper in [True, False]
+                ]
 
+            d_n = _get_necessary_dimensions(normal_d, presetModel)
             d_l = _get_necessary_dimensions(all_d, presetModel, start=normal_d)
-            rb_l = self.compute_relevance_bounds(d_l, parallel=parallel)
-            probe_priv_upper = self.compute_probe_values(d_l, True, parallel=parallel)
-            probe_priv_lower = self.compute_probe_values(d_l, False, parallel=parallel)
+            if self.budget is not None:
+                # Anytime fit: probes are solved before the bounds (and without `probe_tolerance`)
+                probe_upper, probe_lower = probes(d_n, None)
+                probe_priv_upper, probe_priv_lower = probes(d_l, None)
+            rb = self.compute_relevance_bounds(d_n, parallel=parallel, data=data)
+            rb_l = self.compute_relevance_bounds(d_l, parallel=parallel, data=data)
+            if self.budget is None:
+                probe_upper, probe_lower = probes(d_n, rb)
+                probe_priv_upper, probe_priv_lower = probes(d_l, rb_l)
         probes = [probe_lower, probe_upper, probe_priv_lower, probe_priv_upper]
         #
         # Postprocess
@@ -108,16 +313,56 @@ class RelevanceBoundsIntervals(object):
         # e.g. in the case of fixed features we skip those
         dims = _get_necessary_dimensions(d, presetModel)
 
-        with joblib.Parallel(n_jobs=self.n_jobs, verbose=self.verbose) as parallel:
+        # Adaptive probes need the bounds, otherwise probes are solved first
+        # and features which are provably below the probe threshold are not solved
+        probes_first = (
+            self.budget is not None
+            or self.probe_tolerance is None
+            or self.feature_screening
+        )
+        irrelevant = {}
+        with self._task_data() as data, joblib.Parallel(
+            n_jobs=self.n_jobs, verbose=self.verbose
+        ) as parallel:
+            if probes_first:
+                probe_values_upper, probe_values_lower = [
+                    self._compute_probes(
+                        dims,
+                        isUpper,
+                        None,
+                        parallel=parallel,
+                        presetModel=presetModel,
+                        data=data,
+                    )
+                    for isUpper in [True, False]
+                ]
+                irrelevant = self._screen_irrelevant_features(
+                    dims, probe_values_upper, presetModel
+                )
             relevance_bounds = self.compute_relevance_bounds(
-                dims, parallel=parallel, presetModel=presetModel
-            )
-            probe_values_upper = self.compute_probe_values(
-                dims, isUpper=True, parallel=parallel, presetModel=presetModel
-            )
-            probe_values_lower = self.compute_probe_values(
-                dims, isUpper=False, parallel=parallel, presetModel=presetModel
+                dims,
+                parallel=parallel,
+                presetModel=presetModel,
+                data=data,
+                irrelevant=irrelevant,
             )
+            if not probes_first:
+                probe_values_upper = self._compute_probes(
+                    dims,
+                    True,
+                    relevance_bounds,
+                    parallel=parallel,
+                    presetModel=presetModel,
+                    data=data,
+                )
+                probe_values_lower = self._compute_probes(
+                    dims,
+                    False,
+                    relevance_bounds,
+                    parallel=parallel,
+                    presetModel=presetModel,
+                    data=data,
+                )
 
         # Postprocess bounds
         norm_bounds = self._postprocessing(
@@ -138,20 +383,360 @@ class RelevanceBoundsIntervals(object):
 
         return norm_bounds, feature_classes
 
-    def compute_relevance_bounds(
-        self, dims, parallel=None, presetModel=None, solverargs=None
-    ):
+    def iter_normalized_intervals(self):
+        """
+        Generator which yields the normalized interval of every feature as soon as all its bounds are solved.
+        Probes are solved first and are used for provisional relevance classes,
+        the class is `None` as long as less than two probes of each kind are solved.
+        Returns the final intervals and relevance classes (see `get_normalized_intervals`) when exhausted.
+
+        Yields
+        ------
+        tuple
+            (feature, lower, upper, relevance_class)
+        """
+        X, _ = self.data
+        dims = _get_necessary_dimensions(X.shape[1])
         init_model_state = self.best_init_model.model_state
+        L1 = self.best_init_model.L1_factor
+
+        with self._task_data() as data:
+            solve_dims, screened = self._screen_constant_features(dims, data)
+            screened_by_representative = defaultdict(list)
+            for di, representative in screened.items():
+                screened_by_representative[representative].append(di)
+            # Only the baseline model certifies lower bounds, all bounds of a feature are solved together
+            zero_lower = self._zero_lower_bound_features([])
+            if self.budget is not None:
+                w = np.abs(init_model_state["w"])
+                solve_dims = sorted(solve_dims, key=lambda di: -w[di])
+
+            chunks = []
+            for isUpper in [True, False]:
+                probes = self._generate_probe_value_tasks(
+                    data,
+                    dims,
+                    isUpper,
+                    self.n_resampling,
+                    self.random_state,
+                    best_model_state=init_model_state,
+                )
+                chunks += _chunk_tasks(
+                    probes,
+                    key=lambda probe: probe.probeID,
+                    size=self._chunk_size(self.n_resampling),
+                )
+            bounds = list(
+                itertools.chain.from_iterable(
+                    self._generate_relevance_bounds_tasks(
+                        [di], data, None, init_model_state, lower=di not in zero_lower
+                    )
+                    for di in solve_dims
+                )
+            )
+            n_bounds = Counter(
+                (bound.current_feature, bound.isLowerBound) for bound in bounds
+            )
+            chunks += _chunk_tasks(
+                bounds,
+                key=lambda bound: bound.current_feature,
+                size=self._chunk_size(len(solve_dims)),
+            )
+
+            if self.budget is not None:
+                chunks = self.budget.limit(chunks)
+
+            probe_values = {True: [], False: []}
+            intervals = np.zeros((len(dims), 2))
+            pending = set(solve_dims)
+
+            def emit(di, solved_bounds):
+                _, upper = interval = self._create_interval(
+                    di, solved_bounds, zero_lower=di in zero_lower
+                )
+                intervals[di] = interval
+                for screened_di in screened_by_representative[di]:
+                    intervals[screened_di] = 0, upper
+
+                for feature in [di] + screened_by_representative[di]:
+                    lower, upper = self._postprocessing(L1, intervals[feature])
+                    relevance_class = self._provisional_class(
+                        lower, upper, probe_values, L1
+                    )
+                    yield feature, lower, upper, relevance_class
+
+            # Pending chunks are cancelled when the caller stops iterating
+            with closing(self._iter_solved_chunks(chunks)) as solved_chunks:
+                for finished in solved_chunks:
+                    if not finished:
+                        # Stopped at the deadline before the first problem
+                        continue
+                    if finished[0].isProbe:
+                        isUpper = not finished[0].isLowerBound
+                        probe_values[isUpper] += self._aggregate_probes(
+                            finished, isUpper
+                        )
+                        continue
+
+                    solved_bounds = defaultdict(list)
+                    for bound in finished:
+                        if bound.is_solved:
+                            solved_bounds[bound.current_feature].append(bound)
+                    # The last feature of a chunk cut by the budget can miss bounds
+                    n_finished = Counter(
+                        (bound.current_feature, bound.isLowerBound)
+                        for bound in finished
+                    )
+                    for di in sorted({bound.current_feature for bound in finished}):
+                        for kind in [(di, True), (di, False)]:
+                            if n_finished[kind] < n_bounds[kind]:
+                                self._undispatched.add(kind)
+                        pending.discard(di)
+                        yield from emit(di, solved_bounds)
+
+            # Features which were not reached within the budget
+            for di in sorted(pending):
+                self._undispatched.update([(di, True), (di, False)])
+                yield from emit(di, {di: []})
+
+        # Probes are cached like in `get_normalized_intervals` for later preset queries
+        for isUpper in [True, False]:
+            self._probe_cache[(isUpper, tuple(dims))] = np.array(probe_values[isUpper])
+
+        norm_bounds = self._postprocessing(L1, intervals)
+        feature_classes = feature_classification(
+            self._postprocessing(L1, np.array(probe_values[False])),
+            self._postprocessing(L1, np.array(probe_values[True])),
+            norm_bounds,
+            verbose=self.verbose,
+        )
+        return norm_bounds, feature_classes
 
-        work_queue = self._generate_relevance_bounds_tasks(
-            dims, self.data, presetModel, init_model_state
+    def _provisional_class(self, lower, upper, probe_values, L1):
+        # The probe statistic needs at least two probes of each kind
+        if min(len(probe_values[True]), len(probe_values[False])) < 2:
+            return None
+        return feature_classification(
+            self._postprocessing(L1, np.array(probe_values[False])),
+            self._postprocessing(L1, np.array(probe_values[True])),
+            np.array([[lower, upper]]),
+        )[0]
+
+    def _iter_solved_chunks(self, chunks):
+        """
+        Solve chunks of problems and yield them in the order of completion.
+        """
+        n_workers = joblib.effective_n_jobs(self.n_jobs)
+        if n_workers == 1:
+            for chunk in chunks:
+                yield _start_solver_worker(chunk, deadline=self._deadline)
+                self._check_deadline()
+            return
+
+        # Like `joblib.Parallel` memory mapped arrays are sent as reference to their file
+        executor = get_memmapping_executor(n_workers)
+        futures = [
+            executor.submit(_start_solver_worker, chunk, deadline=self._deadline)
+            for chunk in chunks
+        ]
+        try:
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                yield future.result()
+                if self.budget is not None and self.budget.expired:
+                    # Chunks which did not start yet are dropped
+                    self.budget.exhausted = True
+                    for pending in futures:
+                        pending.cancel()
+        finally:
+            # The caller stopped early (or a chunk failed), pending chunks are not solved
+            for pending in futures:
+                pending.cancel()
+
+    def compute_relevance_bounds(
+        self,
+        dims,
+        parallel=None,
+        presetModel=None,
+        solverargs=None,
+        data=None,
+        irrelevant=None,
+    ):
+        if self.cache is not None:
+            key = self._cache_key("bounds", dims, presetModel, sorted(irrelevant or {}))
+            intervals = self.cache.get(key)
+            if intervals is not None:
+                return intervals
+
+        intervals = self._compute_scenario_relevance_bounds(
+            dims, [presetModel], parallel=parallel, data=data, irrelevant=irrelevant
+        )[0]
+
+        if self.cache is not None and not self._budget_exhausted:
+            self.cache.set(key, intervals)
+        # Sequential runs leave compiled problems (which reference the data) in this process
+        clear_template_cache()
+        return intervals
+
+    @property
+    def _budget_exhausted(self):
+        return self.budget is not None and self.budget.exhausted
+
+    @property
+    def _deadline(self):
+        return None if self.budget is None else self.budget.deadline
+
+    def _check_deadline(self):
+        # Workers stop at the deadline, their chunks can be incomplete
+        if self.budget is not None and self.budget.expired:
+            self.budget.exhausted = True
+
+    def _cache_key(self, *parts):
+        """
+        Key of a result in the persistent cache, depending on data, model, solver backend and the given `parts`.
+        """
+        if self._data_key is None:
+            data = self.data
+            if self.sample_weight is not None:
+                data = (*data, self.sample_weight)
+            self._data_key = ResultCache.key(data)
+        # The backend which actually solves the problems (e.g. a warm startable one for `solver=None`)
+        template = self.problem_type.get_cvxproblem_template
+        backend = choose_solver(
+            self.solver,
+            linear_program=template.linear_program,
+            warm_start=self.warm_start,
+            native_lp=template.native_lp,
+        )
+        return ResultCache.key(
+            self._data_key,
+            type(self.problem_type).__name__,
+            self.best_hyperparameters,
+            self.init_constraints,
+            backend,
+            *parts,
         )
 
+    def _compute_scenario_relevance_bounds(
+        self, dims, presets, parallel=None, data=None, irrelevant=None
+    ):
+        """
+        Relevance bounds of `dims` for every preset scenario in `presets` (`None` for no presets).
+        The problems of all scenarios are solved in one work queue, identical problems only once.
+        Features in `irrelevant` (see `_screen_irrelevant_features`) are not solved.
+        """
+        init_model_state = self.best_init_model.model_state
+        if data is None:
+            data = self.data
+        self._undispatched = set()
+        if irrelevant is None:
+            irrelevant = {}
+
+        # Features with provably identical bounds are only solved once
+        screening = [
+            self._screen_constant_features(
+                [di for di in dims if di not in irrelevant], data, preset
+            )
+            for preset in presets
+        ]
+
         # Solve relevance bounds in parallel (when available)
         if parallel is None:
             parallel = joblib.Parallel(n_jobs=self.n_jobs, verbose=self.verbose)
-        bound_results = parallel(map(joblib.delayed(_start_solver_worker), work_queue))
 
+        def tasks(solve_dims, preset, lower=True, upper=True):
+            return self._generate_relevance_bounds_tasks(
+                solve_dims, data, preset, init_model_state, lower=lower, upper=upper
+            )
+
+        if self.budget is not None:
+            # Anytime fit: features with large baseline weights first,
+            # all bounds of a feature together
+            w = np.abs(self.best_init_model.model_state["w"])
+            screening = [
+                (sorted(solve_dims, key=lambda di: -w[di] if di < len(w) else 0), s)
+                for solve_dims, s in screening
+            ]
+
+        if (
+            self.problem_type.get_cvxproblem_template.zero_weight_certificates
+            and self.budget is None
+        ):
+            # Upper bounds are solved first, their solutions can certify lower bounds of 0
+            bound_results = self._solve_bound_tasks(
+                [
+                    tasks(solve_dims, preset, lower=False)
+                    for (solve_dims, _), preset in zip(screening, presets)
+                ],
+                parallel,
+            )
+            zero_lower = [
+                self._zero_lower_bound_features(results, preset)
+                for results, preset in zip(bound_results, presets)
+            ]
+            if self.checkpoint is not None:
+                for zeros, preset in zip(zero_lower, presets):
+                    if preset is None:
+                        self._checkpoint_zero_lower_bounds(zeros)
+            lower_tasks = []
+            for (solve_dims, screened), preset, zeros, upper_results in zip(
+                screening, presets, zero_lower, bound_results
+            ):
+                lower_dims = [di for di in solve_dims if di not in zeros]
+                reduced = None
+                if self.sample_screening and preset is None:
+                    reduced = self._screen_samples(
+                        data, upper_results, screened, irrelevant
+                    )
+                if reduced is None:
+                    lower_tasks.append(tasks(lower_dims, preset, upper=False))
+                    continue
+                lower_data, lower_weight = reduced
+                # Problems on the reduced data need their own compiled templates
+                lower_tasks.append(
+                    self._generate_relevance_bounds_tasks(
+                        lower_dims,
+                        lower_data,
+                        preset,
+                        init_model_state,
+                        upper=False,
+                        template_key=f"{self._template_key}-screened",
+                        sample_weight=lower_weight,
+                    )
+                )
+            lower_results = self._solve_bound_tasks(lower_tasks, parallel)
+            for results, lower in zip(bound_results, lower_results):
+                results += lower
+        else:
+            zero_lower = [set() for _ in presets]
+            if self.budget is not None:
+                # The baseline model still certifies lower bounds of 0
+                zero_lower = [
+                    self._zero_lower_bound_features([], preset) for preset in presets
+                ]
+            bound_results = self._solve_bound_tasks(
+                [
+                    itertools.chain.from_iterable(
+                        tasks([di], preset, lower=di not in zeros) for di in solve_dims
+                    )
+                    for (solve_dims, _), preset, zeros in zip(
+                        screening, presets, zero_lower
+                    )
+                ],
+                parallel,
+            )
+
+        return [
+            self._collect_intervals(dims, results, preset, screened, zeros, irrelevant)
+            for results, preset, (_, screened), zeros in zip(
+                bound_results, presets, screening, zero_lower
+            )
+        ]
+
+    def _collect_intervals(
+        self, dims, bound_results, presetModel, screened, zero_lower, irrelevant=None
+    ):
         # Retrieve results and aggregate values in dict
         solved_bounds = defaultdict(list)
         for finished_bound in bound_results:
@@ -164,15 +749,176 @@ class RelevanceBoundsIntervals(object):
         length = len(dims)
         intervals = np.zeros((length, 2))
         for abs_index, rel_index in zip(dims, range(length)):
+            if irrelevant and abs_index in irrelevant:
+                # Not solved, the dual bound is a valid (wider) upper bound
+                intervals[rel_index] = 0, irrelevant[abs_index]
+                continue
+            if abs_index in screened:
+                # Constant features can always be set to 0 and share the upper bound of their representative
+                representative = screened[abs_index]
+                _, upper = self._create_interval(
+                    representative,
+                    solved_bounds,
+                    presetModel,
+                    zero_lower=representative in zero_lower,
+                )
+                intervals[rel_index] = 0, upper
+                continue
             # Return interval for feature i (can be a fixed value when set beforehand)
-            interval_i = self._create_interval(abs_index, solved_bounds, presetModel)
+            interval_i = self._create_interval(
+                abs_index,
+                solved_bounds,
+                presetModel,
+                zero_lower=abs_index in zero_lower,
+            )
             intervals[rel_index] = interval_i
 
         return intervals  # TODO: add model model_state (omega, bias) to return value
 
-    def compute_probe_values(self, dims, isUpper=True, parallel=None, presetModel=None):
+    def _compute_probes(
+        self,
+        dims,
+        isUpper,
+        relevance_bounds,
+        parallel=None,
+        presetModel=None,
+        data=None,
+    ):
+        """
+        Probe values for the classification of features with the given (unnormalized) bounds.
+        Probes of the unconstrained model are cached, queries with presets reuse them
+        instead of solving their own probes.
+        """
+        key = (isUpper, tuple(dims))
+        if presetModel is not None and key in self._probe_cache:
+            return self._probe_cache[key]
+
+        if self.probe_tolerance is None or relevance_bounds is None:
+            probe_values = self._compute_cached_probe_values(
+                dims, isUpper, parallel=parallel, presetModel=presetModel, data=data
+            )
+        else:
+            probe_values = self._compute_adaptive_probes(
+                dims,
+                isUpper,
+                relevance_bounds,
+                parallel=parallel,
+                presetModel=presetModel,
+                data=data,
+            )
+
+        if presetModel is None:
+            self._probe_cache[key] = probe_values
+        return probe_values
+
+    def _compute_cached_probe_values(
+        self, dims, isUpper, parallel=None, presetModel=None, data=None
+    ):
+        """
+        Probe values with the persistent cache.
+        Cached probes are reused when the number of probes changed, only missing probes are solved.
+        Probes depend on the state of `random_state`, which is restored to its state after the cached probes.
+        """
+        if self.cache is None:
+            return self.compute_probe_values(
+                dims, isUpper, parallel=parallel, presetModel=presetModel, data=data
+            )
+
+        key = self._cache_key("probes", isUpper, dims, presetModel, self.random_state)
+        cached = self.cache.get(key, {"n_probes": 0, "values": np.array([])})
+        if cached["n_probes"] >= self.n_resampling:
+            self.random_state.set_state(cached["random_state"])
+            return cached["values"][: self.n_resampling]
+
+        missing = self.compute_probe_values(
+            dims,
+            isUpper,
+            parallel=parallel,
+            presetModel=presetModel,
+            data=data,
+            n_resampling=self.n_resampling - cached["n_probes"],
+            first_probeID=cached["n_probes"],
+        )
+        probe_values = np.append(cached["values"], missing)
+        if not self._budget_exhausted:
+            self.cache.set(
+                key,
+                {
+                    "n_probes": self.n_resampling,
+                    "values": probe_values,
+                    "random_state": self.random_state.get_state(),
+                },
+            )
+        return probe_values
+
+    def _compute_adaptive_probes(
+        self,
+        dims,
+        isUpper,
+        relevance_bounds,
+        parallel=None,
+        presetModel=None,
+        data=None,
+    ):
+        """
+        With `probe_tolerance` probes are solved in batches until the probe threshold is stable
+        or all features are far enough from the threshold that their class can not change.
+        """
+        # Lower probes are compared to the lower bounds, upper probes to the upper bounds
+        feature_values = relevance_bounds[:, 1] if isUpper else relevance_bounds[:, 0]
+        batch_size = math.ceil(self.n_resampling / ADAPTIVE_PROBE_BATCHES)
+
+        probe_values = np.array([])
+        threshold = None
+        for start in range(0, self.n_resampling, batch_size):
+            batch = self.compute_probe_values(
+                dims,
+                isUpper,
+                parallel=parallel,
+                presetModel=presetModel,
+                data=data,
+                n_resampling=min(batch_size, self.n_resampling - start),
+                first_probeID=start,
+            )
+            probe_values = np.append(probe_values, batch)
+            if len(probe_values) < 2:
+                continue
+
+            last_threshold = threshold
+            _, threshold = create_probe_statistic(probe_values, PROBE_FPR)
+            if last_threshold is not None and abs(
+                threshold - last_threshold
+            ) <= self.probe_tolerance * abs(last_threshold):
+                break
+
+            # Features which are clearly below the probe mean or clearly above the threshold keep their class
+            mean = probe_values.mean()
+            width = threshold - mean
+            if np.all((feature_values < mean) | (feature_values > threshold + width)):
+                break
+
+        if self.verbose > 0:
+            logging.info(
+                f"Solved {len(probe_values)} of {self.n_resampling} probes (probe_tolerance={self.probe_tolerance})"
+            )
+        return probe_values
+
+    def compute_probe_values(
+        self,
+        dims,
+        isUpper=True,
+        parallel=None,
+        presetModel=None,
+        data=None,
+        n_resampling=None,
+        first_probeID=0,
+    ):
         # Get model parameters
         init_model_state = self.best_init_model.model_state
+        if data is None:
+            data = self.data
+        if n_resampling is None:
+            n_resampling = self.n_resampling
 
         # Prepare parallel framework
         if parallel is None:
@@ -180,20 +926,43 @@ class RelevanceBoundsIntervals(object):
 
         # Generate
         probe_queue = self._generate_probe_value_tasks(
-            self.data,
+            data,
             dims,
             isUpper,
-            self.n_resampling,
+            n_resampling,
             self.random_state,
             presetModel,
             init_model_state,
+            first_probeID=first_probeID,
+        )
+        chunks = _chunk_tasks(
+            probe_queue,
+            key=lambda probe: probe.probeID,
+            size=self._chunk_size(n_resampling),
         )
+        if self.budget is not None:
+            chunks = self.budget.limit(chunks)
         # Compute solution
-        probe_results = parallel(map(joblib.delayed(_start_solver_worker), probe_queue))
+        probe_results = parallel(
+            joblib.delayed(_start_solver_worker)(chunk, deadline=self._deadline)
+            for chunk in chunks
+        )
+        self._check_deadline()
+        # Sequential runs leave compiled problems in this process
+        clear_template_cache()
         # probe_values.extend([probe.objective.value for probe in probe_results if probe.is_solved])
 
+        probe_values = self._aggregate_probes(
+            itertools.chain.from_iterable(probe_results), isUpper
+        )
+        return np.array(probe_values)
+
+    def _aggregate_probes(self, finished_probes, isUpper):
+        """
+        Values of all probes whose candidate problems are contained in `finished_probes`.
+        """
         candidates = defaultdict(list)
-        for candidate in probe_results:
+        for candidate in finished_probes:
             # Only add bounds with feasible solutions
             if candidate.is_solved:
                 candidates[candidate.probeID].append(candidate)
@@ -212,36 +981,289 @@ class RelevanceBoundsIntervals(object):
                     )
                 )
 
-        return np.array(probe_values)
+        return probe_values
+
+    def _solve_bound_tasks(self, task_lists, parallel):
+        """
+        Solve several lists of bound problems in one work queue.
+        Identical problems (e.g. in different preset scenarios) are solved once.
+        Returns the finished problems for each list.
+        """
+        unique_tasks = {}
+        keys = []
+        for task_list in task_lists:
+            keys.append([])
+            for task in task_list:
+                key = task.subproblem_key
+                unique_tasks.setdefault(key, task)
+                keys[-1].append(key)
+
+        # Bounds which were solved before an interruption are restored from the checkpoint
+        finished = {}
+        if self.checkpoint is not None:
+            records = self._read_checkpoint()
+            for key, task in list(unique_tasks.items()):
+                if not is_checkpointed(task):
+                    continue
+                record = records.get(checkpoint_key(task))
+                if record is not None:
+                    task.restore(*record)
+                    task.release_data()
+                    finished[key] = unique_tasks.pop(key)
+
+        n_groups = len(
+            list(
+                itertools.groupby(
+                    unique_tasks.values(), key=lambda bound: bound.current_feature
+                )
+            )
+        )
+        # All bounds of a block of features are solved in one task
+        chunks = _chunk_tasks(
+            unique_tasks.values(),
+            key=lambda bound: bound.current_feature,
+            size=self._chunk_size(n_groups),
+        )
+        if self.budget is not None:
+            chunks = self.budget.limit(chunks)
+        bound_results = parallel(
+            joblib.delayed(_start_solver_worker)(
+                chunk, self.checkpoint, deadline=self._deadline
+            )
+            for chunk in chunks
+        )
+        self._check_deadline()
+
+        for bound in itertools.chain.from_iterable(bound_results):
+            finished[bound.subproblem_key] = bound
+        # Problems which were not dispatched within the budget
+        for key, task in unique_tasks.items():
+            if key not in finished:
+                self._undispatched.add((task.current_feature, task.isLowerBound))
+        return [
+            [finished[key] for key in task_keys if key in finished]
+            for task_keys in keys
+        ]
+
+    def _read_checkpoint(self):
+        # Records of earlier runs, bounds solved in this run are not needed
+        if self._checkpoint_records is None:
+            self._checkpoint_records = open_checkpoint(self.checkpoint)
+        return self._checkpoint_records
+
+    def _checkpoint_zero_lower_bounds(self, features):
+        # Certified lower bounds are never solved, we record them for resumed runs
+        records = self._read_checkpoint()
+        for feature in features:
+            key = lower_bound_key(feature)
+            if key not in records:
+                append_record(self.checkpoint, key, 0.0, "optimal")
+                records[key] = 0.0, "optimal"
+
+    def _zero_lower_bound_features(self, finished_bounds, presetModel=None):
+        """
+        Features which have a zero weight in a feasible solution of the bound problems have a lower bound of 0.
+        The baseline model is feasible for the relaxed constraints (without presets),
+        all solved bound problems share the same feasible set.
+        """
+        X, _ = self.data
+        zero = np.zeros(X.shape[1], dtype=bool)
+        if presetModel is None:
+            w = self.best_init_model.model_state["w"]
+            tolerance = ZERO_WEIGHT_TOLERANCE * self.best_init_model.L1_factor
+            zero |= np.abs(w) <= tolerance
+        for bound in finished_bounds:
+            if bound.is_solved and bound.zero_weights is not None:
+                zero |= bound.zero_weights
+
+        if self.verbose > 0:
+            logging.info(f"Lower bounds of {zero.sum()} features are certified to be 0")
+        return set(np.flatnonzero(zero))
+
+    def _screen_samples(self, data, upper_results, screened, irrelevant=None):
+        """
+        Data (and sample weights) without the samples whose constraints hold without slack in every feasible model,
+        `None` if the problem type does not support sample screening or no sample can be removed.
+        The solved upper bounds (and dual bounds of `irrelevant` features) limit `|w|` of every feature,
+        which makes the screening tighter.
+        """
+        X, y = data
+        template = self.problem_type.get_cvxproblem_template
+        weight_bounds = np.full(X.shape[1], self.init_constraints["w_l1"])
+        values = defaultdict(list)
+        unsolved = set()
+        for bound in upper_results:
+            if bound.is_solved:
+                values[bound.current_feature].append(bound.solved_relevance)
+            else:
+                unsolved.add(bound.current_feature)
+        for feature, feature_values in values.items():
+            if feature not in unsolved:
+                weight_bounds[feature] = max(0, max(feature_values))
+        for feature, representative in screened.items():
+            weight_bounds[feature] = weight_bounds[representative]
+        for feature, bound in (irrelevant or {}).items():
+            weight_bounds[feature] = max(0, min(weight_bounds[feature], bound))
+
+        keep = template.screen_samples(
+            data,
+            self.best_hyperparameters,
+            self.init_constraints,
+            weight_bounds,
+            solver=self.solver,
+            sample_weight=self.sample_weight,
+        )
+        if keep is None or keep.all() or not keep.any():
+            return None
+        if self.verbose > 0:
+            logging.info(
+                f"Screened {np.sum(~keep)} of {len(keep)} samples for lower bound problems"
+            )
+        sample_weight = self.sample_weight
+        if sample_weight is not None:
+            sample_weight = np.asarray(sample_weight)[keep]
+        return (X[keep], np.asarray(y)[keep]), sample_weight
+
+    def _screen_constant_features(self, dims, data, presetModel=None):
+        """
+        Screening of features whose bounds are known without solving their problems.
+        A constant column (e.g. all zero) is absorbed by the bias of the model, its weight only uses L1 budget.
+        The lower bound of such a feature is therefore 0 and its upper bound is the unused L1 budget,
+        which is the same for all constant features.
+        Only the first constant feature is solved, the others are mapped to it.
+
+        Returns
+        -------
+        solve_dims : list
+            Features whose problems have to be solved
+        screened : dict
+            Mapping of skipped features to the feature which represents them
+        """
+        dims = list(dims)
+        if not self.problem_type.get_cvxproblem_template.absorbs_constant_features:
+            return dims, {}
+
+        X, _ = data
+        candidates = [di for di in dims if presetModel is None or di not in presetModel]
+        if len(candidates) < 2:
+            return dims, {}
+        # Reductions over the columns, selecting them first would copy (memory mapped) data
+        if sparse.issparse(X):
+            # Minima and maxima include the implicit zeros
+            spread = X.max(axis=0).toarray() - X.min(axis=0).toarray()
+        else:
+            spread = X.max(axis=0) - X.min(axis=0)
+        constant = np.ravel(spread) == 0
+        constant_dims = [di for di in candidates if constant[di]]
+        if len(constant_dims) < 2:
+            return dims, {}
+
+        representative = constant_dims[0]
+        screened = {di: representative for di in constant_dims[1:]}
+        if self.verbose > 0:
+            logging.info(
+                f"Screened {len(screened)} constant features, their bounds are taken from feature {representative}"
+            )
+        solve_dims = [di for di in dims if di not in screened]
+        return solve_dims, screened
+
+    def _screen_irrelevant_features(self, dims, probe_values_upper, presetModel=None):
+        """
+        Screening of features whose upper bound provably falls below the threshold of the upper probes.
+        These features are irrelevant, their problems are not solved and they are marked as unsolved,
+        their intervals (lower bound 0, upper bound the dual bound) are valid but wider.
+        The dual bounds hold for the problems with presets as well, presets only shrink the feasible set.
+        Only used with `feature_screening`.
+
+        Returns
+        -------
+        dict
+            Mapping of irrelevant features to the upper bound of their relevance
+        """
+        if not self.feature_screening:
+            return {}
+        if probe_values_upper is None or len(probe_values_upper) < 2:
+            return {}
+        if self._dual_bounds is None:
+            X, _ = self.data
+            template = self.problem_type.get_cvxproblem_template
+            bounds = template.relevance_upper_bounds(
+                self.data,
+                self.best_hyperparameters,
+                self.init_constraints,
+                self.best_init_model.model_state,
+                sample_weight=self.sample_weight,
+            )
+            if bounds is None:
+                bounds = np.full(X.shape[1], np.inf)
+            self._dual_bounds = bounds
+
+        _, threshold = create_probe_statistic(probe_values_upper, PROBE_FPR)
+        irrelevant = {
+            di: self._dual_bounds[di]
+            for di in dims
+            if self._dual_bounds[di] < threshold
+            and (presetModel is None or di not in presetModel)
+        }
+        if self.verbose > 0 and irrelevant:
+            logging.info(
+                f"Screened {len(irrelevant)} features whose upper bound is below the probe threshold"
+            )
+        self.unsolved_features.update(irrelevant)
+        return irrelevant
 
     def _generate_relevance_bounds_tasks(
-        self, dims, data, preset_model=None, best_model_state=None
+        self,
+        dims,
+        data,
+        preset_model=None,
+        best_model_state=None,
+        lower=True,
+        upper=True,
+        template_key=None,
+        sample_weight=None,
     ):
         # Do not compute bounds for fixed features
         if preset_model is not None:
             dims = [di for di in dims if di not in preset_model]
 
+        if sample_weight is None:
+            sample_weight = self.sample_weight
+
         # Instantiate objects for computation later
+        template = self.problem_type.get_cvxproblem_template
+        kwargs = dict(
+            template_key=template_key or self._template_key,
+            warm_start=self.warm_start,
+            solver=self.solver,
+            constraint_generation=self.constraint_generation,
+            column_generation=self.column_generation,
+            sample_weight=sample_weight,
+        )
         for di in dims:
             # Add Lower Bound problem(s) to work list
-            yield from self.problem_type.get_cvxproblem_template.generate_lower_bound_problem(
-                self.best_hyperparameters,
-                self.init_constraints,
-                best_model_state,
-                data,
-                di,
-                preset_model,
-            )
+            if lower:
+                yield from template.generate_lower_bound_problem(
+                    self.best_hyperparameters,
+                    self.init_constraints,
+                    best_model_state,
+                    data,
+                    di,
+                    preset_model,
+                    **kwargs,
+                )
 
             # Add problem(s) for Upper bound
-            yield from self.problem_type.get_cvxproblem_template.generate_upper_bound_problem(
-                self.best_hyperparameters,
-                self.init_constraints,
-                best_model_state,
-                data,
-                di,
-                preset_model,
-            )
+            if upper:
+                yield from template.generate_upper_bound_problem(
+                    self.best_hyperparameters,
+                    self.init_constraints,
+                    best_model_state,
+                    data,
+                    di,
+                    preset_model,
+                    **kwargs,
+                )
 
     def _generate_probe_value_tasks(
         self,
@@ -252,6 +1274,7 @@ class RelevanceBoundsIntervals(object):
         random_state,
         preset_model=None,
         best_model_state=None,
+        first_probeID=0,
     ):
         if isUpper:
             factory = (
@@ -264,24 +1287,35 @@ class RelevanceBoundsIntervals(object):
 
         # Random sample n_resampling shadow features by permuting real features and computing upper bound
         random_choice = random_state.choice(a=dims, size=n_resampling)
+        # Probes are described by feature and seed, the permutation itself is done in the worker
+        seeds = random_state.randint(np.iinfo(np.int32).max, size=n_resampling)
 
         # Instantiate objects
-        for i, di in enumerate(random_choice):
-            data_perm = permutate_feature_in_data(data, di, random_state)
-
+        for i, (di, seed) in enumerate(zip(random_choice, seeds)):
             # We only use upper bounds as probe features
             yield from factory(
                 self.best_hyperparameters,
                 self.init_constraints,
                 best_model_state,
-                data_perm,
+                data,
                 di,
                 preset_model,
-                probeID=i,
+                probeID=first_probeID + i,
+                probe_seed=seed,
+                template_key=uuid.uuid4().hex,
+                warm_start=self.warm_start,
+                solver=self.solver,
+                constraint_generation=self.constraint_generation,
+                column_generation=self.column_generation,
+                sample_weight=self.sample_weight,
             )
 
     def _create_interval(
-        self, feature: int, solved_bounds: dict, presetModel: dict = None
+        self,
+        feature: int,
+        solved_bounds: dict,
+        presetModel: dict = None,
+        zero_lower: bool = False,
     ):
         # Return preset values for fixed features
         if presetModel is not None:
@@ -291,19 +1325,58 @@ class RelevanceBoundsIntervals(object):
         all_bounds = solved_bounds[feature]
         min_problems_candidates = [p for p in all_bounds if p.isLowerBound]
         max_problems_candidates = [p for p in all_bounds if not p.isLowerBound]
-        if len(all_bounds) < 2:
+        if (feature, True) in self._undispatched or (
+            feature,
+            False,
+        ) in self._undispatched:
+            return self._partial_interval(
+                feature, min_problems_candidates, max_problems_candidates, zero_lower
+            )
+        # Lower bounds certified to be 0 are not solved
+        n_required = 1 if zero_lower else 2
+        if len(all_bounds) < n_required:
             logging.error(
                 f"(Some) relevance bounds for feature {feature} were not solved."
             )
             raise Exception("Infeasible bound(s).")
-        lower_bound = self.problem_type.get_cvxproblem_template.aggregate_min_candidates(
-            min_problems_candidates
-        )
+        if zero_lower:
+            lower_bound = 0
+        else:
+            lower_bound = self.problem_type.get_cvxproblem_template.aggregate_min_candidates(
+                min_problems_candidates
+            )
         upper_bound = self.problem_type.get_cvxproblem_template.aggregate_max_candidates(
             max_problems_candidates
         )
         return lower_bound, upper_bound
 
+    def _partial_interval(
+        self, feature, min_problems_candidates, max_problems_candidates, zero_lower
+    ):
+        """
+        Valid but wider interval of a feature whose problems were not all solved in the budget.
+        Missing lower bounds are replaced by 0 and missing upper bounds by the relaxed L1 norm.
+        """
+        self.unsolved_features.add(feature)
+        template = self.problem_type.get_cvxproblem_template
+
+        if zero_lower:
+            lower_bound = 0
+        elif (feature, True) not in self._undispatched and min_problems_candidates:
+            lower_bound = template.aggregate_min_candidates(min_problems_candidates)
+        else:
+            lower_bound = 0
+
+        if (feature, False) not in self._undispatched and max_problems_candidates:
+            upper_bound = template.aggregate_max_candidates(max_problems_candidates)
+        else:
+            upper_bound = sum(
+                value
+                for name, value in self.init_constraints.items()
+                if name.endswith("_l1")
+            )
+        return lower_bound, upper_bound
+
     def compute_single_preset_relevance_bounds(
         self, i: int, signed_preset_i: [float, float]
     ):
@@ -331,16 +1404,7 @@ class RelevanceBoundsIntervals(object):
         ----------
         lupi_features
         """
-
-        # The user is working with normalized values while we compute them unscaled
-        if self.normalize:
-            normalized = {}
-            for k, v in preset.items():
-                normalized[k] = np.asarray(v) * self.best_init_model.L1_factor
-            preset = normalized
-
-        # Add sign to presets
-        preset = self._add_sign_to_preset(preset)
+        preset = self._prepare_preset(preset)
 
         # Calculate all bounds with feature i set to min_i
         if lupi_features > 0:
@@ -352,6 +1416,64 @@ class RelevanceBoundsIntervals(object):
 
         return rangevector
 
+    def compute_multi_preset_relevance_bounds_batch(self, presets, lupi_features=0):
+        """
+        Method to run many preset scenarios at once.
+        The bound problems of all scenarios are solved in one work queue on one worker pool.
+
+        Parameters
+        ----------
+        presets : list of dict
+        lupi_features
+
+        Returns
+        -------
+        array of shape (n_scenarios, d, 2)
+        """
+        presets = [self._prepare_preset(preset) for preset in presets]
+
+        if lupi_features > 0:
+            # LUPI intervals are computed per scenario
+            return np.stack(
+                [
+                    self.get_normalized_lupi_intervals(
+                        lupi_features, presetModel=preset
+                    )[0]
+                    for preset in presets
+                ]
+            )
+
+        X, _ = self.data
+        dims = _get_necessary_dimensions(X.shape[1])
+        # Probes of the unconstrained model (if solved) screen irrelevant features of all scenarios
+        irrelevant = self._screen_irrelevant_features(
+            dims, self._probe_cache.get((True, tuple(dims)))
+        )
+        with self._task_data() as data, joblib.Parallel(
+            n_jobs=self.n_jobs, verbose=self.verbose
+        ) as parallel:
+            relevance_bounds = self._compute_scenario_relevance_bounds(
+                dims, presets, parallel=parallel, data=data, irrelevant=irrelevant
+            )
+
+        return np.stack(
+            [
+                self._postprocessing(self.best_init_model.L1_factor, bounds)
+                for bounds in relevance_bounds
+            ]
+        )
+
+    def _prepare_preset(self, preset):
+        # The user is working with normalized values while we compute them unscaled
+        if self.normalize:
+            normalized = {}
+            for k, v in preset.items():
+                normalized[k] = np.asarray(v) * self.best_init_model.L1_factor
+            preset = normalized
+
+        # Add sign to presets
+        return self._add_sign_to_preset(preset)
+
     def _add_sign_to_preset(self, unsigned_presets):
         """
         We need signed presets for our convex problem definition later.
@@ -410,7 +1532,7 @@ def _get_necessary_dimensions(d: int, presetModel: dict = None, start=0):
 
 
 def feature_classification(
-    probes_low, probes_up, relevance_bounds, fpr=1e-4, verbose=0
+    probes_low, probes_up, relevance_bounds, fpr=PROBE_FPR, verbose=0
 ):
     logging.debug("**** Feature Selection ****")
     logging.debug("Generating Lower Probe Statistic")
@@ -0,0 +1,91 @@
+"""
+    Weighted coresets for approximate relevance bounds on data with very many samples.
+    Samples are drawn with probabilities depending on their sensitivity, which we estimate from the margins
+    of a baseline model: samples with loss and samples close to the margin (candidates for support vectors)
+    are drawn more often than samples far on the correct side of the margin.
+    Every drawn sample is weighted with its inverse probability, so weighted losses on the coreset
+    are unbiased estimates of the losses on the full data (up to a constant scale, see `sample_coreset`).
+"""
+import numpy as np
+
+CORESET_METHODS = ["coreset"]  # Values of `approximate` in `FRI`
+DEFAULT_CORESET_SIZE = 10000
+DEFAULT_N_CORESETS = 3
+
+
+def check_approximate(approximate):
+    """
+    Validate the approximation mode selected by the user, `None` for exact relevance bounds.
+    """
+    if approximate is None:
+        return None
+    if approximate not in CORESET_METHODS:
+        raise ValueError(
+            f"Approximation '{approximate}' is unknown. Try one of {CORESET_METHODS}."
+        )
+    return approximate
+
+
+def sampling_probabilities(margins, sample_weight=None):
+    """
+    Probabilities of the samples to be drawn into a coreset.
+    Three equal shares are distributed uniformly, by closeness to the margin and by the loss of the baseline model.
+
+    Parameters
+    ----------
+    margins : array of shape (n)
+        Amount by which every sample satisfies its constraint in the baseline model without slack
+        (negative if the sample has loss), see `InitModel.margins`.
+    sample_weight : array of shape (n) or None
+        Weights of the samples, a sample with weight `k` counts like `k` samples.
+    """
+    margins = np.asarray(margins, dtype=float)
+    if sample_weight is None:
+        sample_weight = np.ones(len(margins))
+    sample_weight = np.asarray(sample_weight, dtype=float)
+
+    loss = np.maximum(0, -margins)
+    closeness = 1 / (1 + np.maximum(0, margins))
+    shares = []
+    for sensitivity in [np.ones(len(margins)), closeness, loss]:
+        share = sensitivity * sample_weight
+        total = np.sum(share)
+        if total > 0:
+            shares.append(share / total)
+    return np.mean(shares, axis=0)
+
+
+def sample_coreset(probabilities, size, random_state, sample_weight=None):
+    """
+    Draw a weighted coreset of `size` samples (with replacement).
+    The weights are scaled to sum up to `size` in expectation,
+    so hyperparameters chosen on `size` unweighted samples stay meaningful on the coreset.
+
+    Parameters
+    ----------
+    probabilities : array of shape (n)
+        Sampling probabilities, see `sampling_probabilities`.
+    size : int
+        Number of draws.
+    random_state : RandomState
+        numpy RandomState object
+    sample_weight : array of shape (n) or None
+        Weights of the samples.
+
+    Returns
+    -------
+    indices : array
+        Indices of the (unique) samples in the coreset.
+    weights : array
+        Weights of these samples.
+    """
+    n = len(probabilities)
+    draws = random_state.choice(n, size=size, p=probabilities)
+    indices, counts = np.unique(draws, return_counts=True)
+    if sample_weight is None:
+        weight, total = np.ones(len(indices)), n
+    else:
+        sample_weight = np.asarray(sample_weight, dtype=float)
+        weight, total = sample_weight[indices], np.sum(sample_weight)
+    weights = counts * weight / (probabilities[indices] * total)
+    return indices, weights
@@ -1,14 +1,77 @@
+import copy
+import os
+import time
+
+import joblib
+import numpy as np
 from sklearn.base import BaseEstimator
 from sklearn.exceptions import NotFittedError
 from sklearn.feature_selection.base import SelectorMixin
 from sklearn.utils import check_random_state
 from sklearn.utils.validation import check_is_fitted
 
+from fri.cache import DEFAULT_CACHE_SIZE, ResultCache
+from fri.checkpoint import create_checkpoint, read_baseline
 from fri.compute import RelevanceBoundsIntervals
+from fri.coreset import (
+    DEFAULT_CORESET_SIZE,
+    DEFAULT_N_CORESETS,
+    check_approximate,
+    sample_coreset,
+    sampling_probabilities,
+)
 from fri.model.base_type import ProblemType
-from fri.parameter_searcher import find_best_model
+from fri.parameter_searcher import check_search, find_best_model
+from fri.solver import check_solver
+from fri.utils import collapse_duplicates
 
 RELEVANCE_MAPPING = {0: "Irrelevant", 1: "Weak relevant", 2: "Strong relevant"}
+# Parameters which do not change the relevance bounds, a checkpoint can be resumed with other values
+_CHECKPOINT_IGNORED_PARAMS = {
+    "random_state",
+    "n_jobs",
+    "verbose",
+    "n_probe_features",
+    "probe_tolerance",
+    "shared_data",
+    "cache_dir",
+    "cache_size",
+    "time_budget",
+    "max_solves",
+}
+
+
+def _load_data(X):
+    """
+    Datasets stored in .npy files are memory mapped instead of loaded into memory.
+    """
+    if isinstance(X, (str, os.PathLike)):
+        return np.load(X, mmap_mode="r")
+    return X
+
+
+def _fit_coreset_intervals(estimator, data, sample_weight, seed, time_budget=None):
+    """
+    Worker method which computes the relevance intervals of one weighted coreset.
+    The baseline model is fitted on the coreset with the hyperparameters of `estimator.optim_model_`.
+    """
+    estimator = copy.copy(estimator)
+    # Coresets are solved in parallel, the bounds of one coreset sequentially
+    estimator.n_jobs = 1
+    estimator.random_state = np.random.RandomState(seed)
+
+    template = estimator.optim_model_
+    init_model = type(template)(**dict(template.hyperparam))
+    X, y = data
+    init_model.fit(X, y, sample_weight=sample_weight)
+    estimator.optim_model_ = init_model
+
+    computer = estimator._init_relevance_bounds_computer(
+        data, sample_weight=sample_weight, time_budget=time_budget
+    )
+    interval, feature_classes = computer.get_normalized_intervals()
+    computer.budget = None
+    return interval, feature_classes, computer
 
 
 class NotFeasibleForParameters(Exception):
@@ -26,6 +89,24 @@ class FRIBase(BaseEstimator, SelectorMixin):
         n_param_search=30,
         n_probe_features=40,
         normalize=True,
+        warm_start=False,
+        solver=None,
+        shared_data=False,
+        probe_tolerance=None,
+        cache_dir=None,
+        cache_size=DEFAULT_CACHE_SIZE,
+        time_budget=None,
+        max_solves=None,
+        dtype=np.float64,
+        sample_screening=False,
+        constraint_generation=False,
+        column_generation=False,
+        feature_screening=False,
+        collapse_duplicates=False,
+        approximate=None,
+        coreset_size=DEFAULT_CORESET_SIZE,
+        n_coresets=DEFAULT_N_CORESETS,
+        search="random",
         **kwargs,
     ):
         """
@@ -39,6 +120,24 @@ class FRIBase(BaseEstimator, SelectorMixin):
         n_param_search : int
         n_probe_features : int
         normalize : bool
+        warm_start : bool
+        solver : str or None
+        shared_data : bool
+        probe_tolerance : float or None
+        cache_dir : str or None
+        cache_size : int
+        time_budget : float or None
+        max_solves : int or None
+        dtype : numpy dtype
+        sample_screening : bool
+        constraint_generation : bool
+        column_generation : bool
+        feature_screening : bool
+        collapse_duplicates : bool
+        approximate : str or None
+        coreset_size : int
+        n_coresets : int
+        search : str
         kwargs :
 
         Attributes
@@ -57,6 +156,13 @@ class FRIBase(BaseEstimator, SelectorMixin):
 
         allrel_prediction_ : list(int)
         Relevance prediction encoded as boolean: 0 irrelevant, 1 relevant
+
+        unsolved_features_ : list(bool)
+        Features whose bounds were not solved within `time_budget` or `max_solves`
+        or were screened with `feature_screening` and whose intervals are widened conservatively
+
+        interval_error_ : array-like
+        Standard deviation of the relevance intervals over independent coresets (only with `approximate="coreset"`)
         """
 
         self.n_probe_features = n_probe_features
@@ -69,25 +175,51 @@ class FRIBase(BaseEstimator, SelectorMixin):
         self.n_jobs = n_jobs
         self.verbose = verbose
         self.normalize = normalize
+        self.warm_start = warm_start
+        self.solver = solver
+        self.shared_data = shared_data
+        self.probe_tolerance = probe_tolerance
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.time_budget = time_budget
+        self.max_solves = max_solves
+        self.dtype = dtype
+        self.sample_screening = sample_screening
+        self.constraint_generation = constraint_generation
+        self.column_generation = column_generation
+        self.feature_screening = feature_screening
+        self.collapse_duplicates = collapse_duplicates
+        self.approximate = approximate
+        self.coreset_size = coreset_size
+        self.n_coresets = n_coresets
+        self.search = search
 
         self.interval_ = None
         self.optim_model_ = None
         self.relevance_classes_ = None
         self.relevance_classes_string_ = None
         self.allrel_prediction_ = None
+        self.unsolved_features_ = None
+        self.interval_error_ = None
 
-    def fit(self, X, y, lupi_features=0, **kwargs):
+    def fit(self, X, y, lupi_features=0, resume=None, **kwargs):
         """
         Method to fit model on data.
 
         Parameters
         ----------
-        X : numpy.ndarray
+        X : numpy.ndarray, numpy.memmap, scipy.sparse matrix or str
+            Path of a .npy file is memory mapped. Memory mapped data stays on disk,
+            the workers share it through the page cache instead of receiving copies.
         y : numpy.ndarray
         lupi_features : int
             Amount of features which are considered privileged information in `X`.
             The data is expected to be structured in a way that all lupi features are at the end of the set.
             For example `lupi_features=1` would denote the last column of `X` to be privileged.
+        resume : str or None
+            Path of a checkpoint file. Every solved relevance bound is appended to the file.
+            When the file exists (e.g. after a crash) the baseline model and the bounds found in it
+            are reused instead of being computed again. Not supported for coresets (`approximate`).
         kwargs : dict
             Dictionary of additional keyword arguments depending on the `model`.
 
@@ -95,24 +227,36 @@ class FRIBase(BaseEstimator, SelectorMixin):
         -------
         `FRIBase`
         """
+        start = time.monotonic()
+        self._check_parameters()
+        X = _load_data(X)
         self.lupi_features_ = lupi_features
         self.n_samples_ = X.shape[0]
         self.n_features_ = X.shape[1] - lupi_features
 
-        self.optim_model_, best_score = self._fit_baseline(
-            X, y, lupi_features, **kwargs
-        )
+        data, sample_weight = self._preprocessing(X, y, lupi_features)
+        if self.approximate == "coreset":
+            if lupi_features > 0:
+                raise ValueError("Coresets are not supported for LUPI features.")
+            if len(data[1]) > self.coreset_size:
+                if resume is not None:
+                    raise ValueError("Checkpoints are not supported for coresets.")
+                return self._fit_coresets(data, sample_weight, start, **kwargs)
+        checkpoint = None if resume is None else os.path.abspath(resume)
+        if checkpoint is None:
+            self.optim_model_, best_score = self._fit_baseline(
+                data, sample_weight, lupi_features, **kwargs
+            )
+        else:
+            self.optim_model_, best_score = self._fit_checkpointed_baseline(
+                checkpoint, data, sample_weight, lupi_features, **kwargs
+            )
 
-        data = self.problem_type_.preprocessing((X, y), lupi_features=lupi_features)
-        self._relevance_bounds_computer = RelevanceBoundsIntervals(
+        self._relevance_bounds_computer = self._init_relevance_bounds_computer(
             data,
-            self.problem_type_,
-            self.optim_model_,
-            self.random_state,
-            self.n_probe_features,
-            self.n_jobs,
-            self.verbose,
-            normalize=self.normalize,
+            sample_weight=sample_weight,
+            checkpoint=checkpoint,
+            time_budget=self._remaining_time(start),
         )
         if lupi_features == 0:
             self.interval_, feature_classes = (
@@ -122,15 +266,275 @@ class FRIBase(BaseEstimator, SelectorMixin):
             self.interval_, feature_classes = self._relevance_bounds_computer.get_normalized_lupi_intervals(
                 lupi_features=lupi_features
             )
+        self._finish_budget()
         self._get_relevance_mask(feature_classes)
+        if self.approximate is not None:
+            # Small data is solved exactly
+            self.interval_error_ = np.zeros_like(self.interval_)
 
         # Return the classifier
         return self
 
-    def _fit_baseline(self, X, y, lupi_features=0, **kwargs):
+    def _fit_coresets(self, data, sample_weight, start, **kwargs):
+        """
+        Approximate relevance intervals on weighted coresets of the data (see `fri.coreset`).
+        Hyperparameters are searched on a uniform sample of `coreset_size` samples,
+        whose baseline model yields the margins of all samples for the coreset sampling.
+        The intervals are averaged over `n_coresets` independent coresets which are solved in parallel,
+        their standard deviation is stored as `interval_error_`.
+        """
+        X, y = data
+        n = len(y)
+        size = self.coreset_size
+        if sample_weight is None:
+            uniform = np.full(n, 1 / n)
+        else:
+            uniform = sample_weight / np.sum(sample_weight)
+        indices, weights = sample_coreset(
+            uniform, size, self.random_state, sample_weight
+        )
+        self.optim_model_, best_score = self._fit_baseline(
+            (X[indices], y[indices]), weights, **kwargs
+        )
+
+        probabilities = sampling_probabilities(
+            self.optim_model_.margins(X, y), sample_weight
+        )
+        coresets = [
+            sample_coreset(probabilities, size, self.random_state, sample_weight)
+            for _ in range(self.n_coresets)
+        ]
+        seeds = self.random_state.randint(np.iinfo(np.int32).max, size=self.n_coresets)
+        time_budget = self._remaining_time(start)
+        # The estimator is sent to the workers, without the data of an earlier fit
+        self._relevance_bounds_computer = None
+        results = joblib.Parallel(n_jobs=self.n_jobs, verbose=self.verbose)(
+            joblib.delayed(_fit_coreset_intervals)(
+                self, (X[indices], y[indices]), weights, seed, time_budget
+            )
+            for (indices, weights), seed in zip(coresets, seeds)
+        )
+        intervals, feature_classes, computers = zip(*results)
+
+        self.interval_ = np.mean(intervals, axis=0)
+        self.interval_error_ = np.std(
+            intervals, axis=0, ddof=min(1, len(intervals) - 1)
+        )
+        # Queries after the fit (e.g. constrained intervals) use the first coreset
+        self._relevance_bounds_computer = computers[0]
+        unsolved = np.zeros(len(self.interval_), dtype=bool)
+        for computer in computers:
+            unsolved[sorted(computer.unsolved_features)] = True
+        self.unsolved_features_ = unsolved
+        # Majority vote of the relevance classes
+        votes = np.apply_along_axis(
+            np.bincount, 0, np.asarray(feature_classes, dtype=int), minlength=3
+        )
+        self._get_relevance_mask(np.argmax(votes, axis=0))
+        return self
+
+    def iter_intervals(self, X, y, **kwargs):
+        """
+        Fit the model like `fit` and yield the relevance interval of each feature as soon as it is computed.
+        Features are yielded in the order in which their bounds are solved.
+        Probes are solved first, the relevance class of a feature is provisional (`None` until enough probes are solved).
+        When the generator is exhausted the model is fitted with the final relevance classes.
+        Closing the generator early cancels the problems which were not solved yet.
+        LUPI features, coresets (`approximate`), checkpoints (`resume`), `cache_dir`, `probe_tolerance`,
+        `sample_screening` and `feature_screening` are not supported.
+
+        Parameters
+        ----------
+        X : numpy.ndarray, numpy.memmap, scipy.sparse matrix or str
+            Path of a .npy file is memory mapped (see `fit`).
+        y : numpy.ndarray
+        kwargs : dict
+            Dictionary of additional keyword arguments depending on the `model`.
+
+        Yields
+        -------
+        tuple
+            (feature index, normalized lower bound, normalized upper bound, provisional relevance class)
+        """
+        start = time.monotonic()
+        self._check_parameters()
+        if self.approximate is not None:
+            raise ValueError("Coresets are not supported when iterating intervals.")
+        if "resume" in kwargs:
+            raise ValueError("Checkpoints are not supported when iterating intervals.")
+        unsupported = [
+            name
+            for name in [
+                "cache_dir",
+                "probe_tolerance",
+                "sample_screening",
+                "feature_screening",
+            ]
+            if getattr(self, name) not in (None, False)
+        ]
+        if unsupported:
+            raise ValueError(
+                f"Parameters {unsupported} are not supported when iterating intervals."
+            )
+        X = _load_data(X)
+        self.lupi_features_ = 0
+        self.n_samples_ = X.shape[0]
+        self.n_features_ = X.shape[1]
+
+        data, sample_weight = self._preprocessing(X, y)
+        self.optim_model_, best_score = self._fit_baseline(
+            data, sample_weight, **kwargs
+        )
+
+        self._relevance_bounds_computer = self._init_relevance_bounds_computer(
+            data, sample_weight=sample_weight, time_budget=self._remaining_time(start)
+        )
+        self.interval_, feature_classes = (
+            yield from self._relevance_bounds_computer.iter_normalized_intervals()
+        )
+        self._finish_budget()
+        self._get_relevance_mask(feature_classes)
+
+    def _check_parameters(self):
+        # Validated here, not in `__init__`, to keep `get_params` and `clone` intact
+        self.solver_ = check_solver(self.solver)
+        check_approximate(self.approximate)
+        check_search(self.search)
+
+    def _remaining_time(self, start):
+        if self.time_budget is None:
+            return None
+        return max(0, self.time_budget - (time.monotonic() - start))
+
+    def _finish_budget(self):
+        computer = self._relevance_bounds_computer
+        unsolved = np.zeros(len(self.interval_), dtype=bool)
+        unsolved[sorted(computer.unsolved_features)] = True
+        self.unsolved_features_ = unsolved
+        # Queries after the fit (e.g. constrained intervals) are not budgeted
+        computer.budget = None
+
+    def _preprocessing(self, X, y, lupi_features=0):
+        """
+        Checked data and sample weights, duplicated samples are collapsed with `collapse_duplicates`.
+        """
+        data = self.problem_type_.preprocessing(
+            (X, y), lupi_features=lupi_features, dtype=self.dtype
+        )
+        if not self.collapse_duplicates:
+            return data, None
+        return collapse_duplicates(data)
+
+    def _init_relevance_bounds_computer(
+        self, data, sample_weight=None, checkpoint=None, time_budget=None
+    ):
+        return RelevanceBoundsIntervals(
+            data,
+            self.problem_type_,
+            self.optim_model_,
+            self.random_state,
+            self.n_probe_features,
+            self.n_jobs,
+            self.verbose,
+            normalize=self.normalize,
+            warm_start=self.warm_start,
+            solver=self.solver_,
+            shared_data=self.shared_data,
+            probe_tolerance=self.probe_tolerance,
+            cache=self._get_cache(),
+            checkpoint=checkpoint,
+            time_budget=time_budget,
+            max_solves=self.max_solves,
+            sample_screening=self.sample_screening,
+            constraint_generation=self.constraint_generation,
+            column_generation=self.column_generation,
+            feature_screening=self.feature_screening,
+            sample_weight=sample_weight,
+        )
+
+    def _get_cache(self):
+        if self.cache_dir is None:
+            return None
+        return ResultCache(self.cache_dir, max_size=self.cache_size)
+
+    def _fit_baseline(self, data, sample_weight=None, lupi_features=0, **kwargs):
+        cache = self._get_cache()
+        if cache is not None:
+            key = ResultCache.key(
+                "baseline",
+                data,
+                sample_weight,
+                lupi_features,
+                type(self.problem_type_).__name__,
+                self.problem_type_.chosen_parameters_,
+                self.problem_type_.relax_factors_,
+                self.n_param_search,
+                self.search,
+                self.solver_,
+                self.random_state,
+                kwargs,
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                # Later random draws (e.g. probes) continue like after the search
+                *result, state = cached
+                self.random_state.set_state(state)
+                return tuple(result)
+
+        result = self._search_baseline(data, sample_weight, lupi_features, **kwargs)
+        if cache is not None:
+            cache.set(key, (*result, self.random_state.get_state()))
+        return result
+
+    def _fit_checkpointed_baseline(
+        self, checkpoint, data, sample_weight=None, lupi_features=0, **kwargs
+    ):
+        """
+        Baseline model stored in the checkpoint, a new checkpoint is created with the fitted baseline.
+        The checkpoint belongs to the data and the parameters, the result of the (random) search is reused.
+        """
+        params = {
+            name: value
+            for name, value in self.get_params(deep=False).items()
+            if name not in _CHECKPOINT_IGNORED_PARAMS
+        }
+        fingerprint = ResultCache.key(
+            "checkpoint",
+            data,
+            sample_weight,
+            lupi_features,
+            type(self.problem_type_).__name__,
+            # Hyperparameters and relaxation factors only reach the problem type
+            self.problem_type_.chosen_parameters_,
+            self.problem_type_.relax_factors_,
+            params,
+            kwargs,
+        )
+        baseline = read_baseline(checkpoint, fingerprint)
+        if baseline is not None:
+            init_model = self.problem_type_.get_initmodel_template(
+                **baseline["hyperparameters"]
+            )
+            init_model.constraints = baseline["constraints"]
+            init_model.model_state = baseline["model_state"]
+            return init_model, baseline["score"]
+
+        init_model, best_score = self._fit_baseline(
+            data, sample_weight, lupi_features, **kwargs
+        )
+        create_checkpoint(
+            checkpoint,
+            fingerprint,
+            {
+                "hyperparameters": dict(init_model.hyperparam),
+                "constraints": init_model.constraints,
+                "model_state": init_model.model_state,
+                "score": best_score,
+            },
+        )
+        return init_model, best_score
 
-        # Preprocessing
-        data = self.problem_type_.preprocessing((X, y), lupi_features=lupi_features)
+    def _search_baseline(self, data, sample_weight=None, lupi_features=0, **kwargs):
         # Get predefined template for our init. model
         init_model_template = self.problem_type_.get_initmodel_template
         # Get hyperparameters which are predefined to our model template and can be seleted by user choice
@@ -147,6 +551,9 @@ class FRIBase(BaseEstimator, SelectorMixin):
             self.n_jobs,
             self.verbose,
             lupi_features=lupi_features,
+            solver=self.solver_,
+            sample_weight=sample_weight,
+            search=self.search,
             **kwargs,
         )
         return optimal_model, best_score
@@ -240,6 +647,33 @@ class FRIBase(BaseEstimator, SelectorMixin):
             preset=preset, lupi_features=self.lupi_features_
         )
 
+    def constrained_intervals_batch(self, presets: list):
+        """
+        Method to return relevance intervals for many preset scenarios at once.
+        The bounds of all scenarios are computed with one worker pool and identical problems are only solved once.
+
+        Parameters
+        ----------
+        presets : list of dict like
+            List of presets, see `constrained_intervals`.
+
+            Example: To fix every feature to its minimum relevance bound in turn use
+
+            >>> presets = [{i: self.interval_[i, 0]} for i in range(self.n_features_)]
+
+        Returns
+        -------
+        array like of shape (n_scenarios, n_features, 2)
+            Relevance bounds with user constraints for every scenario
+        """
+
+        # Do we have intervals?
+        check_is_fitted(self, "interval_")
+
+        return self._relevance_bounds_computer.compute_multi_preset_relevance_bounds_batch(
+            presets=presets, lupi_features=self.lupi_features_
+        )
+
     def print_interval_with_class(self):
         """
 
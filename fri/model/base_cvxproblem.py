@@ -1,11 +1,139 @@
+import copy
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
 import cvxpy as cvx
 import numpy as np
 from cvxpy import SolverError
+from scipy import sparse
+from scipy.optimize import linprog
+
+from fri.solver import (
+    DEFAULT_SOLVER,
+    NATIVE_SOLVERS,
+    choose_solver,
+    linprog_kwargs,
+    solver_kwargs,
+)
+from fri.utils import permutate_feature_in_buffer
+
+# Compiled (parametric) problems which are reused for all features of the same data.
+# The cache is process local, i.e. every joblib worker keeps its own templates.
+_TEMPLATE_CACHE = OrderedDict()
+_TEMPLATE_CACHE_SIZE = 8
+
+# Weights below this fraction of the L1 norm are treated as zero in lower bound certificates
+ZERO_WEIGHT_TOLERANCE = 1e-9
+# Samples are only screened if their constraint is satisfied with this margin (relative to its scale)
+SAMPLE_SCREENING_TOLERANCE = 1e-6
+# Dual upper bounds of the relevance are increased by this (relative to the L1 norm) against rounding errors
+DUAL_BOUND_TOLERANCE = 1e-6
+
+# Active samples of the constraint generation engine, shared by all problems with the same template key
+_ACTIVE_SAMPLES = OrderedDict()
+# Constraint generation starts with the samples whose constraint is (nearly) active in the baseline model
+CONSTRAINT_GENERATION_MARGIN = 0.1
+# Constraints of inactive samples which are violated by more than this are added to the problem
+CONSTRAINT_GENERATION_TOLERANCE = 1e-6
+
+# Working sets of features of the column generation engine, shared like the active samples
+_WORKING_FEATURES = OrderedDict()
+# Features whose weights have a reduced cost below minus this are added to the working set
+COLUMN_GENERATION_TOLERANCE = 1e-7
+
+
+def clear_template_cache():
+    """
+    Remove all compiled problem templates of the current process.
+    """
+    _TEMPLATE_CACHE.clear()
+    _ACTIVE_SAMPLES.clear()
+    _WORKING_FEATURES.clear()
+
+
+def _remember(cache, key, value):
+    if key is None:
+        return
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _TEMPLATE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def max_dot_products(X, weight_bounds, l1, block_elements=2 ** 20):
+    """
+    Maximum of `x @ w` for every row `x` of `X` over all weights with `|w| <= weight_bounds` and `||w||_1 <= l1`.
+    Per row this is a fractional knapsack: the largest `|x_k|` get their full bound until the L1 norm is used up.
+    Rows are processed in blocks of about `block_elements` entries (nonzero entries for sparse `X`).
+    """
+    weight_bounds = np.minimum(weight_bounds, l1)
+    if sparse.issparse(X):
+        return _sparse_max_dot_products(
+            sparse.csr_matrix(X), weight_bounds, l1, block_elements
+        )
+
+    block_size = max(1, block_elements // max(1, X.shape[1]))
+    result = np.empty(X.shape[0])
+    for start in range(0, X.shape[0], block_size):
+        block = np.abs(X[start : start + block_size])
+        order = np.argsort(-block, axis=1)
+        values = np.take_along_axis(block, order, axis=1)
+        bounds = weight_bounds[order]
+        used = np.cumsum(bounds, axis=1) - bounds
+        taken = np.clip(l1 - used, 0, bounds)
+        result[start : start + block_size] = np.sum(values * taken, axis=1)
+    return result
+
+
+def _sparse_max_dot_products(X, weight_bounds, l1, block_elements):
+    # Implicit zeros do not contribute, only the nonzero entries of every row are sorted
+    result = np.zeros(X.shape[0])
+    start = 0
+    while start < X.shape[0]:
+        # Rows whose nonzero entries fit into the block (at least one row)
+        end = np.searchsorted(X.indptr, X.indptr[start] + block_elements, side="right")
+        end = min(max(end - 1, start + 1), X.shape[0])
+        first, last = X.indptr[start], X.indptr[end]
+        counts = np.diff(X.indptr[start : end + 1])
+        rows = np.repeat(np.arange(end - start), counts)
+
+        values = np.abs(X.data[first:last])
+        # Descending values within every row, rows stay in their order
+        order = np.lexsort((-values, rows))
+        values = values[order]
+        bounds = weight_bounds[X.indices[first:last][order]]
+        cumulative = np.cumsum(bounds)
+        row_offsets = np.append(0, cumulative)[X.indptr[start:end] - first]
+        used = cumulative - bounds - np.repeat(row_offsets, counts)
+        taken = np.clip(l1 - used, 0, bounds)
+        result[start:end] = np.bincount(
+            rows, weights=values * taken, minlength=end - start
+        )
+        start = end
+    return result
 
 
 class Relevance_CVXProblem(ABC):
+    # Problems which are linear programs can be solved by a dedicated LP solver
+    linear_program = False
+    # Problems which implement `_linear_constraints` can skip cvxpy and use `scipy.optimize.linprog`
+    native_lp = False
+    # Problems with a bias term absorb constant features, which are screened before solving (see `fri.compute`)
+    absorbs_constant_features = False
+    # Solutions of problems whose lower bound is `min |w_i|` certify a lower bound of 0 for all zero weights
+    zero_weight_certificates = True
+    # Problems which implement `_constraint_slack` (with a scalar bias `b`) support constraint generation
+    supports_constraint_generation = False
+
+    # Mapping of `scipy.optimize.linprog` status codes to cvxpy status
+    _LINPROG_STATUS = {
+        0: cvx.OPTIMAL,
+        1: cvx.USER_LIMIT,
+        2: cvx.INFEASIBLE,
+        3: cvx.UNBOUNDED,
+        4: cvx.SOLVER_ERROR,
+    }
+
     def __str__(self) -> str:
         if self.isLowerBound:
             lower = "Lower"
@@ -33,6 +161,13 @@ class Relevance_CVXProblem(ABC):
         preset_model=None,
         best_model_state=None,
         probeID=-1,
+        template_key=None,
+        warm_start=False,
+        solver=None,
+        probe_seed=None,
+        constraint_generation=False,
+        column_generation=False,
+        sample_weight=None,
         **kwargs,
     ) -> None:
         self._probeID = probeID
@@ -44,19 +179,39 @@ class Relevance_CVXProblem(ABC):
         self.preset_model = preset_model
         self.best_model_state = best_model_state
 
+        # Weights of the samples in the loss, e.g. counts of collapsed duplicate rows (see `fri.utils`)
+        self.sample_weight = sample_weight
         self.preprocessing_data(data, best_model_state)
+        # Probes permute their feature lazily in the worker (see `solve`), we keep the unpermuted data for that
+        self.probe_seed = probe_seed
+        self._data = data if probe_seed is not None else None
+
+        self.init_hyperparameters = hyperparameters
+        self.init_model_constraints = best_model_constraints
 
-        # Initialize constraints
+        # Problems sharing the same key (same data and constraints) reuse one compiled problem
+        self.template_key = template_key
+        self._objective_kwargs = {}
+
+        # Seed the solver with the baseline model and the last solution of the compiled problem
+        self.warm_start = warm_start
+        # Solver backend (see `fri.solver`), `None` selects one automatically
+        self.solver = solver
+        # Solve on an active subset of samples which grows until no constraint is violated
+        self.constraint_generation = constraint_generation
+        self._lp_solution = None
+        # Identifies the active samples in the template cache
+        self._active_key = None
+        # Solve linear programs on a working set of features which grows while other weights can improve the objective
+        self.column_generation = column_generation
+
+        # The cvxpy problem itself is built lazily in the worker (see 'solve')
         self._constraints = []
         self._objective = None
         self.w = None
-        self._init_constraints(hyperparameters, best_model_constraints)
-
-        if self.preset_model is not None:
-            self._add_preset_constraints(self.preset_model, best_model_constraints)
-
-        self.init_hyperparameters = hyperparameters
-        self.init_model_constraints = best_model_constraints
+        self._solver_status = None
+        self._solved_relevance = None
+        self._zero_weights = None
 
     def preprocessing_data(self, data, best_model_state):
         X, y = data
@@ -65,6 +220,24 @@ class Relevance_CVXProblem(ABC):
         self.X = X
         self.y = np.array(y)
 
+    @property
+    def sample_weights(self):
+        """
+        Weights of all samples, 1 for unweighted data.
+        """
+        if self.sample_weight is None:
+            return np.ones(self.n)
+        return np.asarray(self.sample_weight, dtype=float)
+
+    def release_data(self):
+        """
+        Drop references to the data after solving, e.g. before the result is sent back from a worker.
+        """
+        self.X = None
+        self.y = None
+        self._data = None
+        self.sample_weight = None
+
     @property
     def constraints(self):
         return self._constraints
@@ -79,10 +252,62 @@ class Relevance_CVXProblem(ABC):
     @property
     def solved_relevance(self):
         if self.is_solved:
-            return self.objective.value
+            return self._solved_relevance
         else:
             raise Exception("Problem not solved. No feature relevance computed.")
 
+    @property
+    def zero_weights(self):
+        """
+        Boolean mask of the features with zero weight in the solution, `None` if not available.
+        """
+        if self._zero_weights is None:
+            return None
+        return np.unpackbits(self._zero_weights)[: self.d].astype(bool)
+
+    def _store_zero_weights(self, w):
+        # Only solutions of bound problems on the real data are certificates, the mask is packed to keep results small
+        if w is None or self.isProbe or not self.zero_weight_certificates:
+            return
+        tolerance = ZERO_WEIGHT_TOLERANCE * self.init_model_constraints["w_l1"]
+        self._zero_weights = np.packbits(np.abs(w) <= tolerance)
+
+    @property
+    def objective_kwargs(self):
+        return self._objective_kwargs
+
+    @property
+    def status(self):
+        return self._solver_status
+
+    def restore(self, solved_relevance, status):
+        """
+        Set the result of an earlier solve (e.g. from a checkpoint) instead of solving the problem.
+        """
+        self._solved_relevance = solved_relevance
+        self._solver_status = status
+
+    @property
+    def subproblem_key(self):
+        """
+        Problems with the same key have the same solution, e.g. bounds of a feature in identical preset scenarios.
+        """
+        preset = None
+        if self.preset_model is not None:
+            preset = tuple(
+                (feature, tuple(np.asarray(values, dtype=float).ravel()))
+                for feature, values in sorted(self.preset_model.items())
+                if feature != self.current_feature
+            )
+        return (
+            self.template_key,
+            self.probeID,
+            self.current_feature,
+            self.isLowerBound,
+            tuple(sorted(self._objective_kwargs.items())),
+            preset,
+        )
+
     @property
     def probeID(self):
         return self._probeID
@@ -110,12 +335,7 @@ class Relevance_CVXProblem(ABC):
     @property
     def is_solved(self):
         if self._solver_status in self.accepted_status:
-            try:
-                val = self.objective.value
-            except ValueError:
-                return False
-
-            return True
+            return self._solved_relevance is not None
         else:
             return False
 
@@ -123,32 +343,445 @@ class Relevance_CVXProblem(ABC):
     def accepted_status(self):
         return ["optimal", "optimal_inaccurate"]
 
+    def init_objective(self, **kwargs):
+        """
+        Remember the objective of this problem (and its arguments like `sign`).
+        The objective is set on the compiled problem when solving.
+        """
+        self._objective_kwargs = kwargs
+
+    @property
+    def is_parametric(self):
+        """
+        True if the objective only depends on the parameters of `_init_feature_parameters`
+        and the compiled problem can be reused for all features.
+        """
+        return True
+
+    @property
+    def backend(self):
+        return choose_solver(
+            self.solver,
+            linear_program=self.linear_program,
+            warm_start=self.warm_start,
+            native_lp=self.native_lp,
+        )
+
+    @property
+    def use_native_lp(self):
+        return self.native_lp and self.backend in NATIVE_SOLVERS
+
+    def _linear_constraints(self, parameters, init_model_constraints):
+        """
+        Model constraints of the bound problem in the form `A_w @ w + A_extra @ z <= b`.
+        `z` are the model specific variables (bias, slack...) besides the weights `w`.
+
+        Returns
+        -------
+        A_w : sparse matrix of shape (n_constraints, d)
+        A_extra : sparse matrix of shape (n_constraints, n_extra)
+        b : array of shape (n_constraints)
+        extra_bounds : list of (lower, upper) tuples for `z`
+        """
+        raise NotImplementedError
+
+    def _init_feature_parameters(self):
+        # Signed unit vector which selects the current feature from `w`
+        self.feature_selector = cvx.Parameter(shape=(self.d), name="feature_selector")
+        self.feature_weight = self.feature_selector @ self.w
+
+    def _init_preset_parameters(self):
+        # Mask of preset features and their (signed) ranges, unused features are masked with 0
+        self.preset_mask = cvx.Parameter(
+            shape=(self.d), nonneg=True, name="preset_mask"
+        )
+        self.preset_lower = cvx.Parameter(shape=(self.d), name="preset_lower")
+        self.preset_upper = cvx.Parameter(shape=(self.d), name="preset_upper")
+
+        masked_w = cvx.multiply(self.preset_mask, self.w)
+        self.add_constraint(masked_w >= self.preset_lower)
+        self.add_constraint(masked_w <= self.preset_upper)
+
+    def _build_template(self):
+        """
+        Build constraints and objective of the cvxpy problem once.
+        Feature index, sign and presets are cvxpy parameters which are set before each solve.
+        """
+        template = copy.copy(self)
+        if self.use_native_lp:
+            template._init_linear_program()
+            return template
+
+        template._constraints = []
+        template._init_constraints(
+            self.init_hyperparameters, self.init_model_constraints
+        )
+        template._init_feature_parameters()
+        if self.preset_model is not None:
+            template._init_preset_parameters()
+
+        if self.isLowerBound:
+            template.init_objective_LB(**self._objective_kwargs)
+        else:
+            template.init_objective_UB(**self._objective_kwargs)
+
+        template._cvx_problem = cvx.Problem(
+            objective=template.objective, constraints=template.constraints
+        )
+        if self.warm_start:
+            template._init_warm_start_values()
+        return template
+
+    def _init_linear_program(self):
+        """
+        Assemble the model constraints as sparse LP for `scipy.optimize.linprog`.
+        The weights are split into `w = w_pos - w_neg` to express the L1 norm constraint linearly.
+        Variables are ordered as `[w_pos, w_neg, extra variables, feature relevance]`.
+        """
+        A_w, A_extra, b, extra_bounds = self._linear_constraints(
+            self.init_hyperparameters, self.init_model_constraints
+        )
+        A_w = sparse.csr_matrix(A_w)
+        A_extra = sparse.csr_matrix(A_extra)
+        n_extra = A_extra.shape[1]
+
+        l1_norm = sparse.hstack(
+            [np.ones((1, 2 * self.d)), sparse.csr_matrix((1, n_extra + 1))]
+        )
+        model = sparse.hstack(
+            [A_w, -A_w, A_extra, sparse.csr_matrix((A_w.shape[0], 1))]
+        )
+        self._lp_A = sparse.vstack([model, l1_norm]).tocsr()
+        self._lp_b = np.append(b, self.init_model_constraints["w_l1"])
+        self._lp_bounds = [(0, None)] * (2 * self.d) + extra_bounds + [(0, None)]
+
+    def _linear_objective_rows(self, n_vars):
+        """
+        Objective and constraints which depend on current feature, sign and presets.
+        """
+        relevance = n_vars - 1
+        c = np.zeros(n_vars)
+        rows = []
+        rhs = []
+
+        def weight_row(feature, factor):
+            row = np.zeros(n_vars)
+            row[feature] = factor
+            row[self.d + feature] = -factor
+            return row
+
+        if 0 <= self.current_feature < self.d:
+            if self.isLowerBound:
+                # |w_i| <= relevance
+                for factor in [-1, 1]:
+                    row = weight_row(self.current_feature, factor)
+                    row[relevance] = -1
+                    rows.append(row)
+                    rhs.append(0)
+            else:
+                # relevance <= sign * w_i
+                sign = self._objective_kwargs.get("sign", 1)
+                row = weight_row(self.current_feature, -sign)
+                row[relevance] = 1
+                rows.append(row)
+                rhs.append(0)
+        c[relevance] = 1 if self.isLowerBound else -1
+
+        if self.preset_model is not None:
+            mask, lower, upper = self._preset_parameter_values(
+                self.preset_model, self.init_model_constraints
+            )
+            for feature in np.flatnonzero(mask):
+                rows.append(weight_row(feature, 1))
+                rhs.append(upper[feature])
+                rows.append(weight_row(feature, -1))
+                rhs.append(-lower[feature])
+
+        return c, np.array(rows).reshape(-1, n_vars), np.array(rhs)
+
+    def _solve_linear_program(self, template):
+        n_vars = template._lp_A.shape[1]
+        c, rows, rhs = self._linear_objective_rows(n_vars)
+        A_ub = sparse.vstack([template._lp_A, sparse.csr_matrix(rows)]).tocsr()
+        b_ub = np.concatenate([template._lp_b, rhs])
+        self._zero_weights = None
+        try:
+            if self.column_generation:
+                result = self._solve_column_generation(c, A_ub, b_ub, template)
+            else:
+                result = linprog(
+                    c,
+                    A_ub=A_ub,
+                    b_ub=b_ub,
+                    bounds=template._lp_bounds,
+                    **linprog_kwargs(self.backend),
+                )
+        except ValueError:
+            self._solver_status = cvx.SOLVER_ERROR
+            self._solved_relevance = None
+            return
+
+        self._solver_status = self._LINPROG_STATUS.get(result.status, cvx.SOLVER_ERROR)
+        if self._solver_status == cvx.OPTIMAL:
+            self._solved_relevance = result.x[-1]
+            if self.constraint_generation:
+                self._lp_solution = result.x
+            self._store_zero_weights(result.x[: self.d] - result.x[self.d : 2 * self.d])
+        else:
+            self._solved_relevance = None
+
+    def _solve_column_generation(self, c, A_ub, b_ub, template):
+        """
+        Solve the linear program with the weights of a working set of features, all other weights are fixed to 0.
+        The working set starts with the support of the baseline model, the current and preset features.
+        After each solve the reduced costs of all other weights are priced with one product of the constraint
+        matrix and the duals. Features whose weights improve the objective are added until none remain,
+        the solution is then optimal for all features.
+        """
+        d = self.d
+        n_vars = len(c)
+        working = _WORKING_FEATURES.get(self.template_key)
+        if working is None or len(working) != d:
+            working = self._initial_working_features()
+        working = working.copy()
+        if 0 <= self.current_feature < d:
+            working[self.current_feature] = True
+        if self.preset_model is not None:
+            working[[f for f in self.preset_model if 0 <= f < d]] = True
+
+        kwargs = linprog_kwargs(self.backend)
+        A_ub = A_ub.tocsc()
+        # Row of the L1 norm constraint (the last model constraint, see `_init_linear_program`)
+        l1_row = template._lp_A.shape[0] - 1
+        extra = np.arange(2 * d, n_vars)
+        while True:
+            features = np.flatnonzero(working)
+            columns = np.concatenate([features, d + features, extra])
+            result = linprog(
+                c[columns],
+                A_ub=A_ub[:, columns],
+                b_ub=b_ub,
+                bounds=[template._lp_bounds[i] for i in columns],
+                **kwargs,
+            )
+            duals = getattr(getattr(result, "ineqlin", None), "marginals", None)
+            if result.status != 0 or duals is None:
+                # The restricted problem is not conclusive (or scipy provides no duals)
+                return linprog(
+                    c, A_ub=A_ub, b_ub=b_ub, bounds=template._lp_bounds, **kwargs
+                )
+            # Reduced costs of w_pos and w_neg of a feature outside of the working set are
+            # -(A_w^T duals) - l1_dual and (A_w^T duals) - l1_dual
+            prices = A_ub[:, :d].T @ duals - duals[l1_row]
+            improving = -np.abs(prices) - duals[l1_row] < -COLUMN_GENERATION_TOLERANCE
+            improving &= ~working
+            if not improving.any():
+                break
+            working |= improving
+
+        _remember(_WORKING_FEATURES, self.template_key, working)
+        x = np.zeros(n_vars)
+        x[columns] = result.x
+        result.x = x
+        return result
+
+    def _initial_working_features(self):
+        working = np.zeros(self.d, dtype=bool)
+        state = self.best_model_state
+        if state is not None and state.get("w") is not None:
+            w = np.abs(np.asarray(state["w"]).ravel()[: self.d])
+            working[: len(w)] = w > ZERO_WEIGHT_TOLERANCE * np.sum(w)
+        return working
+
+    def _init_warm_start_values(self):
+        """
+        The baseline model is a feasible point of every (relaxed) bound problem.
+        We use its state as initial values for all variables with a matching name.
+        """
+        if self.best_model_state is None:
+            return
+        for name, value in self.best_model_state.items():
+            variable = getattr(self, name, None)
+            if not isinstance(variable, cvx.Variable):
+                continue
+            try:
+                variable.value = value
+            except ValueError:
+                # Shape or sign (e.g. slightly negative slack) does not match
+                pass
+
+    def _get_template(self):
+        if self.template_key is None or not self.is_parametric:
+            return self._build_template()
+
+        key = (
+            self.template_key,
+            self.__class__,
+            self.isLowerBound,
+            self.preset_model is not None,
+            self.use_native_lp,
+            self._active_key,
+        )
+        if key in _TEMPLATE_CACHE:
+            _TEMPLATE_CACHE.move_to_end(key)
+            return _TEMPLATE_CACHE[key]
+
+        template = self._build_template()
+        _TEMPLATE_CACHE[key] = template
+        if len(_TEMPLATE_CACHE) > _TEMPLATE_CACHE_SIZE:
+            _TEMPLATE_CACHE.popitem(last=False)
+        return template
+
+    def _set_parameters(self, template):
+        selector = np.zeros(self.d)
+        if 0 <= self.current_feature < self.d:
+            selector[self.current_feature] = self._objective_kwargs.get("sign", 1)
+        template.feature_selector.value = selector
+
+        if self.preset_model is not None:
+            mask, lower, upper = self._preset_parameter_values(
+                self.preset_model, self.init_model_constraints
+            )
+            template.preset_mask.value = mask
+            template.preset_lower.value = lower
+            template.preset_upper.value = upper
+
     def solve(self) -> object:
         # We init cvx problem here because pickling LP solver objects is problematic
-        # by deferring it to here, worker threads do the problem building themselves and we spare the serialization
-        self._cvx_problem = cvx.Problem(
-            objective=self.objective, constraints=self.constraints
+        # by deferring it to here, worker threads do the problem building themselves and we spare the serialization.
+        # The problem is compiled once per worker and data and only the parameters change between features.
+        if self.probe_seed is not None:
+            self._permute_probe_feature()
+        if self.constraint_generation and self.supports_constraint_generation:
+            self._solve_constraint_generation()
+        else:
+            self._solve_problem()
+        return self
+
+    def _solve_problem(self):
+        template = self._get_template()
+        if self.use_native_lp:
+            self._solve_linear_program(template)
+            return template
+        self._set_parameters(template)
+
+        kwargs = self.solver_kwargs
+        self._solve_template(template, kwargs)
+        if not self.is_solved and kwargs != self.default_solver_kwargs:
+            # Other solvers (esp. warm started ones) are less robust, we fall back to the default solver
+            self._solve_template(template, self.default_solver_kwargs)
+        return template
+
+    def _solve_constraint_generation(self):
+        """
+        Solve the problem on an active subset of samples, starting with the (nearly) active samples of the baseline model.
+        Samples whose constraint is violated by the solution are added until the solution is feasible for all samples.
+        The solution is then optimal for the full problem, because the reduced problem is a relaxation of it.
+        """
+        X, y = self.X, self.y
+        sample_weight = self.sample_weight
+        active = _ACTIVE_SAMPLES.get(self.template_key)
+        if active is None or len(active) != len(y):
+            active = self._initial_active_samples(X, y)
+
+        try:
+            while True:
+                self.preprocessing_data((X[active], y[active]), self.best_model_state)
+                if sample_weight is not None:
+                    self.sample_weight = np.asarray(sample_weight)[active]
+                self._active_key = hash(np.packbits(active).tobytes())
+                template = self._solve_problem()
+                if not self.is_solved:
+                    break
+                w, b = self._model_solution(template)
+                slack = self._constraint_slack(X, y, w, b)
+                violated = (slack < -CONSTRAINT_GENERATION_TOLERANCE) & ~active
+                if not violated.any():
+                    break
+                active = active | violated
+        finally:
+            self.preprocessing_data((X, y), self.best_model_state)
+            self.sample_weight = sample_weight
+            self._lp_solution = None
+            self._active_key = None
+
+        _remember(_ACTIVE_SAMPLES, self.template_key, active)
+
+    def _initial_active_samples(self, X, y):
+        state = self.best_model_state
+        if state is None or state.get("w") is None or state.get("b") is None:
+            return np.ones(len(y), dtype=bool)
+        slack = self._constraint_slack(X, y, state["w"], state["b"])
+        active = slack <= CONSTRAINT_GENERATION_MARGIN
+        if not active.any():
+            active[np.argmin(slack)] = True
+        return active
+
+    def _model_solution(self, template):
+        """
+        Weights and bias of the last solution.
+        """
+        if self.use_native_lp:
+            x = self._lp_solution
+            # Variables are [w_pos, w_neg, b, ...]
+            return x[: self.d] - x[self.d : 2 * self.d], x[2 * self.d]
+        return template.w.value, template.b.value
+
+    def _constraint_slack(self, X, y, w, b):
+        """
+        Amount by which the constraint of every sample is satisfied without slack variable (negative if violated).
+        """
+        raise NotImplementedError
+
+    def _permute_probe_feature(self):
+        """
+        Replace the data of this probe with data in which the current feature is permuted.
+        The permutation is written into a buffer which is shared by all probes of the worker.
+        """
+        data = permutate_feature_in_buffer(
+            self._data, self.current_feature, self.probe_seed
         )
+        self.preprocessing_data(data, self.best_model_state)
+
+    def _solve_template(self, template, solver_kwargs):
+        # Weights of earlier (relaxed or failed) solves certify nothing for this one
+        self._zero_weights = None
         try:
             # print("Solve", self)
-            self._cvx_problem.solve(**self.solver_kwargs)
+            template.cvx_problem.solve(**solver_kwargs)
         except SolverError:
             # We ignore Solver Errors, which are common with our framework:
             # We solve multiple problems per bound and choose a feasible solution later (see '_create_interval')
-            pass
+            # The compiled problem still holds the status of its last solve, which we do not want to report
+            self._solver_status = cvx.SOLVER_ERROR
+            self._solved_relevance = None
+            return
 
-        self._solver_status = self._cvx_problem.status
-        # self._cvx_problem = None
-        return self
+        self._solver_status = template.cvx_problem.status
+        try:
+            self._solved_relevance = template.objective.value
+        except ValueError:
+            self._solved_relevance = None
+        if self._solver_status == cvx.OPTIMAL:
+            self._store_zero_weights(getattr(template.w, "value", None))
 
     def _retrieve_result(self):
         return self.current_feature, self.objective
 
+    @property
+    def default_solver_kwargs(self):
+        return solver_kwargs(DEFAULT_SOLVER)
+
     @property
     def solver_kwargs(self):
-        return {"verbose": False, "solver": "ECOS"}
+        return solver_kwargs(
+            self.solver, linear_program=self.linear_program, warm_start=self.warm_start
+        )
 
-    def _add_preset_constraints(self, preset_model: dict, best_model_constraints):
+    def _preset_parameter_values(self, preset_model: dict, best_model_constraints):
+        mask = np.zeros(self.d)
+        lower = np.zeros(self.d)
+        upper = np.zeros(self.d)
 
         for feature, current_preset in preset_model.items():
             # Skip current feature
@@ -165,12 +798,15 @@ class Relevance_CVXProblem(ABC):
 
             # We add a pair of constraints depending on sign of known coefficient
             # this makes it possible to solve this as a convex problem
+            mask[feature] = 1
             if current_preset[0] >= 0:
-                self.add_constraint(self.w[feature] >= current_preset[0])
-                self.add_constraint(self.w[feature] <= current_preset[1])
+                lower[feature] = current_preset[0]
+                upper[feature] = current_preset[1]
             else:
-                self.add_constraint(self.w[feature] <= current_preset[0])
-                self.add_constraint(self.w[feature] >= current_preset[1])
+                lower[feature] = current_preset[1]
+                upper[feature] = current_preset[0]
+
+        return mask, lower, upper
 
     @classmethod
     def generate_lower_bound_problem(
@@ -182,6 +818,7 @@ class Relevance_CVXProblem(ABC):
         di,
         preset_model,
         probeID=-1,
+        **kwargs,
     ):
         problem = cls(
             di,
@@ -191,8 +828,9 @@ class Relevance_CVXProblem(ABC):
             preset_model=preset_model,
             best_model_state=best_model_state,
             probeID=probeID,
+            **kwargs,
         )
-        problem.init_objective_LB()
+        problem.init_objective()
         problem.isLowerBound = True
         yield problem
 
@@ -206,6 +844,7 @@ class Relevance_CVXProblem(ABC):
         di,
         preset_model,
         probeID=-1,
+        **kwargs,
     ):
         for sign in [-1, 1]:
             problem = cls(
@@ -216,11 +855,115 @@ class Relevance_CVXProblem(ABC):
                 preset_model=preset_model,
                 best_model_state=best_model_state,
                 probeID=probeID,
+                **kwargs,
             )
-            problem.init_objective_UB(sign=sign)
+            problem.init_objective(sign=sign)
             problem.isLowerBound = False
             yield problem
 
+    @classmethod
+    def screen_samples(
+        cls,
+        data,
+        parameters,
+        init_model_constraints,
+        weight_bounds,
+        solver=None,
+        sample_weight=None,
+    ):
+        """
+        Safe sample screening for the bound problems.
+        Samples whose constraint holds without slack for every feasible model can be removed from the problems
+        without changing their solutions.
+
+        Parameters
+        ----------
+        data : tuple
+            Tuple of data (X,y)
+        parameters : dict
+            Hyperparameters of the baseline model
+        init_model_constraints : dict
+            Relaxed constraints of the baseline model
+        weight_bounds : array of shape (d)
+            Upper bounds of `|w|` over all feasible models (e.g. the solved upper relevance bounds)
+        solver : str or None
+            Solver backend (see `fri.solver`)
+        sample_weight : array of shape (n) or None
+            Weights of the samples in the loss
+
+        Returns
+        -------
+        array of bool or None
+            Mask of the samples which have to be kept, `None` if the problem does not support screening.
+        """
+        return None
+
+    @classmethod
+    def relevance_upper_bounds(
+        cls,
+        data,
+        parameters,
+        init_model_constraints,
+        best_model_state,
+        sample_weight=None,
+    ):
+        """
+        Provable upper bounds of the upper relevance bounds of all features without solving their problems.
+        Any feasible point of the dual problem bounds the maximum of `|w_j|` (weak duality),
+        problem types derive such points from the dual values of the baseline model.
+
+        Parameters
+        ----------
+        data : tuple
+            Tuple of data (X,y)
+        parameters : dict
+            Hyperparameters of the baseline model
+        init_model_constraints : dict
+            Relaxed constraints of the baseline model
+        best_model_state : dict
+            Solution of the baseline model
+        sample_weight : array of shape (n) or None
+            Weights of the samples in the loss
+
+        Returns
+        -------
+        array of shape (d) or None
+            Upper bounds of `|w_j|`, `None` if the problem does not support dual bounds.
+        """
+        return None
+
+    @classmethod
+    def _bias_range(
+        cls,
+        data,
+        parameters,
+        init_model_constraints,
+        weight_bounds,
+        solver=None,
+        sample_weight=None,
+    ):
+        """
+        Smallest and largest bias `b` of all feasible models, `None` if it could not be determined.
+        """
+        problem = cls(
+            -1, data, parameters, init_model_constraints, sample_weight=sample_weight
+        )
+        problem._init_constraints(parameters, init_model_constraints)
+        problem.add_constraint(cvx.abs(problem.w) <= weight_bounds)
+        kwargs = solver_kwargs(solver, linear_program=cls.linear_program)
+
+        bias_range = []
+        for objective in [cvx.Minimize(problem.b), cvx.Maximize(problem.b)]:
+            lp = cvx.Problem(objective, problem.constraints)
+            try:
+                lp.solve(**kwargs)
+            except SolverError:
+                return None
+            if lp.status != cvx.OPTIMAL:
+                return None
+            bias_range.append(float(problem.b.value))
+        return bias_range
+
     @classmethod
     def aggregate_min_candidates(cls, min_problems_candidates):
         vals = [candidate.solved_relevance for candidate in min_problems_candidates]
@@ -1,9 +1,40 @@
 from abc import ABC, abstractmethod
 
+import cvxpy as cvx
+import numpy as np
 from sklearn.base import BaseEstimator
 
+from fri.solver import solver_kwargs
+
+
+def match_precision(w, X):
+    """
+    Weights `w` in single precision if `X` is, so `X` is not upcast in dot products.
+    """
+    if getattr(X, "dtype", None) == np.float32:
+        return np.asarray(w, dtype=np.float32)
+    return w
+
+
+def weighted_sum(values, sample_weight=None, indices=None):
+    """
+    Sum of the per sample `values` (a cvxpy expression or array), weighted by `sample_weight` if given.
+    `indices` selects the weights of the samples in `values` if it only covers a subset of the samples.
+    """
+    if sample_weight is None:
+        if isinstance(values, cvx.Expression):
+            return cvx.sum(values)
+        return np.sum(values)
+    sample_weight = np.asarray(sample_weight, dtype=float)
+    if indices is not None:
+        sample_weight = sample_weight[indices]
+    return sample_weight @ values
+
 
 class InitModel(ABC, BaseEstimator):
+    # Models which are linear programs can be solved by a dedicated LP solver
+    linear_program = False
+
     def __init__(self, **parameters):
         if parameters is None:
             parameters = {}
@@ -38,6 +69,15 @@ class InitModel(ABC, BaseEstimator):
     def score(self, X, y, **kwargs):
         pass
 
+    def margins(self, X, y):
+        """
+        Amount by which every sample satisfies its constraint without slack (negative for samples with loss).
+        Used to estimate the sensitivity of samples in coresets (see `fri.coreset`).
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not provide margins of samples."
+        )
+
     @classmethod
     def make_scorer(self):
         return None, None
@@ -68,8 +108,11 @@ class InitModel(ABC, BaseEstimator):
             )
 
     @property
-    def solver_params(cls):
-        return {"solver": "ECOS"}
+    def solver_params(self):
+        # The solver backend is passed like a hyperparameter to survive cloning in the parameter search
+        return solver_kwargs(
+            self.hyperparam.get("solver"), linear_program=self.linear_program
+        )
 
 
 class LUPI_InitModel(InitModel):
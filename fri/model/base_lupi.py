@@ -4,6 +4,14 @@ from .base_cvxproblem import Relevance_CVXProblem
 
 
 class LUPI_Relevance_CVXProblem(Relevance_CVXProblem):
+    # LUPI problems have additional privileged variables and are always solved with cvxpy
+    native_lp = False
+    absorbs_constant_features = False
+    # Lower bounds of privileged features are aggregated from several candidates
+    zero_weight_certificates = False
+    # Active sample subsets would ignore the privileged slack of the dropped samples
+    supports_constraint_generation = False
+
     def __init__(
         self,
         current_feature: int,
@@ -13,6 +21,7 @@ class LUPI_Relevance_CVXProblem(Relevance_CVXProblem):
         preset_model=None,
         best_model_state=None,
         probeID=-1,
+        **kwargs,
     ) -> None:
         super().__init__(
             current_feature,
@@ -22,6 +31,7 @@ class LUPI_Relevance_CVXProblem(Relevance_CVXProblem):
             preset_model,
             best_model_state,
             probeID,
+            **kwargs,
         )
 
     def preprocessing_data(self, data, best_model_state):
@@ -40,6 +50,15 @@ class LUPI_Relevance_CVXProblem(Relevance_CVXProblem):
         else:
             self.isPriv = False
 
+    def release_data(self):
+        super().release_data()
+        self.X_priv = None
+
+    @property
+    def is_parametric(self):
+        # Objectives of privileged features index `w_priv` directly and are built per feature
+        return not self.isPriv
+
     def init_objective_UB(self, **kwargs):
         # We have two models basically with different indexes
         if self.isPriv:
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
 import scipy.stats
 
 
@@ -80,7 +81,7 @@ class ProblemType(ABC):
         pass
 
     @abstractmethod
-    def preprocessing(self, data, lupi_features=None):
+    def preprocessing(self, data, lupi_features=None, dtype=np.float64):
         return data
 
     def postprocessing(self, bounds):
@@ -1,13 +1,20 @@
 import cvxpy as cvx
 import numpy as np
+from scipy import sparse
 from sklearn import preprocessing
 from sklearn.metrics import fbeta_score, classification_report
 from sklearn.preprocessing import LabelEncoder
 from sklearn.utils import check_X_y
+from sklearn.utils.extmath import safe_sparse_dot
 from sklearn.utils.multiclass import unique_labels
 
-from fri.model.base_cvxproblem import Relevance_CVXProblem
-from fri.model.base_initmodel import InitModel
+from fri.model.base_cvxproblem import (
+    DUAL_BOUND_TOLERANCE,
+    SAMPLE_SCREENING_TOLERANCE,
+    Relevance_CVXProblem,
+    max_dot_products,
+)
+from fri.model.base_initmodel import InitModel, match_precision, weighted_sum
 from .base_type import ProblemType
 
 
@@ -27,10 +34,10 @@ class Classification(ProblemType):
     def relax_factors(cls):
         return ["loss_slack", "w_l1_slack"]
 
-    def preprocessing(self, data, **kwargs):
+    def preprocessing(self, data, dtype=np.float64, **kwargs):
         X, y = data
         # Check that X and y have correct shape
-        X, y = check_X_y(X, y)
+        X, y = check_X_y(X, y, accept_sparse=["csr", "csc"], dtype=dtype)
 
         # Store the classes seen during fit
         classes_ = unique_labels(y)
@@ -46,11 +53,13 @@ class Classification(ProblemType):
 
 
 class Classification_SVM(InitModel):
+    linear_program = True
+
     @classmethod
     def hyperparameter(cls):
         return ["C"]
 
-    def fit(self, X, y, **kwargs):
+    def fit(self, X, y, sample_weight=None, **kwargs):
         (n, d) = X.shape
 
         C = self.hyperparam["C"]
@@ -59,7 +68,9 @@ class Classification_SVM(InitModel):
         slack = cvx.Variable(shape=(n), name="slack")
         b = cvx.Variable(name="bias")
 
-        objective = cvx.Minimize(cvx.norm(w, 1) + C * cvx.sum(slack))
+        objective = cvx.Minimize(
+            cvx.norm(w, 1) + C * weighted_sum(slack, sample_weight)
+        )
         constraints = [cvx.multiply(y.T, X * w + b) >= 1 - slack, slack >= 0]
 
         # Solve problem.
@@ -70,9 +81,11 @@ class Classification_SVM(InitModel):
         w = w.value
         b = b.value
         slack = np.asarray(slack.value).flatten()
-        self.model_state = {"w": w, "b": b, "slack": slack}
+        # Dual values of the margin constraints certify upper relevance bounds (see `relevance_upper_bounds`)
+        dual = np.asarray(constraints[0].dual_value).flatten()
+        self.model_state = {"w": w, "b": b, "slack": slack, "dual": dual}
 
-        loss = np.sum(slack)
+        loss = weighted_sum(slack, sample_weight)
         w_l1 = np.linalg.norm(w, ord=1)
         self.constraints = {"loss": loss, "w_l1": w_l1}
         return self
@@ -80,11 +93,17 @@ class Classification_SVM(InitModel):
     def predict(self, X):
         w = self.model_state["w"]
         b = self.model_state["b"]
-        y = np.dot(X, w) + b >= 0
+        y = safe_sparse_dot(X, match_precision(w, X)) + b >= 0
         y = y.astype(int)
         y[y == 0] = -1
         return y
 
+    def margins(self, X, y):
+        # y * (X * w + b) >= 1
+        w = self.model_state["w"]
+        b = self.model_state["b"]
+        return y * (safe_sparse_dot(X, match_precision(w, X)) + b) - 1
+
     def score(self, X, y, **kwargs):
         prediction = self.predict(X)
 
@@ -100,16 +119,17 @@ class Classification_SVM(InitModel):
 
 
 class Classification_Relevance_Bound(Relevance_CVXProblem):
+    linear_program = True
+    native_lp = True
+    absorbs_constant_features = True
+    supports_constraint_generation = True
+
     def init_objective_UB(self, sign=None, **kwargs):
-        self.add_constraint(
-            self.feature_relevance <= sign * self.w[self.current_feature]
-        )
+        self.add_constraint(self.feature_relevance <= self.feature_weight)
         self._objective = cvx.Maximize(self.feature_relevance)
 
     def init_objective_LB(self, **kwargs):
-        self.add_constraint(
-            cvx.abs(self.w[self.current_feature]) <= self.feature_relevance
-        )
+        self.add_constraint(cvx.abs(self.feature_weight) <= self.feature_relevance)
         self._objective = cvx.Minimize(self.feature_relevance)
 
     def _init_constraints(self, parameters, init_model_constraints):
@@ -126,7 +146,7 @@ class Classification_Relevance_Bound(Relevance_CVXProblem):
 
         # New Constraints
         distance_from_plane = cvx.multiply(self.y, self.X * self.w + self.b)
-        self.loss = cvx.sum(self.slack)
+        self.loss = weighted_sum(self.slack, self.sample_weight)
         self.weight_norm = cvx.norm(self.w, 1)
 
         self.add_constraint(distance_from_plane >= 1 - self.slack)
@@ -134,3 +154,106 @@ class Classification_Relevance_Bound(Relevance_CVXProblem):
         self.add_constraint(C * self.loss <= C * init_loss)
 
         self.feature_relevance = cvx.Variable(nonneg=True, name="Feature Relevance")
+
+    @classmethod
+    def screen_samples(
+        cls,
+        data,
+        parameters,
+        init_model_constraints,
+        weight_bounds,
+        solver=None,
+        sample_weight=None,
+    ):
+        bias_range = cls._bias_range(
+            data,
+            parameters,
+            init_model_constraints,
+            weight_bounds,
+            solver,
+            sample_weight=sample_weight,
+        )
+        if bias_range is None:
+            return None
+        b_min, b_max = bias_range
+        X, y = data
+
+        # Smallest margin y * (X * w + b) of every sample over all feasible models
+        max_dot = max_dot_products(X, weight_bounds, init_model_constraints["w_l1"])
+        min_margin = np.where(y > 0, b_min, -b_max) - max_dot
+        tolerance = SAMPLE_SCREENING_TOLERANCE * (1 + max_dot + abs(b_min) + abs(b_max))
+        return min_margin < 1 + tolerance
+
+    @classmethod
+    def relevance_upper_bounds(
+        cls,
+        data,
+        parameters,
+        init_model_constraints,
+        best_model_state,
+        sample_weight=None,
+    ):
+        # Dual of max |w_j| with multipliers `t * alpha` of the margin constraints (baseline duals),
+        # `mu` of the loss constraint and `lambda` of the L1 constraint:
+        #   -t * sum(alpha) + mu * loss + lambda * w_l1
+        # with sum(alpha * y) = 0, t * alpha <= mu * sample_weight
+        # and lambda = ||e_j + t * X^T (alpha * y)||_inf
+        alpha = best_model_state.get("dual")
+        if alpha is None:
+            return None
+        X, y = data
+        y = np.asarray(y, dtype=float)
+        alpha = np.maximum(np.asarray(alpha, dtype=float), 0)
+        if sample_weight is None:
+            sample_weight = np.ones(len(y))
+        sample_weight = np.asarray(sample_weight, dtype=float)
+
+        # Equal dual mass on both classes, otherwise the bias makes the dual unbounded
+        positive = np.sum(alpha[y > 0])
+        negative = np.sum(alpha[y < 0])
+        balanced = min(positive, negative)
+        if balanced <= 0:
+            return None
+        alpha = alpha * np.where(y > 0, balanced / positive, balanced / negative)
+
+        l1_w = init_model_constraints["w_l1"]
+        loss = init_model_constraints["loss"]
+        mu = np.max(alpha / sample_weight)  # per unit of t
+        correlation = np.abs(safe_sparse_dot(X.T, alpha * y)).ravel()
+
+        # Largest correlation of all other features
+        order = np.argsort(-correlation)
+        others = np.full(len(correlation), correlation[order[0]])
+        if len(correlation) > 1:
+            others[order[0]] = correlation[order[1]]
+
+        # The dual value is piecewise linear in t, its minimum is at t = 0 or at the kink
+        gap = others - correlation
+        t = np.divide(1, gap, out=np.zeros_like(gap), where=gap > 0)
+        dual_value = t * (mu * loss - np.sum(alpha)) + l1_w * np.maximum(
+            1 + t * correlation, t * others
+        )
+        bounds = np.minimum(dual_value, l1_w)
+        return bounds + DUAL_BOUND_TOLERANCE * (1 + l1_w)
+
+    def _constraint_slack(self, X, y, w, b):
+        # y * (X * w + b) >= 1
+        return y * (safe_sparse_dot(X, w) + b) - 1
+
+    def _linear_constraints(self, parameters, init_model_constraints):
+        # Variables besides w: [b, slack]
+        X = sparse.csr_matrix(self.X)
+        y = self.y.astype(float)
+        n = self.n
+
+        # y * (X * w + b) >= 1 - slack
+        A_w = sparse.vstack([-sparse.diags(y) @ X, sparse.csr_matrix((1, self.d))])
+        A_extra = sparse.bmat(
+            [
+                [sparse.csr_matrix(-y).T, -sparse.eye(n)],
+                [None, self.sample_weights[np.newaxis]],
+            ]
+        )
+        b = np.append(-np.ones(n), init_model_constraints["loss"])
+        extra_bounds = [(None, None)] + [(0, None)] * n
+        return A_w, A_extra, b, extra_bounds
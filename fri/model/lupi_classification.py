@@ -4,9 +4,10 @@ from sklearn import preprocessing
 from sklearn.metrics import fbeta_score, classification_report
 from sklearn.preprocessing import LabelEncoder
 from sklearn.utils import check_X_y
+from sklearn.utils.extmath import safe_sparse_dot
 from sklearn.utils.multiclass import unique_labels
 
-from .base_initmodel import InitModel
+from .base_initmodel import InitModel, match_precision, weighted_sum
 from .base_lupi import LUPI_Relevance_CVXProblem, split_dataset
 from .base_type import ProblemType
 from .classification import Classification_Relevance_Bound
@@ -36,7 +37,7 @@ class LUPI_Classification(ProblemType):
     def relax_factors(cls):
         return ["loss_slack", "w_l1_slack"]
 
-    def preprocessing(self, data, lupi_features=None):
+    def preprocessing(self, data, lupi_features=None, dtype=np.float64):
         X, y = data
         d = X.shape[1]
 
@@ -52,7 +53,7 @@ class LUPI_Classification(ProblemType):
         self._lupi_features = lupi_features
 
         # Check that X and y have correct shape
-        X, y = check_X_y(X, y)
+        X, y = check_X_y(X, y, accept_sparse=["csr", "csc"], dtype=dtype)
 
         # Store the classes seen during fit
         classes_ = unique_labels(y)
@@ -72,7 +73,7 @@ class LUPI_Classification_SVM(InitModel):
     def hyperparameter(cls):
         return ["C", "scaling_lupi_w", "scaling_lupi_loss"]
 
-    def fit(self, X_combined, y, lupi_features=None):
+    def fit(self, X_combined, y, lupi_features=None, sample_weight=None):
         """
 
         Parameters
@@ -80,6 +81,8 @@ class LUPI_Classification_SVM(InitModel):
         lupi_features : int
             Number of features in dataset which are considered privileged information (PI).
             PI features are expected to be the last features in the dataset.
+        sample_weight : array of shape (n) or None
+            Weights of the samples in the loss.
 
         """
         if lupi_features is None:
@@ -105,7 +108,9 @@ class LUPI_Classification_SVM(InitModel):
         slack = cvx.Variable(shape=(n))
 
         # Combined loss of lupi function and normal slacks, scaled by two constants
-        loss = scaling_lupi_loss * cvx.sum(priv_function) + cvx.sum(slack)
+        loss = scaling_lupi_loss * weighted_sum(
+            priv_function, sample_weight
+        ) + weighted_sum(slack, sample_weight)
 
         # L1 norm regularization of both functions with 1 scaling constant
         w_l1 = cvx.norm(w, 1)
@@ -148,7 +153,7 @@ class LUPI_Classification_SVM(InitModel):
         b = self.model_state["b"]
 
         # Simple hyperplane classification rule
-        f = np.dot(X, w) + b
+        f = safe_sparse_dot(X, match_precision(w, X)) + b
         y = f >= 0
         y = y.astype(int)
 
@@ -202,7 +207,9 @@ class LUPI_Classification_Relevance_Bound(
         # New Constraints
         function = cvx.multiply(self.y.T, self.X * w + b)
         priv_function = self.X_priv * w_priv + b_priv
-        loss = cvx.sum(priv_function) + cvx.sum(slack)
+        loss = weighted_sum(priv_function, self.sample_weight) + weighted_sum(
+            slack, self.sample_weight
+        )
 
         weight_norm = cvx.norm(w, 1)
         weight_norm_priv = cvx.norm(w_priv, 1)
@@ -4,6 +4,7 @@ import cvxpy as cvx
 import numpy as np
 from sklearn.metrics import make_scorer
 from sklearn.utils import check_X_y
+from sklearn.utils.extmath import safe_sparse_dot
 
 from fri.model.base_lupi import (
     LUPI_Relevance_CVXProblem,
@@ -14,7 +15,7 @@ from fri.model.ordinal_regression import (
     OrdinalRegression_Relevance_Bound,
     ordinal_scores,
 )
-from .base_initmodel import LUPI_InitModel
+from .base_initmodel import LUPI_InitModel, match_precision, weighted_sum
 from .base_type import ProblemType
 
 
@@ -42,7 +43,7 @@ class LUPI_OrdinalRegression(ProblemType):
     def relax_factors(cls):
         return ["loss_slack", "w_l1_slack"]
 
-    def preprocessing(self, data, lupi_features=None):
+    def preprocessing(self, data, lupi_features=None, dtype=np.float64):
         X, y = data
         d = X.shape[1]
 
@@ -58,7 +59,7 @@ class LUPI_OrdinalRegression(ProblemType):
         self._lupi_features = lupi_features
 
         # Check that X and y have correct shape
-        X, y = check_X_y(X, y)
+        X, y = check_X_y(X, y, accept_sparse=["csr", "csc"], dtype=dtype)
         if np.min(y) > 0:
             print("First ordinal class has index > 0. Shifting index...")
             y = y - np.min(y)
@@ -71,7 +72,7 @@ class LUPI_OrdinalRegression_SVM(LUPI_InitModel):
     def hyperparameter(cls):
         return ["C", "scaling_lupi_w", "scaling_lupi_loss"]
 
-    def fit(self, X_combined, y, lupi_features=None):
+    def fit(self, X_combined, y, lupi_features=None, sample_weight=None):
         """
 
         Parameters
@@ -79,6 +80,8 @@ class LUPI_OrdinalRegression_SVM(LUPI_InitModel):
         lupi_features : int
             Number of features in dataset which are considered privileged information (PI).
             PI features are expected to be the last features in the dataset.
+        sample_weight : array of shape (n) or None
+            Weights of the samples in the loss.
 
         """
         if lupi_features is None:
@@ -127,7 +130,7 @@ class LUPI_OrdinalRegression_SVM(LUPI_InitModel):
                 <= -1 + priv_function(left_bin, 0)
             )
             constraints.append(priv_function(left_bin, 0) >= 0)
-            loss += cvx.sum(priv_function(left_bin, 0))
+            loss += weighted_sum(priv_function(left_bin, 0), sample_weight, indices)
 
         # Add constraints for slack into right neighboring bins
         for right_bin in range(1, n_bins):
@@ -137,14 +140,16 @@ class LUPI_OrdinalRegression_SVM(LUPI_InitModel):
                 >= +1 - priv_function(right_bin, 1)
             )
             constraints.append(priv_function(right_bin, 1) >= 0)
-            loss += cvx.sum(priv_function(right_bin, 1))
+            loss += weighted_sum(priv_function(right_bin, 1), sample_weight, indices)
 
         for i_boundary in range(0, n_boundaries - 1):
             constraints.append(b_s[i_boundary] <= b_s[i_boundary + 1])
 
         constraints.append(slack_left >= 0)
         constraints.append(slack_right >= 0)
-        loss = scaling_lupi_loss * loss + cvx.sum(slack_left + slack_right)
+        loss = scaling_lupi_loss * loss + weighted_sum(
+            slack_left + slack_right, sample_weight
+        )
 
         objective = cvx.Minimize(C * loss + weight_regularization)
 
@@ -179,7 +184,7 @@ class LUPI_OrdinalRegression_SVM(LUPI_InitModel):
         w = self.model_state["w"]
         b_s = self.model_state["b_s"]
 
-        scores = np.dot(X, w.T)[np.newaxis]
+        scores = safe_sparse_dot(X, match_precision(w, X).T)[np.newaxis]
         bin_thresholds = np.append(b_s, np.inf)
 
         # If thresholds are smaller than score the value belongs to the bigger bin
@@ -189,7 +194,7 @@ class LUPI_OrdinalRegression_SVM(LUPI_InitModel):
 
     def score(self, X, y, error_type="mmae", return_error=False, **kwargs):
 
-        X, y = check_X_y(X, y)
+        X, y = check_X_y(X, y, accept_sparse=["csr", "csc"])
 
         prediction = self.predict(X)
         score = ordinal_scores(y, prediction, error_type, return_error=return_error)
@@ -238,6 +243,7 @@ class LUPI_OrdinalRegression_Relevance_Bound(
         di,
         preset_model,
         probeID=-1,
+        **kwargs,
     ):
         is_priv = is_lupi_feature(
             di, data, best_model_state
@@ -252,6 +258,7 @@ class LUPI_OrdinalRegression_Relevance_Bound(
                 di,
                 preset_model,
                 probeID=probeID,
+                **kwargs,
             )
         else:
             for sign in [1, -1]:
@@ -263,8 +270,9 @@ class LUPI_OrdinalRegression_Relevance_Bound(
                     preset_model=preset_model,
                     best_model_state=best_model_state,
                     probeID=probeID,
+                    **kwargs,
                 )
-                problem.init_objective_LB(sign=sign)
+                problem.init_objective(sign=sign)
                 problem.isLowerBound = True
                 yield problem
 
@@ -278,6 +286,7 @@ class LUPI_OrdinalRegression_Relevance_Bound(
         di,
         preset_model,
         probeID=-1,
+        **kwargs,
     ):
         is_priv = is_lupi_feature(
             di, data, best_model_state
@@ -292,6 +301,7 @@ class LUPI_OrdinalRegression_Relevance_Bound(
                 di,
                 preset_model,
                 probeID=probeID,
+                **kwargs,
             )
         else:
             for sign, pos in product([1, -1], [0, 1]):
@@ -303,8 +313,9 @@ class LUPI_OrdinalRegression_Relevance_Bound(
                     preset_model=preset_model,
                     best_model_state=best_model_state,
                     probeID=probeID,
+                    **kwargs,
                 )
-                problem.init_objective_UB(sign=sign, pos=pos)
+                problem.init_objective(sign=sign, pos=pos)
                 yield problem
 
     @classmethod
@@ -370,7 +381,9 @@ class LUPI_OrdinalRegression_Relevance_Bound(
                 <= -1 + priv_function(left_bin, 0) + slack_left[indices]
             )
             self.add_constraint(priv_function(left_bin, 0) >= 0)
-            loss += cvx.sum(priv_function(left_bin, 0))
+            loss += weighted_sum(
+                priv_function(left_bin, 0), self.sample_weight, indices
+            )
 
         # Add constraints for slack into right neighboring bins
         for right_bin in range(1, n_bins):
@@ -380,9 +393,11 @@ class LUPI_OrdinalRegression_Relevance_Bound(
                 >= +1 - priv_function(right_bin, 1) - slack_right[indices]
             )
             self.add_constraint(priv_function(right_bin, 1) >= 0)
-            loss += cvx.sum(priv_function(right_bin, 1))
+            loss += weighted_sum(
+                priv_function(right_bin, 1), self.sample_weight, indices
+            )
 
-        loss = loss + cvx.sum(slack_left + slack_right)
+        loss = loss + weighted_sum(slack_left + slack_right, self.sample_weight)
 
         for i_boundary in range(0, n_boundaries - 1):
             self.add_constraint(b_s[i_boundary] <= b_s[i_boundary + 1])
@@ -5,6 +5,7 @@ import numpy as np
 from sklearn.metrics import r2_score
 from sklearn.metrics.regression import _check_reg_targets
 from sklearn.utils import check_X_y
+from sklearn.utils.extmath import safe_sparse_dot
 
 from fri.model.base_lupi import (
     LUPI_Relevance_CVXProblem,
@@ -12,7 +13,7 @@ from fri.model.base_lupi import (
     is_lupi_feature,
 )
 from fri.model.regression import Regression_Relevance_Bound
-from .base_initmodel import LUPI_InitModel
+from .base_initmodel import LUPI_InitModel, match_precision, weighted_sum
 from .base_type import ProblemType
 
 
@@ -40,7 +41,7 @@ class LUPI_Regression(ProblemType):
     def relax_factors(cls):
         return ["loss_slack", "w_l1_slack"]
 
-    def preprocessing(self, data, lupi_features=None):
+    def preprocessing(self, data, lupi_features=None, dtype=np.float64):
         X, y = data
         d = X.shape[1]
 
@@ -56,7 +57,7 @@ class LUPI_Regression(ProblemType):
         self._lupi_features = lupi_features
 
         # Check that X and y have correct shape
-        X, y = check_X_y(X, y)
+        X, y = check_X_y(X, y, accept_sparse=["csr", "csc"], dtype=dtype)
 
         return X, y
 
@@ -66,7 +67,7 @@ class LUPI_Regression_SVM(LUPI_InitModel):
     def hyperparameter(cls):
         return ["C", "epsilon", "scaling_lupi_w", "scaling_lupi_loss"]
 
-    def fit(self, X_combined, y, lupi_features=None):
+    def fit(self, X_combined, y, lupi_features=None, sample_weight=None):
         """
 
         Parameters
@@ -74,6 +75,8 @@ class LUPI_Regression_SVM(LUPI_InitModel):
         lupi_features : int
             Number of features in dataset which are considered privileged information (PI).
             PI features are expected to be the last features in the dataset.
+        sample_weight : array of shape (n) or None
+            Weights of the samples in the loss.
 
         """
         if lupi_features is None:
@@ -102,10 +105,10 @@ class LUPI_Regression_SVM(LUPI_InitModel):
         priv_function_neg = X_priv * w_priv_neg + b_priv_neg
 
         # Combined loss of lupi function and normal slacks, scaled by two constants
-        priv_loss_pos = cvx.sum(priv_function_pos)
-        priv_loss_neg = cvx.sum(priv_function_neg)
+        priv_loss_pos = weighted_sum(priv_function_pos, sample_weight)
+        priv_loss_neg = weighted_sum(priv_function_neg, sample_weight)
         priv_loss = priv_loss_pos + priv_loss_neg
-        slack_loss = cvx.sum(slack)
+        slack_loss = weighted_sum(slack, sample_weight)
         loss = scaling_lupi_loss * priv_loss + slack_loss
 
         # L1 norm regularization of both functions with 1 scaling constant
@@ -161,10 +164,6 @@ class LUPI_Regression_SVM(LUPI_InitModel):
         }
         return self
 
-    @property
-    def solver_params(cls):
-        return {"solver": "ECOS", "verbose": False}
-
     def predict(self, X):
         """
         Method to predict points using svm classification rule.
@@ -179,7 +178,7 @@ class LUPI_Regression_SVM(LUPI_InitModel):
         w = self.model_state["w"]
         b = self.model_state["b"]
 
-        y = np.dot(X, w) + b
+        y = safe_sparse_dot(X, match_precision(w, X)) + b
 
         return y
 
@@ -204,6 +203,7 @@ class LUPI_Regression_Relevance_Bound(
         di,
         preset_model,
         probeID=-1,
+        **kwargs,
     ):
         is_priv = is_lupi_feature(
             di, data, best_model_state
@@ -218,6 +218,7 @@ class LUPI_Regression_Relevance_Bound(
                 di,
                 preset_model,
                 probeID=probeID,
+                **kwargs,
             )
         else:
             for sign, pos in product([1, -1], [True, False]):
@@ -229,8 +230,9 @@ class LUPI_Regression_Relevance_Bound(
                     preset_model=preset_model,
                     best_model_state=best_model_state,
                     probeID=probeID,
+                    **kwargs,
                 )
-                problem.init_objective_UB(sign=sign, pos=pos)
+                problem.init_objective(sign=sign, pos=pos)
                 yield problem
 
     def _init_objective_LB_LUPI(self, **kwargs):
@@ -275,8 +277,10 @@ class LUPI_Regression_Relevance_Bound(
 
         priv_function_pos = self.X_priv * w_priv_pos + b_priv_pos
         priv_function_neg = self.X_priv * w_priv_neg + b_priv_neg
-        priv_loss = cvx.sum(priv_function_pos + priv_function_neg)
-        loss = priv_loss + cvx.sum(slack)
+        priv_loss = weighted_sum(
+            priv_function_pos + priv_function_neg, self.sample_weight
+        )
+        loss = priv_loss + weighted_sum(slack, self.sample_weight)
         weight_norm = cvx.norm(w, 1)
         self.weight_norm_priv_pos = cvx.norm(w_priv_pos, 1)
         self.weight_norm_priv_neg = cvx.norm(w_priv_neg, 1)
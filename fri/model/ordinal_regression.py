@@ -1,10 +1,12 @@
 import cvxpy as cvx
 import numpy as np
+from scipy import sparse
 from sklearn.metrics import make_scorer
 from sklearn.utils import check_X_y
+from sklearn.utils.extmath import safe_sparse_dot
 
 from .base_cvxproblem import Relevance_CVXProblem
-from .base_initmodel import InitModel
+from .base_initmodel import InitModel, match_precision, weighted_sum
 from .base_type import ProblemType
 
 
@@ -24,11 +26,11 @@ class OrdinalRegression(ProblemType):
     def relax_factors(cls):
         return ["loss_slack", "w_l1_slack"]
 
-    def preprocessing(self, data, **kwargs):
+    def preprocessing(self, data, dtype=np.float64, **kwargs):
         X, y = data
 
         # Check that X and y have correct shape
-        X, y = check_X_y(X, y)
+        X, y = check_X_y(X, y, accept_sparse=["csr", "csc"], dtype=dtype)
         if np.min(y) > 0:
             print("First ordinal class has index > 0. Shifting index...")
             y = y - np.min(y)
@@ -37,11 +39,13 @@ class OrdinalRegression(ProblemType):
 
 
 class OrdinalRegression_SVM(InitModel):
+    linear_program = True
+
     @classmethod
     def hyperparameter(cls):
         return ["C"]
 
-    def fit(self, X, y, **kwargs):
+    def fit(self, X, y, sample_weight=None, **kwargs):
         (n, d) = X.shape
 
         C = self.hyperparam["C"]
@@ -59,7 +63,8 @@ class OrdinalRegression_SVM(InitModel):
         # We have an offset for every bin boundary
         b_s = cvx.Variable(shape=(n_bins - 1), name="bias")
 
-        objective = cvx.Minimize(cvx.norm(w, 1) + C * cvx.sum(slack_left + slack_right))
+        loss = weighted_sum(slack_left + slack_right, sample_weight)
+        objective = cvx.Minimize(cvx.norm(w, 1) + C * loss)
         constraints = [slack_left >= 0, slack_right >= 0]
 
         # Add constraints for slack into left neighboring bins
@@ -87,7 +92,7 @@ class OrdinalRegression_SVM(InitModel):
         slack_right = np.asarray(slack_right.value).flatten()
         self.model_state = {"w": w, "b_s": b_s, "slack": (slack_left, slack_right)}
 
-        loss = np.sum(slack_left + slack_right)
+        loss = weighted_sum(slack_left + slack_right, sample_weight)
         w_l1 = np.linalg.norm(w, ord=1)
         self.constraints = {"loss": loss, "w_l1": w_l1}
         return self
@@ -96,7 +101,7 @@ class OrdinalRegression_SVM(InitModel):
         w = self.model_state["w"]
         b_s = self.model_state["b_s"]
 
-        scores = np.dot(X, w.T)[np.newaxis]
+        scores = safe_sparse_dot(X, match_precision(w, X).T)[np.newaxis]
         bin_thresholds = np.append(b_s, np.inf)
 
         # If thresholds are smaller than score the value belongs to the bigger bin
@@ -104,9 +109,19 @@ class OrdinalRegression_SVM(InitModel):
         indices = np.sum(scores.T - bin_thresholds >= 0, -1)
         return self.classes_[indices]
 
+    def margins(self, X, y):
+        # b_s[k - 1] + 1 <= X * w <= b_s[k] - 1 for samples in bin k
+        w = self.model_state["w"]
+        b_s = self.model_state["b_s"]
+        scores = safe_sparse_dot(X, match_precision(w, X))
+        bins = np.searchsorted(self.classes_, y)
+        upper = np.append(b_s, np.inf)[bins] - 1
+        lower = np.insert(b_s, 0, -np.inf)[bins] + 1
+        return np.minimum(upper - scores, scores - lower)
+
     def score(self, X, y, error_type="mmae", return_error=False, **kwargs):
 
-        X, y = check_X_y(X, y)
+        X, y = check_X_y(X, y, accept_sparse=["csr", "csc"])
 
         prediction = self.predict(X)
         score = ordinal_scores(y, prediction, error_type, return_error=return_error)
@@ -192,17 +207,17 @@ def ordinal_scores(y, prediction, error_type, return_error=False):
 
 
 class OrdinalRegression_Relevance_Bound(Relevance_CVXProblem):
+    linear_program = True
+    native_lp = True
+    absorbs_constant_features = True
+
     def init_objective_UB(self, sign=None, **kwargs):
 
-        self.add_constraint(
-            self.feature_relevance <= sign * self.w[self.current_feature]
-        )
+        self.add_constraint(self.feature_relevance <= self.feature_weight)
         self._objective = cvx.Maximize(self.feature_relevance)
 
     def init_objective_LB(self, **kwargs):
-        self.add_constraint(
-            cvx.abs(self.w[self.current_feature]) <= self.feature_relevance
-        )
+        self.add_constraint(cvx.abs(self.feature_weight) <= self.feature_relevance)
         self._objective = cvx.Minimize(self.feature_relevance)
 
     def _init_constraints(self, parameters, init_model_constraints):
@@ -226,7 +241,9 @@ class OrdinalRegression_Relevance_Bound(Relevance_CVXProblem):
         self.b_s = cvx.Variable(shape=(n_bins - 1), name="bias")
 
         # New Constraints
-        self.loss = cvx.sum(self.slack_left + self.slack_right)
+        self.loss = weighted_sum(
+            self.slack_left + self.slack_right, self.sample_weight
+        )
         self.weight_norm = cvx.norm(self.w, 1)
 
         for i in range(n_bins - 1):
@@ -249,3 +266,44 @@ class OrdinalRegression_Relevance_Bound(Relevance_CVXProblem):
         self.add_constraint(C * self.loss <= C * init_loss)
 
         self.feature_relevance = cvx.Variable(nonneg=True, name="Feature Relevance")
+
+    def _linear_constraints(self, parameters, init_model_constraints):
+        # Variables besides w: [slack_left, slack_right, b_s]
+        n_bins = len(np.unique(self.y))
+        X = sparse.csr_matrix(self.X)
+        y = self.y.astype(int)
+        n = self.n
+        eye = sparse.eye(n, format="csr")
+        bias = sparse.eye(n_bins - 1, format="csr")
+
+        # X * w - slack_left <= b_s[y] - 1
+        left = np.flatnonzero(y < n_bins - 1)
+        A_left = sparse.hstack(
+            [-eye[left], sparse.csr_matrix((len(left), n)), -bias[y[left]]]
+        )
+        # X * w + slack_right >= b_s[y - 1] + 1
+        right = np.flatnonzero(y >= 1)
+        A_right = sparse.hstack(
+            [sparse.csr_matrix((len(right), n)), -eye[right], bias[y[right] - 1]]
+        )
+        # b_s[i] <= b_s[i + 1]
+        ascending = sparse.eye(n_bins - 2, n_bins - 1) - sparse.eye(
+            n_bins - 2, n_bins - 1, k=1
+        )
+        A_order = sparse.hstack([sparse.csr_matrix((n_bins - 2, 2 * n)), ascending])
+        weights = np.tile(self.sample_weights, 2)[np.newaxis]
+        loss = sparse.hstack([weights, sparse.csr_matrix((1, n_bins - 1))])
+
+        A_w = sparse.vstack(
+            [X[left], -X[right], sparse.csr_matrix((n_bins - 1, self.d))]
+        )
+        A_extra = sparse.vstack([A_left, A_right, A_order, loss])
+        b = np.concatenate(
+            [
+                -np.ones(len(left) + len(right)),
+                np.zeros(n_bins - 2),
+                [init_model_constraints["loss"]],
+            ]
+        )
+        extra_bounds = [(0, None)] * (2 * n) + [(None, None)] * (n_bins - 1)
+        return A_w, A_extra, b, extra_bounds
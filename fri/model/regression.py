@@ -1,9 +1,15 @@
 import cvxpy as cvx
 import numpy as np
+from scipy import sparse
 from sklearn.utils import check_X_y
-
-from .base_cvxproblem import Relevance_CVXProblem
-from .base_initmodel import InitModel
+from sklearn.utils.extmath import safe_sparse_dot
+
+from .base_cvxproblem import (
+    SAMPLE_SCREENING_TOLERANCE,
+    Relevance_CVXProblem,
+    max_dot_products,
+)
+from .base_initmodel import InitModel, match_precision, weighted_sum
 from .base_type import ProblemType
 
 
@@ -23,21 +29,23 @@ class Regression(ProblemType):
     def relax_factors(cls):
         return ["loss_slack", "w_l1_slack"]
 
-    def preprocessing(self, data, **kwargs):
+    def preprocessing(self, data, dtype=np.float64, **kwargs):
         X, y = data
 
         # Check that X and y have correct shape
-        X, y = check_X_y(X, y)
+        X, y = check_X_y(X, y, accept_sparse=["csr", "csc"], dtype=dtype)
 
         return X, y
 
 
 class Regression_SVR(InitModel):
+    linear_program = True
+
     @classmethod
     def hyperparameter(cls):
         return ["C", "epsilon"]
 
-    def fit(self, X, y, **kwargs):
+    def fit(self, X, y, sample_weight=None, **kwargs):
         (n, d) = X.shape
 
         C = self.hyperparam["C"]
@@ -47,7 +55,9 @@ class Regression_SVR(InitModel):
         slack = cvx.Variable(shape=(n), name="slack")
         b = cvx.Variable(name="bias")
 
-        objective = cvx.Minimize(cvx.norm(w, 1) + C * cvx.sum(slack))
+        objective = cvx.Minimize(
+            cvx.norm(w, 1) + C * weighted_sum(slack, sample_weight)
+        )
         constraints = [cvx.abs(y - (X * w + b)) <= epsilon + slack, slack >= 0]
 
         # Solve problem.
@@ -60,7 +70,7 @@ class Regression_SVR(InitModel):
         slack = np.asarray(slack.value).flatten()
         self.model_state = {"w": w, "b": b, "slack": slack}
 
-        loss = np.sum(slack)
+        loss = weighted_sum(slack, sample_weight)
         w_l1 = np.linalg.norm(w, ord=1)
         self.constraints = {"loss": loss, "w_l1": w_l1}
         return self
@@ -68,9 +78,13 @@ class Regression_SVR(InitModel):
     def predict(self, X):
         w = self.model_state["w"]
         b = self.model_state["b"]
-        y = np.dot(X, w) + b
+        y = safe_sparse_dot(X, match_precision(w, X)) + b
         return y
 
+    def margins(self, X, y):
+        # |y - (X * w + b)| <= epsilon
+        return self.hyperparam["epsilon"] - np.abs(y - self.predict(X))
+
     def score(self, X, y, **kwargs):
         prediction = self.predict(X)
 
@@ -86,16 +100,17 @@ class Regression_SVR(InitModel):
 
 
 class Regression_Relevance_Bound(Relevance_CVXProblem):
+    linear_program = True
+    native_lp = True
+    absorbs_constant_features = True
+    supports_constraint_generation = True
+
     def init_objective_UB(self, sign=None, **kwargs):
-        self.add_constraint(
-            self.feature_relevance <= sign * self.w[self.current_feature]
-        )
+        self.add_constraint(self.feature_relevance <= self.feature_weight)
         self._objective = cvx.Maximize(self.feature_relevance)
 
     def init_objective_LB(self, **kwargs):
-        self.add_constraint(
-            cvx.abs(self.w[self.current_feature]) <= self.feature_relevance
-        )
+        self.add_constraint(cvx.abs(self.feature_weight) <= self.feature_relevance)
         self._objective = cvx.Minimize(self.feature_relevance)
 
     def _init_constraints(self, parameters, init_model_constraints):
@@ -113,7 +128,7 @@ class Regression_Relevance_Bound(Relevance_CVXProblem):
 
         # New Constraints
         distance_from_plane = cvx.abs(self.y - (self.X * self.w + self.b))
-        self.loss = cvx.sum(self.slack)
+        self.loss = weighted_sum(self.slack, self.sample_weight)
         self.weight_norm = cvx.norm(self.w, 1)
 
         self.add_constraint(distance_from_plane <= epsilon + self.slack)
@@ -121,3 +136,64 @@ class Regression_Relevance_Bound(Relevance_CVXProblem):
         self.add_constraint(C * self.loss <= C * init_loss)
 
         self.feature_relevance = cvx.Variable(nonneg=True, name="Feature Relevance")
+
+    @classmethod
+    def screen_samples(
+        cls,
+        data,
+        parameters,
+        init_model_constraints,
+        weight_bounds,
+        solver=None,
+        sample_weight=None,
+    ):
+        bias_range = cls._bias_range(
+            data,
+            parameters,
+            init_model_constraints,
+            weight_bounds,
+            solver,
+            sample_weight=sample_weight,
+        )
+        if bias_range is None:
+            return None
+        b_min, b_max = bias_range
+        X, y = data
+        epsilon = parameters["epsilon"]
+
+        # Range of the prediction X * w + b of every sample over all feasible models
+        max_dot = max_dot_products(X, weight_bounds, init_model_constraints["w_l1"])
+        lowest = b_min - max_dot
+        highest = b_max + max_dot
+        tolerance = SAMPLE_SCREENING_TOLERANCE * (1 + max_dot + abs(b_min) + abs(b_max))
+        # Samples whose prediction always stays inside the epsilon tube are removed
+        inside = lowest >= y - epsilon + tolerance
+        inside &= highest <= y + epsilon - tolerance
+        return ~inside
+
+    def _constraint_slack(self, X, y, w, b):
+        # |y - (X * w + b)| <= epsilon
+        epsilon = self.init_hyperparameters["epsilon"]
+        return epsilon - np.abs(y - (safe_sparse_dot(X, w) + b))
+
+    def _linear_constraints(self, parameters, init_model_constraints):
+        # Variables besides w: [b, slack]
+        X = sparse.csr_matrix(self.X)
+        epsilon = parameters["epsilon"]
+        n = self.n
+
+        # |y - (X * w + b)| <= epsilon + slack
+        ones = sparse.csr_matrix(np.ones((n, 1)))
+        A_w = sparse.vstack([-X, X, sparse.csr_matrix((1, self.d))])
+        A_extra = sparse.bmat(
+            [
+                [-ones, -sparse.eye(n)],
+                [ones, -sparse.eye(n)],
+                [None, self.sample_weights[np.newaxis]],
+            ]
+        )
+        b = np.concatenate(
+            [epsilon - self.y, epsilon + self.y, [init_model_constraints["loss"]]]
+        )
+        extra_bounds = [(None, None)] + [(0, None)] * n
+        return A_w, A_extra, b, extra_bounds
@@ -4,6 +4,8 @@
     The sampling rate can be increased.
     The model with the best internally defined accuracy is picked.
     To increase robustness we use cross validation.
+    With successive halving (`search="halving"`) candidates are first compared on small subsets of the samples
+    and only the best are evaluated on more samples, ending with cross validation on all samples for the finalists.
 """
 import warnings
 
@@ -14,11 +16,30 @@ warnings.filterwarnings(action="ignore", category=FitFailedWarning)
 from pprint import pprint
 from typing import Tuple
 
+import math
+
+import joblib
 import numpy as np
-from sklearn.model_selection import RandomizedSearchCV
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import ParameterSampler, RandomizedSearchCV, check_cv
 
 from fri.model.base_initmodel import InitModel
 
+SEARCH_METHODS = ["random", "halving"]
+HALVING_FACTOR = 3  # Per round candidates are reduced and samples increased by this factor
+HALVING_MIN_SAMPLES = 60  # Size of the sample subset in the first round
+CV_FOLDS = 3
+
+
+def check_search(search):
+    """
+    Validate the hyperparameter search method selected by the user.
+    """
+    if search not in SEARCH_METHODS:
+        raise ValueError(f"Search '{search}' is unknown. Try one of {SEARCH_METHODS}.")
+    return search
+
 
 def find_best_model(
     model_template: InitModel,
@@ -29,6 +50,9 @@ def find_best_model(
     n_jobs: int,
     verbose: int = 0,
     lupi_features=None,
+    solver=None,
+    sample_weight=None,
+    search="random",
     kwargs: dict = None,
 ) -> Tuple[InitModel, float]:
     """
@@ -53,10 +77,17 @@ def find_best_model(
         Allows verbose output when `verbose>0`.
     lupi_features : int
         Amount of lupi_features
+    solver : str
+        Solver backend used to fit the models, `None` for automatic choice.
+    sample_weight : array of shape (n) or None
+        Weights of the samples in the loss of the models, split into the folds with the data.
+    search : str
+        "random" for `RandomizedSearchCV` with `n_iter` candidates,
+        "halving" for successive halving of `HALVING_FACTOR * n_iter` candidates (see `halving_search`).
     kwargs : dict
         Placeholder, dict to pass into fit functions.
     """
-    model = model_template()
+    model = model_template(solver=solver)
 
     scorer, metric = model.make_scorer()
     if scorer is None:
@@ -64,26 +95,39 @@ def find_best_model(
     else:
         refit = metric
 
-    searcher = RandomizedSearchCV(
-        model,
-        hyperparameters,
-        scoring=scorer,
-        random_state=random_state,
-        refit=refit,
-        cv=3,
-        n_iter=n_iter,
-        n_jobs=n_jobs,
-        error_score=np.nan,
-        verbose=verbose,
-    )
-
     X, y = data
-    # Ignore warnings for extremely bad model_state (when precision=0)
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        searcher.fit(X, y, lupi_features=lupi_features)
+    fit_params = {"lupi_features": lupi_features, "sample_weight": sample_weight}
+    if check_search(search) == "halving":
+        best_model = halving_search(
+            model,
+            hyperparameters,
+            data,
+            random_state,
+            HALVING_FACTOR * n_iter,
+            n_jobs,
+            verbose,
+            fit_params,
+        )
+    else:
+        searcher = RandomizedSearchCV(
+            model,
+            hyperparameters,
+            scoring=scorer,
+            random_state=random_state,
+            refit=refit,
+            cv=CV_FOLDS,
+            n_iter=n_iter,
+            n_jobs=n_jobs,
+            error_score=np.nan,
+            verbose=verbose,
+        )
+
+        # Ignore warnings for extremely bad model_state (when precision=0)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            searcher.fit(X, y, **fit_params)
+        best_model = searcher.best_estimator_
 
-    best_model: InitModel = searcher.best_estimator_
     best_score = best_model.score(X, y)
     if verbose > 0:
         print("*" * 20, "Best found baseline model", "*" * 20)
@@ -100,3 +144,132 @@ def find_best_model(
                 pprint((f"{k}: {v}"))
         print("*" * 30)
     return best_model, best_score
+
+
+def halving_search(
+    model: InitModel,
+    hyperparameters: dict,
+    data: Tuple[np.ndarray, np.ndarray],
+    random_state: np.random.RandomState,
+    n_candidates: int,
+    n_jobs: int,
+    verbose: int = 0,
+    fit_params: dict = None,
+) -> InitModel:
+    """
+    Successive halving: all candidates are cross validated on a small random subset of the samples,
+    the best `1 / HALVING_FACTOR` of them are promoted to a `HALVING_FACTOR` times larger subset.
+    The last round cross validates the remaining candidates on all samples.
+    All folds of all candidates of a round are fitted in parallel.
+
+    Parameters
+    ----------
+    model : InitModel
+        Unfitted model which is cloned for every candidate.
+    hyperparameters : dict
+        Dictionary of hyperparameters (values or distributions).
+    data : tuple
+        Tuple of data (X,y)
+    random_state : RandomState
+        numpy RandomState object
+    n_candidates : int
+        Amount of sampled candidates in the first round.
+    n_jobs : int
+        Allows multiprocessing with `n_jobs` threads.
+    verbose : int
+        Allows verbose output when `verbose>0`.
+    fit_params : dict
+        Keyword arguments of `fit`, per sample arrays (e.g. `sample_weight`) are subset with the data.
+
+    Returns
+    -------
+    InitModel
+        Best candidate, fitted on all samples.
+    """
+    X, y = data
+    n = len(y)
+    fit_params = {} if fit_params is None else fit_params
+    scorer, metric = model.make_scorer()
+    if scorer is None:
+        scorer = check_scoring(model)
+    else:
+        scorer = scorer[metric]
+
+    candidates = list(ParameterSampler(hyperparameters, n_candidates, random_state))
+    n_rounds = max(1, math.ceil(math.log(len(candidates), HALVING_FACTOR)))
+    with joblib.Parallel(n_jobs=n_jobs) as parallel:
+        for i_round in range(n_rounds):
+            n_samples = n
+            if i_round < n_rounds - 1:
+                n_samples = HALVING_MIN_SAMPLES * HALVING_FACTOR ** i_round
+            if n_samples >= n:
+                n_samples = n
+                subset = np.arange(n)
+            else:
+                subset = np.sort(random_state.choice(n, n_samples, replace=False))
+            X_subset, y_subset = X[subset], y[subset]
+            params = {
+                k: v[subset] if _is_sample_array(v, n) else v
+                for k, v in fit_params.items()
+            }
+
+            # Same folds as `cross_validate`
+            cv = check_cv(CV_FOLDS, y_subset, classifier=is_classifier(model))
+            folds = list(cv.split(X_subset, y_subset))
+            results = parallel(
+                joblib.delayed(_fit_and_score)(
+                    clone(model).set_params(**candidate),
+                    X_subset,
+                    y_subset,
+                    train,
+                    test,
+                    scorer,
+                    params,
+                )
+                for candidate in candidates
+                for train, test in folds
+            )
+            scores = np.mean(np.reshape(results, (len(candidates), len(folds))), axis=1)
+            # Failed fits are ranked last
+            scores = np.where(np.isnan(scores), -np.inf, scores)
+            if verbose > 0:
+                print(
+                    f"Round {i_round}:",
+                    f"{len(candidates)} candidates, {n_samples} samples,",
+                    f"best score {np.max(scores):.3f}",
+                )
+
+            order = np.argsort(-scores, kind="stable")
+            if n_samples == n or i_round == n_rounds - 1:
+                candidates = [candidates[order[0]]]
+                break
+            n_promoted = max(1, math.ceil(len(candidates) / HALVING_FACTOR))
+            candidates = [candidates[i] for i in order[:n_promoted]]
+
+    best_model = clone(model).set_params(**candidates[0])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        best_model.fit(X, y, **fit_params)
+    return best_model
+
+
+def _fit_and_score(model, X, y, train, test, scorer, fit_params):
+    """
+    Worker method which fits `model` on the `train` samples and scores it on the `test` samples.
+    Failed fits are scored with `nan` (like `error_score=np.nan` in `cross_validate`).
+    """
+    params = {
+        k: v[train] if _is_sample_array(v, len(y)) else v for k, v in fit_params.items()
+    }
+    # Ignore warnings for extremely bad model_state (when precision=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            model.fit(X[train], y[train], **params)
+            return scorer(model, X[test], y[test])
+        except Exception:
+            return np.nan
+
+
+def _is_sample_array(value, n):
+    return hasattr(value, "shape") and len(value) == n
@@ -0,0 +1,153 @@
+"""
+    Registry of solver backends used for the baseline models and the relevance bound problems.
+    Every backend maps to a cvxpy solver with preset tolerances and iteration limits.
+    With `solver="auto"` linear programs are routed to a dedicated LP solver.
+    Linear bound problems can also be solved natively with `scipy.optimize.linprog` (`solver="linprog"`).
+"""
+import copy
+
+import cvxpy as cvx
+import scipy
+
+SOLVER_BACKENDS = {
+    "ECOS": {
+        "solver": "ECOS",
+        "abstol": 1e-8,
+        "reltol": 1e-8,
+        "feastol": 1e-8,
+        "max_iters": 100,
+    },
+    "SCS": {"solver": "SCS", "eps_abs": 1e-6, "eps_rel": 1e-6, "max_iters": 100000},
+    "OSQP": {
+        "solver": "OSQP",
+        "eps_abs": 1e-6,
+        "eps_rel": 1e-6,
+        "max_iter": 20000,
+        "polish": True,
+    },
+    "CLARABEL": {
+        "solver": "CLARABEL",
+        "tol_gap_abs": 1e-8,
+        "tol_gap_rel": 1e-8,
+        "tol_feas": 1e-8,
+        "max_iter": 200,
+    },
+    # HiGHS is available in cvxpy through the scipy interface
+    "HIGHS": {
+        "solver": "SCIPY",
+        "scipy_options": {
+            "method": "highs",
+            "primal_feasibility_tolerance": 1e-8,
+            "dual_feasibility_tolerance": 1e-8,
+        },
+    },
+}
+
+# Native engines which solve linear bound problems without cvxpy
+# (see `Relevance_CVXProblem.native_lp`)
+NATIVE_SOLVERS = {
+    "LINPROG": {
+        "method": "highs",
+        "options": {
+            "primal_feasibility_tolerance": 1e-8,
+            "dual_feasibility_tolerance": 1e-8,
+        },
+    }
+}
+
+DEFAULT_SOLVER = "ECOS"  # Fallback for all problems
+LP_SOLVER = "HIGHS"  # Preferred for linear programs
+WARM_START_SOLVERS = ["SCS", "OSQP"]  # Backends which accept warm starts in cvxpy
+AUTO = "AUTO"  # Choose the backend depending on the problem
+
+
+def register_solver(name: str, solver: str, **options):
+    """
+    Add or replace a solver backend.
+
+    Parameters
+    ----------
+    name : str
+        Name of the backend which can be passed as `solver` to `FRI`.
+    solver : str
+        Name of the cvxpy solver.
+    options : dict
+        Solver specific settings (e.g. tolerances) passed to `cvxpy.Problem.solve`.
+    """
+    SOLVER_BACKENDS[name.upper()] = {"solver": solver, **options}
+
+
+def is_available(name: str) -> bool:
+    if name.upper() in NATIVE_SOLVERS:
+        # HiGHS is part of scipy since 1.6
+        version = tuple(int(v) for v in scipy.__version__.split(".")[:2])
+        return version >= (1, 6)
+    backend = SOLVER_BACKENDS.get(name.upper())
+    if backend is None:
+        return False
+    return backend["solver"] in cvx.installed_solvers()
+
+
+def check_solver(name):
+    """
+    Validate a user selected backend name.
+    `None` selects the default solver and "auto" picks a backend depending on the problem.
+    """
+    if name is None:
+        return None
+    if not isinstance(name, str):
+        raise ValueError(f"Solver '{name}' is not a string.")
+    name = name.upper()
+    if name == AUTO:
+        return name
+    if name not in SOLVER_BACKENDS and name not in NATIVE_SOLVERS:
+        known = list(SOLVER_BACKENDS) + list(NATIVE_SOLVERS)
+        raise ValueError(f"Solver '{name}' is unknown. Try one of {known} or 'auto'.")
+    if not is_available(name):
+        raise ValueError(f"Solver '{name}' is not installed.")
+    return name
+
+
+def choose_solver(name=None, linear_program=False, warm_start=False, native_lp=False):
+    """
+    Return the backend name used for a problem.
+    Explicitly chosen backends are always used.
+    Otherwise we prefer warm startable solvers (if requested), with "auto" a native LP engine
+    for problems which support it (`native_lp`), a dedicated LP solver for other
+    linear programs and the default solver for everything else.
+    """
+    if name is not None and name.upper() != AUTO:
+        return name.upper()
+    candidates = []
+    if warm_start:
+        candidates += WARM_START_SOLVERS
+    if native_lp and name is not None:
+        candidates += list(NATIVE_SOLVERS)
+    if linear_program and name is not None:
+        candidates.append(LP_SOLVER)
+    for candidate in candidates:
+        if is_available(candidate):
+            return candidate
+    return DEFAULT_SOLVER
+
+
+def solver_kwargs(name=None, linear_program=False, warm_start=False, verbose=False):
+    """
+    Keyword arguments for `cvxpy.Problem.solve` of the chosen backend.
+    Problems which are solved with cvxpy use HiGHS in place of a native LP engine.
+    """
+    backend = choose_solver(name, linear_program, warm_start)
+    if backend in NATIVE_SOLVERS:
+        backend = LP_SOLVER if is_available(LP_SOLVER) else DEFAULT_SOLVER
+    kwargs = copy.deepcopy(SOLVER_BACKENDS[backend])
+    kwargs["verbose"] = verbose
+    if warm_start and backend in WARM_START_SOLVERS:
+        kwargs["warm_start"] = True
+    return kwargs
+
+
+def linprog_kwargs(name):
+    """
+    Keyword arguments for `scipy.optimize.linprog` of a native backend.
+    """
+    return copy.deepcopy(NATIVE_SOLVERS[name.upper()])
@@ -36,3 +36,468 @@ def test_lupi_model(problem, random_state):
     model.fit(combined, y, lupi_features=X.shape[1])
 
     assert len(model.allrel_prediction_) == combined.shape[1]
+
+
+# Options which do not change the intervals: parameters of the reference fit and of
+# the fit with the option, input of the option fit ("sparse" or "memory_mapped"),
+# arguments of the generated data, support of LUPI models and tolerance of the result
+EQUIVALENT_OPTIONS = {
+    "shared_data": dict(
+        reference={"n_jobs": 2}, option={"n_jobs": 2, "shared_data": True}, lupi=True
+    ),
+    "sparse_input": dict(input="sparse"),
+    "memory_mapped_input": dict(
+        reference={"n_jobs": 2, "shared_data": True},
+        option={"n_jobs": 2, "shared_data": True},
+        input="memory_mapped",
+    ),
+    "single_precision": dict(
+        option={"dtype": np.float32}, data={"dtype": np.float32}, atol=1e-3
+    ),
+    "sample_screening": dict(
+        option={"sample_screening": True}, data={"n_samples": 200}
+    ),
+    "constraint_generation": dict(
+        option={"constraint_generation": True},
+        data={"n_samples": 300},
+        lupi=True,
+        atol=1e-5,
+    ),
+    "constraint_generation_linprog": dict(
+        reference={"solver": "linprog"},
+        option={"solver": "linprog", "constraint_generation": True},
+        data={"n_samples": 300},
+        atol=1e-5,
+    ),
+    "column_generation": dict(
+        reference={"solver": "linprog"},
+        option={"solver": "linprog", "column_generation": True},
+        data={"n_samples": 50, "n_features": 60},
+        atol=1e-5,
+    ),
+    "collapse_duplicates": dict(
+        # With one search sample both models use the same hyperparameters
+        reference={"n_param_search": 1},
+        option={"n_param_search": 1, "collapse_duplicates": True},
+        data={"n_samples": 60},
+        duplicates=True,
+        atol=1e-4,
+    ),
+}
+
+
+@pytest.mark.parametrize(
+    "problem, option",
+    [
+        (problem, option)
+        for option, case in EQUIVALENT_OPTIONS.items()
+        for problem in NORMAL_MODELS + (LUPI_MODELS if case.get("lupi") else [])
+    ],
+)
+def test_option_keeps_intervals(problem, option, tmp_path):
+    from scipy import sparse
+    from fri.model.base_cvxproblem import clear_template_cache
+
+    case = EQUIVALENT_OPTIONS[option]
+    data = quick_generate(
+        problem, random_state=check_random_state(1337), **case.get("data", {})
+    )
+    if problem in LUPI_MODELS:
+        X, X_p, y = data
+        X = np.hstack([X, X_p])
+        lupi_features = X_p.shape[1]
+    else:
+        X, y = data
+        lupi_features = 0
+    if case.get("duplicates"):
+        repeats = check_random_state(2).randint(1, 4, size=len(y))
+        X, y = np.repeat(X, repeats, axis=0), np.repeat(y, repeats)
+
+    X_option = X
+    if case.get("input") == "sparse":
+        X[np.abs(X) < 0.5] = 0
+        X_option = sparse.csr_matrix(X)
+    elif case.get("input") == "memory_mapped":
+        X_option = str(tmp_path / "X.npy")
+        np.save(X_option, X)
+
+    intervals = []
+    for data, params in [(X, case.get("reference", {})), (X_option, case["option"])]:
+        clear_template_cache()
+        model = FRI(
+            problem,
+            random_state=check_random_state(1),
+            **{"n_param_search": 5, **params},
+        )
+        model.fit(data, y, lupi_features=lupi_features)
+        intervals.append(model.interval_)
+
+    np.testing.assert_allclose(intervals[0], intervals[1], atol=case.get("atol", 1e-6))
+
+
+def test_shared_data_is_removed(tmp_path, monkeypatch):
+    import tempfile
+    from fri import compute
+
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    def shared_folders():
+        return [path for path in tmp_path.iterdir() if path.name.startswith("fri_")]
+
+    model = FRI(problem, n_param_search=5, shared_data=True)
+    model.fit(X, y)
+    assert not shared_folders()
+
+    # Also when solving fails
+    def fail(*args, **kwargs):
+        assert shared_folders()
+        raise RuntimeError("Solver failed")
+
+    monkeypatch.setattr(compute, "_start_solver_worker", fail)
+    with pytest.raises(RuntimeError):
+        model.fit(X, y)
+    assert not shared_folders()
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_adaptive_probes(problem):
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+
+    model = FRI(
+        problem,
+        random_state=check_random_state(1),
+        n_param_search=5,
+        n_probe_features=40,
+        probe_tolerance=0.05,
+    )
+    model.fit(X, y)
+
+    assert len(model.relevance_classes_) == X.shape[1]
+
+    stable = FRI(
+        problem,
+        random_state=check_random_state(1),
+        n_param_search=5,
+        n_probe_features=40,
+        probe_tolerance=1e6,
+    )
+    stable.fit(X, y)
+    # Every change of the (nonzero) upper threshold is accepted, probes stop after two batches
+    for (isUpper, _), values in stable._relevance_bounds_computer._probe_cache.items():
+        if isUpper:
+            assert len(values) <= 20
+
+
+def test_result_cache(tmp_path, monkeypatch):
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+
+    def fit(n_probe_features):
+        model = FRI(
+            problem,
+            random_state=check_random_state(1),
+            n_param_search=5,
+            n_probe_features=n_probe_features,
+            cache_dir=str(tmp_path),
+        )
+        return model.fit(X, y)
+
+    first = fit(20)
+
+    # Everything is cached, no probe or bound problem is solved
+    from fri import compute
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Problems are solved again")
+
+    monkeypatch.setattr(compute, "_start_solver_worker", fail)
+    second = fit(10)
+
+    np.testing.assert_allclose(first.interval_, second.interval_)
+
+
+def test_cache_key_depends_on_backend_and_random_state():
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    model = FRI(problem, random_state=check_random_state(1), n_param_search=5)
+    computer = model.fit(X, y)._relevance_bounds_computer
+
+    key = computer._cache_key("bounds")
+    computer.solver = "ECOS"
+    assert computer._cache_key("bounds") == key
+    computer.solver = "LINPROG"
+    assert computer._cache_key("bounds") != key
+
+    computer.solver = None
+    probe_key = computer._cache_key("probes", computer.random_state)
+    computer.random_state.rand()
+    assert computer._cache_key("probes", computer.random_state) != probe_key
+
+
+def test_resume_from_checkpoint(tmp_path, monkeypatch):
+    from fri import main
+
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    checkpoint = str(tmp_path / "bounds.jsonl")
+
+    def fit(random_state):
+        model = FRI(problem, random_state=random_state, n_param_search=5)
+        return model.fit(X, y, resume=checkpoint)
+
+    first = fit(check_random_state(1))
+    with open(checkpoint) as f:
+        n_lines = len(f.readlines())
+    assert n_lines > X.shape[1]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Baseline is searched again")
+
+    monkeypatch.setattr(main, "find_best_model", fail)
+    # The baseline and all bounds are restored, nothing is appended
+    second = fit(None)
+    with open(checkpoint) as f:
+        assert len(f.readlines()) == n_lines
+
+    np.testing.assert_allclose(first.interval_, second.interval_)
+
+
+def test_resume_with_other_relaxation(tmp_path):
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    checkpoint = str(tmp_path / "bounds.jsonl")
+
+    FRI(problem, random_state=check_random_state(1), n_param_search=5).fit(
+        X, y, resume=checkpoint
+    )
+    model = FRI(
+        problem,
+        random_state=check_random_state(1),
+        n_param_search=5,
+        slack_regularization=0.1,
+    )
+    with pytest.raises(ValueError):
+        model.fit(X, y, resume=checkpoint)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_iter_intervals(n_jobs):
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+
+    model = FRI(problem, random_state=check_random_state(1), n_param_search=5)
+    model.fit(X, y)
+
+    streaming = FRI(
+        problem, random_state=check_random_state(1), n_param_search=5, n_jobs=n_jobs
+    )
+    yielded = {
+        feature: (lower, upper)
+        for feature, lower, upper, _ in streaming.iter_intervals(X, y)
+    }
+
+    assert sorted(yielded) == list(range(X.shape[1]))
+    np.testing.assert_allclose(
+        [yielded[i] for i in range(X.shape[1])], streaming.interval_
+    )
+    np.testing.assert_allclose(streaming.interval_, model.interval_, atol=1e-6)
+    assert len(streaming.relevance_classes_) == X.shape[1]
+
+
+def test_iter_intervals_closed_early():
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    model = FRI(problem, random_state=check_random_state(1), n_param_search=5, n_jobs=2)
+
+    intervals = model.iter_intervals(X, y)
+    next(intervals)
+    intervals.close()
+    # The worker pool is free again after the pending chunks were cancelled
+    model.fit(X, y)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"probe_tolerance": 0.1},
+        {"sample_screening": True},
+        {"feature_screening": True},
+        {"cache_dir": "."},
+    ],
+)
+def test_iter_intervals_unsupported_parameters(params):
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    model = FRI(problem, n_param_search=5, **params)
+
+    with pytest.raises(ValueError):
+        next(model.iter_intervals(X, y))
+
+
+def test_max_solves():
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+
+    model = FRI(problem, random_state=check_random_state(1), n_param_search=5)
+    model.fit(X, y)
+    assert not model.unsolved_features_.any()
+
+    budgeted = FRI(
+        problem,
+        random_state=check_random_state(1),
+        n_param_search=5,
+        n_probe_features=5,
+        max_solves=30,
+    )
+    budgeted.fit(X, y)
+
+    assert budgeted.unsolved_features_.any()
+    assert len(budgeted.allrel_prediction_) == X.shape[1]
+    # Unsolved intervals are widened and contain the exact intervals
+    lower, upper = budgeted.interval_.T
+    assert np.all(lower <= model.interval_[:, 0] + 1e-6)
+    assert np.all(upper >= model.interval_[:, 1] - 1e-6)
+
+
+def test_lupi_max_solves():
+    problem = LUPI_MODELS[0]
+    X, X_p, y = quick_generate(problem, random_state=check_random_state(1337))
+    combined = np.hstack([X, X_p])
+
+    model = FRI(
+        problem,
+        random_state=check_random_state(1),
+        n_param_search=5,
+        n_probe_features=5,
+        max_solves=60,
+    )
+    model.fit(combined, y, lupi_features=X_p.shape[1])
+
+    assert model.unsolved_features_.any()
+    # Probes are solved before the bounds use up the budget
+    probes = model._relevance_bounds_computer._probe_cache.values()
+    assert all(len(values) > 0 for values in probes)
+
+
+def test_sparse_input_with_empty_rows_and_columns():
+    from scipy import sparse
+
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    X[np.abs(X) < 0.5] = 0
+    # Samples and features without any nonzero entry
+    X[:3] = 0
+    X[:, 1] = 0
+    X_sparse = sparse.csr_matrix(X)
+    assert X_sparse[:3].nnz == 0
+
+    intervals = []
+    for data in [X, X_sparse]:
+        model = FRI(problem, random_state=check_random_state(1), n_param_search=5)
+        model.fit(data, y)
+        intervals.append(model.interval_)
+
+    np.testing.assert_allclose(intervals[0], intervals[1], atol=1e-6)
+    # The empty feature can always be set to 0
+    assert intervals[1][1, 0] == pytest.approx(0, abs=1e-6)
+
+
+def test_memory_mapped_input_is_not_copied(tmp_path, monkeypatch):
+    from fri import compute
+
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    path = str(tmp_path / "X.npy")
+    np.save(path, X)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Memory mapped data is written again")
+
+    # Workers attach to the file of the input, it is not dumped to a shared folder
+    monkeypatch.setattr(compute.tempfile, "mkdtemp", fail)
+    model = FRI(problem, n_param_search=5, shared_data=True)
+    model.fit(path, y)
+
+    # Probes permute copies, the file is not modified
+    np.testing.assert_array_equal(np.load(path), X)
+
+
+def test_single_precision_keeps_dtype():
+    from scipy import sparse
+    from fri.model.base_initmodel import match_precision
+    from fri.utils import clear_permutation_buffer, permutate_feature_in_buffer
+
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1337))
+    assert X.dtype == np.float64
+
+    # Double precision input is converted once
+    model = FRI(problem, n_param_search=5, dtype=np.float32)
+    model.fit(X, y)
+    data, _ = model._relevance_bounds_computer.data
+    assert data.dtype == np.float32
+    assert model.optim_model_.predict(X).shape == y.shape
+
+    # Neither sparse nor permuted single precision data is upcast
+    X_sparse = sparse.csr_matrix(data)
+    X_perm, _ = permutate_feature_in_buffer((X_sparse, y), 0, seed=1)
+    clear_permutation_buffer()
+    assert X_perm.dtype == np.float32
+    w = np.ones(X.shape[1])
+    assert match_precision(w, X_sparse).dtype == np.float32
+    assert match_precision(w, X) is w
+
+
+def test_coreset_weights_estimate_sums():
+    from fri.coreset import sample_coreset, sampling_probabilities
+
+    rs = check_random_state(1)
+    margins = rs.normal(size=1000)
+    probabilities = sampling_probabilities(margins)
+    np.testing.assert_allclose(probabilities.sum(), 1)
+    # Samples with loss are drawn more often than samples far from the margin
+    assert probabilities[np.argmin(margins)] > probabilities[np.argmax(margins)]
+
+    loss = np.maximum(0, -margins)
+    estimates = []
+    for _ in range(200):
+        indices, weights = sample_coreset(probabilities, 100, rs)
+        estimates.append(weights @ loss[indices] * len(margins) / 100)
+    np.testing.assert_allclose(np.mean(estimates), loss.sum(), rtol=0.05)
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_coreset_approximation(problem):
+    X, y = quick_generate(problem, random_state=check_random_state(1), n_samples=400)
+
+    model = FRI(
+        problem,
+        random_state=check_random_state(1),
+        n_param_search=5,
+        approximate="coreset",
+        coreset_size=150,
+        n_coresets=2,
+    )
+    model.fit(X, y)
+
+    assert model.interval_.shape == (X.shape[1], 2)
+    assert model.interval_error_.shape == model.interval_.shape
+    assert np.all(model.interval_error_ >= 0)
+    assert len(model.allrel_prediction_) == X.shape[1]
+
+
+def test_coreset_checkpoint(tmp_path):
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(problem, random_state=check_random_state(1), n_samples=400)
+    model = FRI(problem, n_param_search=5, approximate="coreset", coreset_size=150)
+
+    with pytest.raises(ValueError):
+        model.fit(X, y, resume=str(tmp_path / "bounds.jsonl"))
+
+
+def test_unknown_approximation():
+    X, y = quick_generate(NORMAL_MODELS[0], n_samples=50)
+    with pytest.raises(ValueError):
+        FRI(NORMAL_MODELS[0], approximate="sketch").fit(X, y)
@@ -0,0 +1,477 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import scale
+from sklearn.utils import check_random_state
+
+from fri import FRI, NORMAL_MODELS, quick_generate
+from fri.compute import PROBE_FPR, create_probe_statistic
+from fri.model.base_cvxproblem import clear_template_cache
+
+
+@pytest.fixture(scope="function")
+def randomstate():
+    return check_random_state(1337)
+
+
+def _solve_all(computer, template_key, warm_start=False, solver=None, **kwargs):
+    template = computer.problem_type.get_cvxproblem_template
+    X, _ = computer.data
+    values = []
+    for di in range(X.shape[1]):
+        for factory in [
+            template.generate_lower_bound_problem,
+            template.generate_upper_bound_problem,
+        ]:
+            for problem in factory(
+                computer.best_hyperparameters,
+                computer.init_constraints,
+                computer.best_init_model.model_state,
+                computer.data,
+                di,
+                None,
+                template_key=template_key,
+                warm_start=warm_start,
+                solver=solver,
+                **kwargs,
+            ):
+                problem.solve()
+                if problem.is_solved:
+                    values.append(problem.solved_relevance)
+                else:
+                    values.append(np.nan)
+    return np.array(values)
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_reused_template_equals_fresh_problem(problem, randomstate):
+    X, y = quick_generate(
+        problem, n_samples=100, n_features=4, n_strel=2, random_state=randomstate
+    )
+    model = FRI(problem, random_state=randomstate, n_param_search=5)
+    model.fit(scale(X), y)
+    computer = model._relevance_bounds_computer
+
+    clear_template_cache()
+    fresh = _solve_all(computer, template_key=None)
+    reused = _solve_all(computer, template_key="test")
+    clear_template_cache()
+
+    np.testing.assert_allclose(fresh, reused, atol=1e-6)
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_warm_started_problem_equals_cold_problem(problem, randomstate):
+    X, y = quick_generate(
+        problem, n_samples=100, n_features=4, n_strel=2, random_state=randomstate
+    )
+    model = FRI(problem, random_state=randomstate, n_param_search=5)
+    model.fit(scale(X), y)
+    computer = model._relevance_bounds_computer
+
+    clear_template_cache()
+    cold = _solve_all(computer, template_key="test")
+    clear_template_cache()
+    warm = _solve_all(computer, template_key="test", warm_start=True)
+    clear_template_cache()
+
+    np.testing.assert_allclose(cold, warm, rtol=1e-3, atol=1e-4)
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_native_linear_program_equals_cvxpy_problem(problem, randomstate):
+    X, y = quick_generate(
+        problem, n_samples=100, n_features=4, n_strel=2, random_state=randomstate
+    )
+    model = FRI(problem, random_state=randomstate, n_param_search=5)
+    model.fit(scale(X), y)
+    computer = model._relevance_bounds_computer
+
+    clear_template_cache()
+    cvxpy = _solve_all(computer, template_key="test")
+    native = _solve_all(computer, template_key="test", solver="LINPROG")
+    clear_template_cache()
+
+    np.testing.assert_allclose(cvxpy, native, atol=1e-6)
+
+
+def test_chunks_keep_all_bounds_of_a_feature():
+    from fri.compute import _chunk_tasks
+
+    tasks = [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4]
+    chunks = list(_chunk_tasks(tasks, key=lambda t: t, size=2))
+
+    assert chunks == [[0, 0, 0, 1, 1, 1], [2, 2, 2, 3, 3, 3], [4, 4, 4]]
+
+
+def test_probe_permutation_buffer_restores_previous_feature(randomstate):
+    from fri.utils import clear_permutation_buffer, permutate_feature_in_buffer
+
+    X = randomstate.normal(size=(50, 3))
+    y = np.zeros(50)
+
+    X_perm, _ = permutate_feature_in_buffer((X, y), 0, seed=1)
+    np.testing.assert_array_equal(np.sort(X_perm[:, 0]), np.sort(X[:, 0]))
+    X_perm, _ = permutate_feature_in_buffer((X, y), 2, seed=2)
+    clear_permutation_buffer()
+
+    np.testing.assert_array_equal(X_perm[:, :2], X[:, :2])
+    assert not np.array_equal(X_perm[:, 2], X[:, 2])
+
+
+def test_sparse_probe_permutation_equals_dense(randomstate):
+    from scipy import sparse
+    from fri.utils import clear_permutation_buffer, permutate_feature_in_buffer
+
+    X = randomstate.normal(size=(50, 3))
+    X[randomstate.uniform(size=X.shape) < 0.7] = 0
+    X_sparse = sparse.csr_matrix(X)
+    y = np.zeros(50)
+
+    for feature, seed in [(0, 1), (2, 2), (0, 3)]:
+        dense, _ = permutate_feature_in_buffer((X, y), feature, seed=seed)
+        dense = dense.copy()
+        clear_permutation_buffer()
+        for previous in range(3):
+            # The buffer restores the previously permuted column
+            permutate_feature_in_buffer((X_sparse, y), previous, seed=0)
+            permuted, _ = permutate_feature_in_buffer(
+                (X_sparse, y), feature, seed=seed
+            )
+            assert sparse.issparse(permuted)
+            np.testing.assert_array_equal(permuted.toarray(), dense)
+        clear_permutation_buffer()
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_screened_constant_features(problem, randomstate):
+    X, y = quick_generate(
+        problem, n_samples=100, n_features=4, n_strel=2, random_state=randomstate
+    )
+    X = np.hstack([scale(X), np.zeros((100, 2)), np.ones((100, 1))])
+    model = FRI(problem, random_state=randomstate, n_param_search=5)
+    model.fit(X, y)
+    computer = model._relevance_bounds_computer
+
+    solve_dims, screened = computer._screen_constant_features(
+        range(X.shape[1]), computer.data
+    )
+    assert screened == {5: 4, 6: 4}
+    assert solve_dims == [0, 1, 2, 3, 4]
+
+    np.testing.assert_array_equal(model.interval_[4:, 0], 0)
+    np.testing.assert_allclose(model.interval_[5:, 1], model.interval_[4, 1])
+
+
+def test_dual_bounds_are_upper_bounds(randomstate):
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(
+        problem, n_samples=100, n_features=8, n_strel=2, random_state=randomstate
+    )
+    model = FRI(
+        problem, random_state=randomstate, n_param_search=5, feature_screening=True
+    )
+    model.fit(scale(X), y)
+    computer = model._relevance_bounds_computer
+
+    bounds = computer.problem_type.get_cvxproblem_template.relevance_upper_bounds(
+        computer.data,
+        computer.best_hyperparameters,
+        computer.init_constraints,
+        computer.best_init_model.model_state,
+    )
+    clear_template_cache()
+    solved = _solve_all(computer, template_key=None).reshape(X.shape[1], 3)
+    assert np.all(solved[:, 1:] <= bounds[:, np.newaxis])
+
+    # Features below the probe threshold are irrelevant and keep their dual bound
+    probes = np.median(bounds) * np.array([1e-4, 2e-4])
+    _, threshold = create_probe_statistic(probes, PROBE_FPR)
+    irrelevant = computer._screen_irrelevant_features(range(X.shape[1]), probes)
+    assert set(irrelevant) == set(np.flatnonzero(bounds < threshold))
+    intervals = computer.compute_relevance_bounds(
+        range(X.shape[1]), irrelevant=irrelevant
+    )
+    for di, bound in irrelevant.items():
+        assert tuple(intervals[di]) == (0, bound)
+    assert set(irrelevant) <= computer.unsolved_features
+
+
+def test_feature_screening_with_cache(tmp_path):
+    problem = NORMAL_MODELS[0]
+    X, y = quick_generate(
+        problem,
+        n_samples=100,
+        n_features=20,
+        n_strel=2,
+        random_state=check_random_state(1337),
+    )
+
+    results = []
+    for cache_dir in [None, str(tmp_path), str(tmp_path)]:
+        model = FRI(
+            problem,
+            random_state=check_random_state(1),
+            n_param_search=5,
+            feature_screening=True,
+            cache_dir=cache_dir,
+        )
+        model.fit(X, y)
+        results.append(model)
+
+    # Screening does not depend on the cache, cached intervals keep screened features
+    for model in results[1:]:
+        np.testing.assert_allclose(model.interval_, results[0].interval_, atol=1e-6)
+        np.testing.assert_array_equal(
+            model.unsolved_features_, results[0].unsolved_features_
+        )
+
+    # Off by default
+    model = FRI(problem, random_state=check_random_state(1), n_param_search=5)
+    model.fit(X, y)
+    assert not model.unsolved_features_.any()
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_certified_zero_lower_bounds_equal_solved_lower_bounds(problem, randomstate):
+    X, y = quick_generate(
+        problem,
+        n_samples=100,
+        n_features=6,
+        n_strel=1,
+        n_redundant=2,
+        random_state=randomstate,
+    )
+    model = FRI(problem, random_state=randomstate, n_param_search=5)
+    model.fit(scale(X), y)
+    computer = model._relevance_bounds_computer
+
+    clear_template_cache()
+    solved = _solve_all(computer, template_key=None).reshape(X.shape[1], 3)
+    lower = solved[:, 0] / computer.best_init_model.L1_factor
+
+    np.testing.assert_allclose(model.interval_[:, 0], lower, atol=1e-6)
+
+
+def test_failed_bounds_certify_no_zero_lower_bounds(randomstate):
+    from types import SimpleNamespace
+
+    X, y = quick_generate(
+        "classification", n_samples=100, n_features=6, random_state=randomstate
+    )
+    model = FRI("classification", random_state=randomstate, n_param_search=5)
+    model.fit(scale(X), y)
+    computer = model._relevance_bounds_computer
+
+    baseline = computer._zero_lower_bound_features([])
+    failed = SimpleNamespace(is_solved=False, zero_weights=np.ones(6, dtype=bool))
+
+    assert computer._zero_lower_bound_features([failed]) == baseline
+
+
+def test_memory_mapped_probe_buffer_is_copy_on_write(tmp_path, randomstate):
+    from fri.utils import clear_permutation_buffer, permutate_feature_in_buffer
+
+    X = randomstate.normal(size=(50, 3))
+    path = str(tmp_path / "X.npy")
+    np.save(path, X)
+    X_mapped = np.load(path, mmap_mode="r")
+
+    X_perm, _ = permutate_feature_in_buffer((X_mapped, None), 1, seed=1)
+    expected, _ = permutate_feature_in_buffer((X, None), 1, seed=1)
+    clear_permutation_buffer()
+
+    np.testing.assert_array_equal(X_perm, expected)
+    # The file is not modified
+    np.testing.assert_array_equal(np.load(path), X)
+
+
+def test_max_dot_products():
+    from scipy import sparse
+    from fri.model.base_cvxproblem import max_dot_products
+
+    X = np.array([[3.0, -1.0, 2.0], [0.0, 4.0, 0.0]])
+    weight_bounds = np.array([1.0, 5.0, 1.0])
+
+    expected = [3 * 1 + 2 * 0.5, 4 * 1.5]
+    np.testing.assert_allclose(max_dot_products(X, weight_bounds, 1.5), expected)
+    for block_elements in [1, 2, 2 ** 20]:
+        np.testing.assert_allclose(
+            max_dot_products(X, weight_bounds, 1.5, block_elements), expected
+        )
+        np.testing.assert_allclose(
+            max_dot_products(sparse.csr_matrix(X), weight_bounds, 1.5, block_elements),
+            expected,
+        )
+
+
+def test_sample_screening_keeps_all_or_no_samples(randomstate, monkeypatch):
+    X, y = quick_generate("classification", random_state=randomstate, n_samples=50)
+    model = FRI("classification", random_state=randomstate, n_param_search=5)
+    model.fit(X, y)
+    computer = model._relevance_bounds_computer
+    template = computer.problem_type.get_cvxproblem_template
+
+    def screen(keep):
+        monkeypatch.setattr(
+            template, "screen_samples", staticmethod(lambda *args, **kwargs: keep)
+        )
+        return computer._screen_samples(computer.data, [], {})
+
+    # Screening which would remove every sample (or none) keeps the full problem
+    assert screen(np.zeros(len(y), dtype=bool)) is None
+    assert screen(np.ones(len(y), dtype=bool)) is None
+
+    keep = np.arange(len(y)) < 10
+    (X_kept, y_kept), sample_weight = screen(keep)
+    np.testing.assert_array_equal(X_kept, computer.data[0][:10])
+    np.testing.assert_array_equal(y_kept, computer.data[1][:10])
+    assert sample_weight is None
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_constraint_generation_from_one_sample(problem, randomstate, monkeypatch):
+    X, y = quick_generate(problem, random_state=randomstate, n_samples=100)
+    model = FRI(problem, random_state=randomstate, n_param_search=5)
+    model.fit(X, y)
+    computer = model._relevance_bounds_computer
+    template = computer.problem_type.get_cvxproblem_template
+
+    clear_template_cache()
+    full = _solve_all(computer, template_key=None)
+
+    # The active samples grow from a single sample until no constraint is violated
+    monkeypatch.setattr(
+        template, "_initial_active_samples", lambda self, X, y: np.arange(len(y)) == 0
+    )
+    clear_template_cache()
+    generated = _solve_all(computer, template_key="one", constraint_generation=True)
+
+    np.testing.assert_allclose(generated, full, atol=1e-5)
+
+
+@pytest.mark.parametrize("problem", NORMAL_MODELS)
+def test_column_generation_from_empty_support(problem, randomstate, monkeypatch):
+    X, y = quick_generate(
+        problem, random_state=randomstate, n_samples=30, n_features=20
+    )
+    model = FRI(problem, random_state=randomstate, n_param_search=5)
+    model.fit(X, y)
+    computer = model._relevance_bounds_computer
+    template = computer.problem_type.get_cvxproblem_template
+
+    clear_template_cache()
+    full = _solve_all(computer, template_key=None, solver="linprog")
+
+    # Only the current feature is in the first working set
+    monkeypatch.setattr(
+        template,
+        "_initial_working_features",
+        lambda self: np.zeros(self.d, dtype=bool),
+    )
+    clear_template_cache()
+    generated = _solve_all(
+        computer, template_key="empty", solver="linprog", column_generation=True
+    )
+
+    np.testing.assert_allclose(generated, full, atol=1e-5)
+
+
+def test_collapse_duplicates(randomstate):
+    from scipy import sparse
+    from fri.utils import collapse_duplicates
+
+    X = randomstate.randint(0, 3, size=(40, 3)).astype(float)
+    y = randomstate.randint(0, 2, size=40)
+
+    (X_unique, y_unique), counts = collapse_duplicates((X, y))
+    assert counts.sum() == len(y)
+    unique_rows = np.unique(np.column_stack([X_unique, y_unique]), axis=0)
+    assert len(unique_rows) == len(y_unique)
+    # Unique samples keep the order of their first occurrence
+    np.testing.assert_array_equal(X_unique[0], X[0])
+
+    (X_sparse, y_sparse), sparse_counts = collapse_duplicates(
+        (sparse.csr_matrix(X), y)
+    )
+    np.testing.assert_array_equal(X_sparse.toarray(), X_unique)
+    np.testing.assert_array_equal(y_sparse, y_unique)
+    np.testing.assert_array_equal(sparse_counts, counts)
+
+    weights = randomstate.uniform(size=40)
+    _, summed = collapse_duplicates((X, y), sample_weight=weights)
+    np.testing.assert_allclose(summed.sum(), weights.sum())
+
+
+def test_collapse_all_duplicate_rows():
+    from fri.utils import collapse_duplicates
+
+    X = np.ones((5, 3))
+
+    (X_unique, y_unique), counts = collapse_duplicates((X, np.zeros(5)))
+    assert X_unique.shape == (1, 3)
+    np.testing.assert_array_equal(counts, [5])
+
+    # Equal rows with different targets are different samples
+    y = np.array([0, 1, 0, 1, 1])
+    (X_unique, y_unique), counts = collapse_duplicates((X, y))
+    np.testing.assert_array_equal(y_unique, [0, 1])
+    np.testing.assert_array_equal(counts, [2, 3])
+
+
+def test_fit_releases_compiled_problems(randomstate):
+    from fri.model import base_cvxproblem
+
+    X, y = quick_generate("regression", random_state=randomstate, n_samples=100)
+    FRI("regression", random_state=randomstate, n_param_search=5).fit(X, y)
+
+    assert not base_cvxproblem._TEMPLATE_CACHE
+    assert not base_cvxproblem._ACTIVE_SAMPLES
+    assert not base_cvxproblem._WORKING_FEATURES
+
+
+def test_worker_releases_permutation_buffer(randomstate):
+    from fri import utils
+    from fri.compute import _start_solver_worker
+
+    X, y = quick_generate("regression", random_state=randomstate, n_samples=100)
+    model = FRI("regression", random_state=randomstate, n_param_search=5).fit(X, y)
+    computer = model._relevance_bounds_computer
+
+    probes = computer._generate_probe_value_tasks(
+        computer.data,
+        range(X.shape[1]),
+        True,
+        2,
+        randomstate,
+        best_model_state=computer.best_init_model.model_state,
+    )
+    _start_solver_worker(list(probes))
+    assert not utils._PERMUTATION_BUFFER
+
+
+def test_worker_stops_at_deadline(randomstate, monkeypatch):
+    import itertools
+    from types import SimpleNamespace
+
+    from fri import compute
+
+    X, y = quick_generate("regression", random_state=randomstate, n_samples=100)
+    model = FRI("regression", random_state=randomstate, n_param_search=5).fit(X, y)
+    computer = model._relevance_bounds_computer
+
+    bounds = list(
+        computer._generate_relevance_bounds_tasks(
+            range(X.shape[1]),
+            computer.data,
+            best_model_state=computer.best_init_model.model_state,
+        )
+    )
+    # The clock advances by one second whenever the worker checks it
+    clock = itertools.count()
+    monkeypatch.setattr(compute, "time", SimpleNamespace(time=lambda: next(clock)))
+
+    assert compute._start_solver_worker(bounds, deadline=0) == []
+    # The started feature is finished, the next one is not started
+    solved = compute._start_solver_worker(bounds, deadline=next(clock) + 2)
+    assert {bound.current_feature for bound in solved} == {bounds[0].current_feature}
+    assert all(bound.is_solved for bound in solved)
@@ -49,3 +49,34 @@ def test_baseline_lupi(problem, n_weak, randomstate):
     )
 
     assert best_score > 0.5
+
+
+@pytest.mark.parametrize("problem", fri.NORMAL_MODELS)
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_halving_search(problem, n_jobs, randomstate):
+    template = problem.value().get_initmodel_template
+    params = problem.value().get_all_parameters()
+    X, y = fri.quick_generate(problem, n_samples=600, random_state=randomstate)
+    X = StandardScaler().fit(X).transform(X)
+
+    best_model, best_score = find_best_model(
+        template, params, (X, y), randomstate, 10, n_jobs=n_jobs, search="halving"
+    )
+
+    assert set(best_model.hyperparam) >= set(params)
+    assert best_score > 0.5
+
+
+def test_unknown_search(randomstate):
+    problem = fri.NORMAL_MODELS[0]
+    X, y = fri.quick_generate(problem, random_state=randomstate)
+    with pytest.raises(ValueError):
+        find_best_model(
+            problem.value().get_initmodel_template,
+            problem.value().get_all_parameters(),
+            (X, y),
+            randomstate,
+            1,
+            n_jobs=1,
+            search="grid",
+        )
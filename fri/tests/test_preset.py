@@ -166,3 +166,54 @@ def test__compute_single_preset_relevance_bounds(randomstate):
     assert normal_range.shape == range.shape
     assert range[i][0] == preset
     assert range[i][1] == preset
+
+
+def test_preset_reuses_cached_probes(randomstate, monkeypatch):
+    X, y = quick_generate(
+        ProblemName.REGRESSION,
+        n_samples=300,
+        n_features=4,
+        n_redundant=2,
+        n_strel=2,
+        random_state=randomstate,
+    )
+    model = FRI(ProblemName.REGRESSION, random_state=randomstate, n_jobs=1)
+    model.fit(scale(X), y)
+    computer = model._relevance_bounds_computer
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Probes are solved again")
+
+    monkeypatch.setattr(computer, "compute_probe_values", fail)
+    preset = {0: np.mean(model.interval_[0])}
+    range = model.constrained_intervals(preset)
+
+    assert range[0][0] == range[0][1]
+
+
+@pytest.mark.parametrize(
+    "problem",
+    [ProblemName.REGRESSION, ProblemName.CLASSIFICATION, ProblemName.ORDINALREGRESSION],
+)
+def test_constrained_intervals_batch(problem, randomstate):
+    X, y = quick_generate(
+        problem,
+        n_samples=300,
+        n_features=4,
+        n_redundant=2,
+        n_strel=2,
+        random_state=randomstate,
+    )
+    model = FRI(problem, random_state=randomstate, n_jobs=1)
+    model.fit(scale(X), y)
+
+    presets = [{i: model.interval_[i, 0]} for i in range(X.shape[1])]
+    # Identical scenarios are solved once
+    presets.append(presets[0])
+    batch = model.constrained_intervals_batch(presets)
+
+    assert batch.shape == (len(presets), X.shape[1], 2)
+    for preset, intervals in zip(presets, batch):
+        np.testing.assert_allclose(
+            intervals, model.constrained_intervals(preset), atol=1e-6
+        )
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import scale
+from sklearn.utils import check_random_state
+
+from fri import FRI, ProblemName, quick_generate
+from fri.solver import (
+    DEFAULT_SOLVER,
+    LP_SOLVER,
+    check_solver,
+    choose_solver,
+    is_available,
+    solver_kwargs,
+)
+
+
+def test_default_solver():
+    assert choose_solver() == DEFAULT_SOLVER
+    assert choose_solver(linear_program=True) == DEFAULT_SOLVER
+    assert solver_kwargs()["solver"] == "ECOS"
+
+
+def test_explicit_solver():
+    assert choose_solver("scs", linear_program=True) == "SCS"
+    assert check_solver("ecos") == "ECOS"
+
+
+def test_auto_routes_linear_programs():
+    expected = LP_SOLVER if is_available(LP_SOLVER) else DEFAULT_SOLVER
+    assert choose_solver("auto", linear_program=True) == expected
+    assert choose_solver("auto", linear_program=False) == DEFAULT_SOLVER
+
+
+def test_auto_routes_native_linear_programs():
+    assert choose_solver(linear_program=True, native_lp=True) == DEFAULT_SOLVER
+    if is_available("LINPROG"):
+        assert choose_solver("auto", linear_program=True, native_lp=True) == "LINPROG"
+    assert solver_kwargs("linprog", linear_program=True)["solver"] != "LINPROG"
+
+
+def test_unknown_solver():
+    with pytest.raises(ValueError):
+        check_solver("not_a_solver")
+    X, y = quick_generate(ProblemName.CLASSIFICATION, n_samples=50)
+    with pytest.raises(ValueError):
+        FRI(ProblemName.CLASSIFICATION, solver="not_a_solver").fit(X, y)
+
+
+def test_solver_survives_clone():
+    from sklearn.base import clone
+
+    model = FRI(ProblemName.CLASSIFICATION, solver="auto", slack_regularization=0.1)
+    cloned = clone(model)
+    assert cloned.solver == "auto"
+    assert cloned.get_params()["slack_regularization"] == 0.1
+    assert cloned.get_params()["problemName"] is ProblemName.CLASSIFICATION
+
+
+def test_auto_solver_intervals():
+    randomstate = check_random_state(1337)
+    X, y = quick_generate(
+        ProblemName.CLASSIFICATION,
+        n_samples=100,
+        n_features=4,
+        n_strel=2,
+        random_state=randomstate,
+    )
+    X = scale(X)
+
+    default = FRI(
+        ProblemName.CLASSIFICATION, random_state=check_random_state(1), n_jobs=1
+    )
+    default.fit(X, y)
+    auto = FRI(
+        ProblemName.CLASSIFICATION,
+        random_state=check_random_state(1),
+        n_jobs=1,
+        solver="auto",
+    )
+    auto.fit(X, y)
+
+    np.testing.assert_allclose(default.interval_, auto.interval_, atol=1e-4)
@@ -125,6 +125,7 @@ def genClassificationData(
     flip_y: float = 0,
     random_state: object = None,
     partition=None,
+    dtype=np.float64,
 ):
     """Generate synthetic classification data
     
@@ -146,6 +147,8 @@ def genClassificationData(
         Ratio of samples randomly switched to wrong class.
     random_state : object, optional
         Randomstate object used for generation.
+    dtype : numpy dtype, optional
+        Precision of the generated samples (e.g. `np.float32`).
     
     Returns
     -------
@@ -206,7 +209,7 @@ def genClassificationData(
     # Add gaussian noise to data
     X = X + random_state.normal(size=(n_samples, n_features), scale=noise / X.std())
 
-    return X, Y
+    return X.astype(dtype, copy=False), Y
 
 
 def genRegressionData(
@@ -218,6 +221,7 @@ def genRegressionData(
     noise: float = 0.0,
     random_state: object = None,
     partition=None,
+    dtype=np.float64,
 ) -> object:
     """Generate synthetic regression data
     
@@ -237,6 +241,8 @@ def genRegressionData(
         Noise of the created samples around ground truth.
     random_state : object, optional
         Randomstate object used for generation.
+    dtype : numpy dtype, optional
+        Precision of the generated samples (e.g. `np.float32`).
 
     Returns
     -------
@@ -286,7 +292,7 @@ def genRegressionData(
         partition=partition,
     )
     y = np.squeeze(y)
-    return X, y
+    return X.astype(dtype, copy=False), y
 
 
 def genOrdinalRegressionData(
@@ -299,6 +305,7 @@ def genOrdinalRegressionData(
     random_state: object = None,
     partition=None,
     n_target_bins: int = 3,
+    dtype=np.float64,
 ):
     """
     Generate ordinal regression data
@@ -321,6 +328,8 @@ def genOrdinalRegressionData(
         Randomstate object used for generation.
     n_target_bins : int, optional
         Number of bins in which the regressional target variable is split to form the ordinal classes
+    dtype : numpy dtype, optional
+        Precision of the generated samples (e.g. `np.float32`).
 
     Returns
     -------
@@ -374,4 +383,4 @@ def genOrdinalRegressionData(
     # Add gaussian noise to data
     X = X + random_state.normal(size=(n_samples, n_features), scale=noise)
 
-    return X, Y
+    return X.astype(dtype, copy=False), Y
@@ -137,6 +137,7 @@ def genLupiData(
     n_repeated: int = 0,
     n_irrel: int = 0,
     label_noise=0.0,
+    dtype=np.float64,
 ):
     """
             Generate Lupi Data for Classification, Regression and Ordinal Regression Problems
@@ -162,6 +163,8 @@ def genLupiData(
                 Number of features which are irrelevant to the underlying model
             label_noise: float, optional
                 Percentage of labels which get permutated.
+            dtype : numpy dtype, optional
+                Precision of the generated samples (e.g. `np.float32`).
 
 
             Returns
@@ -241,4 +244,6 @@ def genLupiData(
         sample = random_state.choice(len(y), int(len(y) * label_noise))
         y[sample] = random_state.permutation(y[sample])
 
-    return (X, X_priv, y.squeeze())
+    return (
+        X.astype(dtype, copy=False), X_priv.astype(dtype, copy=False), y.squeeze()
+    )
@@ -1,4 +1,8 @@
 import numpy as np
+from scipy import sparse
+
+# Process local copy of the data in which probe features are permuted (see `permutate_feature_in_buffer`)
+_PERMUTATION_BUFFER = {}
 
 
 def distance(u, v):
@@ -24,11 +28,175 @@ def distance(u, v):
     return np.sqrt(np.sum(diff))
 
 
-def permutate_feature_in_data(data, feature_i, random_state):
+def permutate_feature_in_buffer(data, feature_i, seed):
+    """
+    Permute feature `feature_i` of `data` in a process local buffer.
+    The buffer holds one copy of X which is reused for all probes on the same data.
+    Per call only the previously permuted column is restored and the new one is written,
+    the returned data is therefore only valid until the next call.
+    Sparse data is buffered in CSC format and the permutation only moves the nonzero entries of the column.
+
+    Parameters
+    ----------
+    data : tuple
+        Tuple of data (X,y)
+    feature_i : int
+        Index of the permuted feature
+    seed : int
+        Seed of the permutation
+    """
+    X, y = data
+    buffer = _PERMUTATION_BUFFER
+    if sparse.issparse(X):
+        return _permutate_sparse_feature_in_buffer(buffer, X, feature_i, seed), y
+
+    if buffer.get("source") is not X:
+        # We keep a reference to the source, so its identity stays valid
+        buffer["source"] = X
+        buffer["X"] = _writable_copy(X)
+    else:
+        previous = buffer["feature"]
+        buffer["X"][:, previous] = X[:, previous]
+
+    random_state = np.random.RandomState(seed)
+    buffer["X"][:, feature_i] = random_state.permutation(X[:, feature_i])
+    buffer["feature"] = feature_i
+    return buffer["X"], y
+
+
+def collapse_duplicates(data, sample_weight=None):
+    """
+    Collapse duplicated samples (equal rows of X with equal target) into one weighted sample.
+    The weight of a unique sample is the number of its duplicates (or the sum of their `sample_weight`).
+    Unique samples are kept in the order of their first occurrence.
+    Data without duplicates is returned unchanged.
+
+    Parameters
+    ----------
+    data : tuple
+        Tuple of data (X,y)
+    sample_weight : array of shape (n) or None
+        Weights of the samples
+
+    Returns
+    -------
+    data : tuple
+        Tuple of unique data (X,y)
+    sample_weight : array of shape (n_unique) or None
+    """
     X, y = data
-    X_copy = np.copy(X)
-    # Permute selected feature
-    permutated_feature = random_state.permutation(X_copy[:, feature_i])
-    # Add permutation back to dataset
-    X_copy[:, feature_i] = permutated_feature
-    return X_copy, y
+    y = np.asarray(y)
+    if sparse.issparse(X):
+        rows = sparse.csr_matrix(X, copy=True)
+        # Canonical format, so equal rows have equal indices and values
+        rows.sum_duplicates()
+        rows.eliminate_zeros()
+        groups = {}
+        inverse = np.array(
+            [
+                groups.setdefault(
+                    (
+                        rows.indices[start:end].tobytes(),
+                        rows.data[start:end].tobytes(),
+                        y[i].tobytes(),
+                    ),
+                    len(groups),
+                )
+                for i, (start, end) in enumerate(zip(rows.indptr, rows.indptr[1:]))
+            ],
+            dtype=int,
+        )
+    else:
+        _, inverse = np.unique(np.column_stack([X, y]), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+    _, first = np.unique(inverse, return_index=True)
+    if len(first) == len(y):
+        return data, sample_weight
+
+    order = np.argsort(first)
+    keep = first[order]
+    weights = np.bincount(inverse, weights=sample_weight)[order]
+    return (X[keep], y[keep]), weights
+
+
+def backing_memmap(a):
+    """
+    Memory map which holds the data of array `a` or `None` if `a` is kept in memory.
+    """
+    while a is not None:
+        if isinstance(a, np.memmap) and getattr(a, "filename", None) is not None:
+            return a
+        a = getattr(a, "base", None)
+    return None
+
+
+def _writable_copy(X):
+    """
+    Copy of `X` which can be modified.
+    Memory mapped data is mapped again copy-on-write, so only pages which are modified are copied.
+    """
+    source = backing_memmap(X)
+    if (
+        source is None
+        or source.dtype != X.dtype
+        or source.shape != X.shape
+        or np.byte_bounds(source) != np.byte_bounds(X)
+        or source.strides != X.strides
+    ):
+        return np.array(X)
+    order = "F" if X.flags.f_contiguous and not X.flags.c_contiguous else "C"
+    return np.memmap(
+        source.filename,
+        dtype=X.dtype,
+        mode="c",
+        offset=source.offset,
+        shape=X.shape,
+        order=order,
+    )
+
+
+def _permutate_sparse_feature_in_buffer(buffer, X, feature_i, seed):
+    if buffer.get("source") is not X:
+        buffer["source"] = X
+        buffer["X"] = sparse.csc_matrix(X, copy=True)
+        buffer["X"].sort_indices()
+    else:
+        # Restore the entries of the previously permuted column
+        previous, indices, values = buffer["column"]
+        start, end = buffer["X"].indptr[previous : previous + 2]
+        buffer["X"].indices[start:end] = indices
+        buffer["X"].data[start:end] = values
+
+    X_buffer = buffer["X"]
+    start, end = X_buffer.indptr[feature_i : feature_i + 2]
+    buffer["column"] = (
+        feature_i,
+        X_buffer.indices[start:end].copy(),
+        X_buffer.data[start:end].copy(),
+    )
+    # Same permutation as for dense data with the same seed
+    permutation = np.random.RandomState(seed).permutation(X_buffer.shape[0])
+    _permute_sparse_column(X_buffer, feature_i, permutation)
+    return X_buffer
+
+
+def _permute_sparse_column(X, feature_i, permutation):
+    """
+    Permute the rows of column `feature_i` of the CSC matrix `X` in place,
+    such that the new column is the old column indexed by `permutation`.
+    The number of nonzero entries of the column does not change.
+    """
+    start, end = X.indptr[feature_i : feature_i + 2]
+    inverse = np.empty_like(permutation)
+    inverse[permutation] = np.arange(len(permutation))
+    rows = inverse[X.indices[start:end]]
+    order = np.argsort(rows)
+    X.indices[start:end] = rows[order]
+    X.data[start:end] = X.data[start:end][order]
+
+
+def clear_permutation_buffer():
+    """
+    Release the permutation buffer of the current process.
+    """
+    _PERMUTATION_BUFFER.clear()